@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.aggregates import UNCATEGORIZED
+from app.models import Entry
+
+
+@dataclass
+class EntryColumns:
+    """An account's entries as parallel NumPy arrays, one element per entry"""
+    days: np.ndarray  # datetime64[D]
+    amounts: np.ndarray  # int64 minor units, always positive
+    is_income: np.ndarray  # bool
+    category_ids: np.ndarray  # int64, UNCATEGORIZED for entries without a category
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    @property
+    def months(self) -> np.ndarray:
+        return self.days.astype("datetime64[M]")
+
+
+async def load_entry_columns(account_id: int, session: AsyncSession, date_from: date | None = None, date_to: date | None = None) -> EntryColumns:
+    """Load the entries of an account between date_from and date_to, inclusive, in one query.
+
+    Only the four columns the reports need are selected, and they are copied
+    straight into typed arrays without building ORM objects.
+    """
+    query = select(Entry.entry_date, Entry.amount, Entry.type, Entry.category_id).where(Entry.account_id == account_id)
+    if date_from is not None:
+        query = query.where(Entry.entry_date >= date_from)
+    if date_to is not None:
+        query = query.where(Entry.entry_date < date_to + timedelta(days=1))
+    rows = (await session.exec(query)).all()
+
+    if not rows:
+        return EntryColumns(
+            days=np.empty(0, dtype="datetime64[D]"),
+            amounts=np.empty(0, dtype=np.int64),
+            is_income=np.empty(0, dtype=bool),
+            category_ids=np.empty(0, dtype=np.int64),
+        )
+    entry_dates, amounts, types, category_ids = zip(*rows)
+    return EntryColumns(
+        days=np.array(entry_dates, dtype="datetime64[D]"),
+        amounts=np.array(amounts, dtype=np.int64),
+        is_income=np.array(types) == "income",
+        category_ids=np.array([UNCATEGORIZED if value is None else value for value in category_ids], dtype=np.int64),
+    )
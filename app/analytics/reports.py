@@ -0,0 +1,152 @@
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from app.analytics.columns import EntryColumns
+from app.crud.aggregates import UNCATEGORIZED
+from app.utils.money import from_minor_units
+
+# Percentiles reported for entry amounts and monthly totals
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+
+def _money(value: float, minor_units: int) -> Decimal | None:
+    """Round a computed amount in minor units to the currency's precision"""
+    if np.isnan(value):
+        return None
+    return from_minor_units(int(np.rint(value)), minor_units)
+
+
+def _sum_by(index: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """Sum integer values into size buckets without going through floats"""
+    totals = np.zeros(size, dtype=np.int64)
+    np.add.at(totals, index, values)
+    return totals
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean of each value and the window - 1 before it; NaN until a full window is available"""
+    means = np.full(len(values), np.nan)
+    if window <= len(values):
+        sums = np.cumsum(np.concatenate(([0], values)), dtype=np.float64)
+        means[window - 1:] = (sums[window:] - sums[:-window]) / window
+    return means
+
+
+def _group_percentile(sorted_values: np.ndarray, starts: np.ndarray, sizes: np.ndarray, q: float) -> np.ndarray:
+    """Linearly interpolated q-th percentile of every group of a grouped, sorted array.
+
+    Groups are the slices sorted_values[start:start + size]; empty groups get NaN.
+    """
+    result = np.full(len(starts), np.nan)
+    present = sizes > 0
+    position = starts[present] + q / 100 * (sizes[present] - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    low_values = sorted_values[lower].astype(np.float64)
+    result[present] = low_values + (sorted_values[upper] - low_values) * (position - lower)
+    return result
+
+
+def _month_axis(columns: EntryColumns, date_from: date | None, date_to: date | None) -> np.ndarray:
+    """Every month from date_from (or the first entry) to date_to (or the last entry)"""
+    months = columns.months
+    start = np.datetime64(date_from, "M") if date_from is not None else (months.min() if len(months) else None)
+    end = np.datetime64(date_to, "M") if date_to is not None else (months.max() if len(months) else None)
+    if start is None and end is None:
+        return np.empty(0, dtype="datetime64[M]")
+    # With a single bound and no entries the axis is just that month
+    start = end if start is None else start
+    end = start if end is None else end
+    return np.arange(start, end + 1)
+
+
+def monthly_report(columns: EntryColumns, minor_units: int, window: int, date_from: date | None = None, date_to: date | None = None) -> list[dict]:
+    """Get income, expense and net per month with rolling means over window months.
+
+    Months without entries are included with zero totals so that trends and
+    rolling windows are measured in calendar months.
+    """
+    axis = _month_axis(columns, date_from, date_to)
+    if not len(axis):
+        return []
+    index = (columns.months - axis[0]).astype(np.int64)
+    income_mask = columns.is_income
+    income = _sum_by(index[income_mask], columns.amounts[income_mask], len(axis))
+    expense = _sum_by(index[~income_mask], columns.amounts[~income_mask], len(axis))
+    counts = np.bincount(index, minlength=len(axis))
+    net = income - expense
+    expense_mean = _rolling_mean(expense, window)
+    net_mean = _rolling_mean(net, window)
+
+    return [
+        {
+            "period": axis[i].astype("datetime64[D]").item(),
+            "income": from_minor_units(int(income[i]), minor_units),
+            "expense": from_minor_units(int(expense[i]), minor_units),
+            "net": from_minor_units(int(net[i]), minor_units),
+            "entry_count": int(counts[i]),
+            "expense_rolling_mean": _money(expense_mean[i], minor_units),
+            "net_rolling_mean": _money(net_mean[i], minor_units),
+        }
+        for i in range(len(axis))
+    ]
+
+
+def category_report(columns: EntryColumns, minor_units: int) -> list[dict]:
+    """Get totals, share of spending and expense percentiles per category"""
+    if not len(columns):
+        return []
+    categories, index = np.unique(columns.category_ids, return_inverse=True)
+    income_mask = columns.is_income
+    income = _sum_by(index[income_mask], columns.amounts[income_mask], len(categories))
+    expense = _sum_by(index[~income_mask], columns.amounts[~income_mask], len(categories))
+    counts = np.bincount(index, minlength=len(categories))
+    total_expense = expense.sum()
+
+    # Sort expenses by category, then amount, so each category is one sorted slice
+    expense_index = index[~income_mask]
+    expense_amounts = columns.amounts[~income_mask]
+    order = np.lexsort((expense_amounts, expense_index))
+    sorted_amounts = expense_amounts[order]
+    sizes = np.bincount(expense_index, minlength=len(categories))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    median = _group_percentile(sorted_amounts, starts, sizes, 50)
+    p90 = _group_percentile(sorted_amounts, starts, sizes, 90)
+
+    return [
+        {
+            "category_id": None if categories[i] == UNCATEGORIZED else int(categories[i]),
+            "income": from_minor_units(int(income[i]), minor_units),
+            "expense": from_minor_units(int(expense[i]), minor_units),
+            "entry_count": int(counts[i]),
+            "expense_share": round(float(expense[i] / total_expense), 4) if total_expense else 0.0,
+            "expense_median": _money(median[i], minor_units),
+            "expense_p90": _money(p90[i], minor_units),
+        }
+        for i in range(len(categories))
+    ]
+
+
+def percentile_report(columns: EntryColumns, minor_units: int, entry_type: str) -> dict:
+    """Get percentiles of single entry amounts and of monthly totals of one entry type.
+
+    Monthly totals only cover months with at least one entry of that type.
+    """
+    mask = columns.is_income if entry_type == "income" else ~columns.is_income
+    amounts = columns.amounts[mask]
+    if not len(amounts):
+        return {"type": entry_type, "entry_count": 0, "mean": None, "entries": {}, "monthly_totals": {}}
+
+    months, month_index = np.unique(columns.months[mask], return_inverse=True)
+    monthly_totals = _sum_by(month_index, amounts, len(months))
+    entry_percentiles = np.percentile(amounts, PERCENTILES)
+    monthly_percentiles = np.percentile(monthly_totals, PERCENTILES)
+    return {
+        "type": entry_type,
+        "entry_count": int(len(amounts)),
+        "mean": _money(amounts.mean(), minor_units),
+        "entries": {f"p{q}": _money(value, minor_units) for q, value in zip(PERCENTILES, entry_percentiles)},
+        "monthly_totals": {f"p{q}": _money(value, minor_units) for q, value in zip(PERCENTILES, monthly_percentiles)},
+    }
@@ -0,0 +1,32 @@
+"""Recompute entry aggregates from scratch to repair drifted balances.
+
+Usage: python -m app.commands.rebuild_aggregates [--account-id ID]
+"""
+import argparse
+import asyncio
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import async_engine, create_db_and_tables
+import app.crud.aggregates as aggregate_crud
+
+
+async def rebuild(account_id: int | None) -> int:
+    async with AsyncSession(async_engine) as session:
+        rows = await aggregate_crud.rebuild_aggregates(session, account_id=account_id)
+    await async_engine.dispose()
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Recompute entry aggregates from the entry table")
+    parser.add_argument("--account-id", type=int, help="Only rebuild this account")
+    args = parser.parse_args(argv)
+
+    create_db_and_tables()
+    rows = asyncio.run(rebuild(args.account_id))
+    print(f"Rebuilt {rows} aggregate rows")
+
+
+if __name__ == "__main__":
+    main()
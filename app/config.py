@@ -8,5 +8,55 @@ class Settings(BaseSettings):
         extra='allow'
     )
 
+    # Authenticated users cached per token subject; 0 disables the cache
+    user_cache_max_size: int = 1024
+    user_cache_ttl_seconds: float = 60
+
+    # Account memberships cached per user for authorization checks; writes
+    # through this process invalidate them, other processes wait out the TTL
+    membership_cache_max_size: int = 4096
+    membership_cache_ttl_seconds: float = 30
+
+    # Decoded access tokens cached per token digest until they expire, and
+    # tokens revoked at logout remembered as long; revocation is per process
+    access_token_cache_max_size: int = 10_000
+    access_token_cache_ttl_seconds: float = 1800
+    revoked_access_token_max_size: int = 100_000
+
+    # Argon2 threads (each holds 64 MB while hashing) and how many calls may
+    # wait for one before logins get a 503; 0 workers hashes on the event loop
+    password_hash_workers: int = 2
+    password_hash_queue_depth: int = 64
+
+    # Connection pool of each engine; ignored for in-memory SQLite databases
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+
+    # Pragmas applied to every SQLite connection: WAL lets readers run while
+    # one writer commits, busy_timeout makes writers wait instead of failing
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024
+
+    # Revoked refresh tokens are kept in an in-memory Bloom filter sized for
+    # this many tokens; the sweeper deletes expired tokens and reloads it
+    revocation_filter_capacity: int = 100_000
+    revocation_filter_error_rate: float = 0.001
+    refresh_token_sweep_interval_seconds: float = 3600
+    refresh_token_sweep_batch_size: int = 1000
+
+    # Due recurring rules are materialized at startup and then every interval,
+    # batch_size rules per transaction
+    recurring_rule_interval_seconds: float = 60
+    recurring_rule_batch_size: int = 5000
+
+    # Finished account deletions can be polled for this long, then are forgotten
+    account_deletion_retention_seconds: float = 3600
+
 
 settings = Settings()
@@ -1,46 +1,175 @@
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
-from sqlmodel import Session, select
-from app.models import Account, AccountMembership, User
+from typing import Callable, List, Optional
+from sqlmodel import delete, func, insert, literal, or_, select, tuple_, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models import Account, AccountMembership, Budget, Category, ChangeLog, Currency, Entry, EntryAggregate, RecurringRule, User
+import app.crud.changes as change_crud
+from app.config import settings
 from app.schemas.accounts import AccountCreate
+from app.utils.cache import TTLCache
+from app.utils.money import DEFAULT_MINOR_UNITS
 
+# Entries, then change log rows, deleted per transaction when an account is deleted
+DELETE_BATCH_SIZE = 5000
 
-def get_all_accounts(session: Session) -> List[Account]:
-    """Get all accounts"""
-    query = select(Account).order_by(Account.created_at.desc())
-    return session.exec(query).all()
+# Categories every new account starts with, as (name, type)
+DEFAULT_CATEGORIES = [
+    ("Salary", "income"),
+    ("Other income", "income"),
+    ("Groceries", "expense"),
+    ("Housing", "expense"),
+    ("Transport", "expense"),
+    ("Utilities", "expense"),
+    ("Dining out", "expense"),
+    ("Other expenses", "expense"),
+]
 
 
-def create_account(account: AccountCreate, session: Session) -> Account:
-    """Create a new account and assign the creator as owner"""
-    new_account = Account(
-        name=account.name,
-        currency_code=account.currency_code,
-        description=account.description
-    )
-    session.add(new_account)
-    session.commit()
-    session.refresh(new_account)
+@dataclass(frozen=True)
+class AccountPermissions:
+    """A user's memberships, loaded once and shared by every check in a request"""
+    user_id: int
+    roles: dict[int, str] = field(default_factory=dict)  # account_id -> role
+    owned: frozenset[int] = frozenset()
 
-    # Create membership record with owner role
-    membership = AccountMembership(
-        account_id=new_account.id,
-        user_id=account.owner_id,
-        role="owner",
-        is_owner=True
+    def can_access(self, account_id: int) -> bool:
+        return account_id in self.roles
+
+    def is_owner(self, account_id: int) -> bool:
+        return account_id in self.owned
+
+
+# AccountPermissions keyed by user id
+membership_cache = TTLCache(max_size=settings.membership_cache_max_size, ttl=settings.membership_cache_ttl_seconds)
+
+
+async def get_account_permissions(user_id: int, session: AsyncSession) -> AccountPermissions:
+    """Get a user's memberships from the cache, or load them all in one query"""
+    permissions = membership_cache.get(user_id)
+    if permissions is not None:
+        return permissions
+    query = select(AccountMembership.account_id, AccountMembership.role, AccountMembership.is_owner).where(
+        AccountMembership.user_id == user_id
     )
-    session.add(membership)
-    session.commit()
+    rows = (await session.exec(query)).all()
+    permissions = AccountPermissions(
+        user_id=user_id,
+        roles={account_id: role for account_id, role, _ in rows},
+        owned=frozenset(account_id for account_id, _, is_owner in rows if is_owner),
+    )
+    membership_cache.set(user_id, permissions)
+    return permissions
+
+
+async def create_accounts(accounts: List[AccountCreate], session: AsyncSession) -> List[Account]:
+    """Create accounts with their owner memberships and default categories in one commit.
+
+    Runs one INSERT for the accounts, one executemany each for memberships
+    and categories, and two statements to record the new rows in the change
+    log. The account INSERT is a single multi-row statement where the
+    database can return ids in parameter order; SQLite cannot, so there
+    SQLAlchemy sends one INSERT per account.
+    """
+    now = datetime.now()
+    rows = [
+        {
+            "name": account.name,
+            "currency_code": account.currency_code,
+            "description": account.description,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for account in accounts
+    ]
+    try:
+        # sort_by_parameter_order returns the ids in the order of rows, so
+        # each account gets its own owner whatever ids the database assigns
+        accounts_table = Account.__table__
+        result = await session.exec(
+            insert(accounts_table).returning(accounts_table.c.id, sort_by_parameter_order=True),
+            params=rows,
+        )
+        account_ids = result.scalars().all()
+        await session.exec(insert(AccountMembership), params=[
+            {"account_id": account_id, "user_id": account.owner_id, "role": "owner", "is_owner": True, "joined_at": now}
+            for account_id, account in zip(account_ids, accounts)
+        ])
+        await session.exec(insert(Category), params=[
+            {"account_id": account_id, "name": name, "type": category_type, "is_default": True}
+            for account_id in account_ids
+            for name, category_type in DEFAULT_CATEGORIES
+        ])
+        await change_crud.log_changes(
+            [(account_id, "account", account_id, "upsert") for account_id in account_ids]
+            + [(account_id, "membership", account.owner_id, "upsert") for account_id, account in zip(account_ids, accounts)],
+            session,
+        )
+        await change_crud.log_new_categories(account_ids, session)
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    for owner_id in {account.owner_id for account in accounts}:
+        membership_cache.invalidate(owner_id)
+    return [Account(id=account_id, **row) for account_id, row in zip(account_ids, rows)]
 
-    return new_account
 
+async def create_account(account: AccountCreate, session: AsyncSession) -> Account:
+    """Create a new account and assign the creator as owner"""
+    return (await create_accounts([account], session))[0]
 
-def get_account_by_id(account_id: int, session: Session) -> Optional[Account]:
+
+async def get_account_by_id(account_id: int, session: AsyncSession) -> Optional[Account]:
     """Get account by ID"""
-    return session.get(Account, account_id)
+    return await session.get(Account, account_id)
+
+
+async def touch_account(account_id: int, session: AsyncSession) -> None:
+    """Bump an account's version and updated_at after a change to it or its data, without committing"""
+    await session.exec(
+        update(Account)
+        .where(Account.id == account_id)
+        .values(version=Account.version + 1, updated_at=datetime.now())
+    )
+
+
+async def category_in_account(account_id: int, category_id: int, session: AsyncSession) -> bool:
+    """Check that a category belongs to an account"""
+    category = await session.get(Category, category_id)
+    return category is not None and category.account_id == account_id
+
+
+async def get_category_ids(account_id: int, session: AsyncSession) -> set[int]:
+    """Get the ids of an account's categories"""
+    return set((await session.exec(select(Category.id).where(Category.account_id == account_id))).all())
+
+
+async def get_account_minor_units(account_id: int, session: AsyncSession) -> int:
+    """Get the number of decimal places of an account's currency"""
+    query = (
+        select(Currency.minor_units)
+        .join(Account, Account.currency_code == Currency.code)
+        .where(Account.id == account_id)
+    )
+    minor_units = (await session.exec(query)).first()
+    return DEFAULT_MINOR_UNITS if minor_units is None else minor_units
+
+
+async def get_accounts_minor_units(account_ids: List[int], session: AsyncSession) -> dict[int, int]:
+    """Get the number of decimal places of the currency of each of several accounts, in one query"""
+    query = (
+        select(Account.id, Currency.minor_units)
+        .join(Currency, Account.currency_code == Currency.code, isouter=True)
+        .where(Account.id.in_(account_ids))
+    )
+    return {
+        account_id: DEFAULT_MINOR_UNITS if minor_units is None else minor_units
+        for account_id, minor_units in (await session.exec(query)).all()
+    }
 
 
-def get_accounts_by_user(user_id: int, session: Session) -> List[Account]:
+async def get_accounts_by_user(user_id: int, session: AsyncSession) -> List[Account]:
     """Get all accounts that a user has access to"""
     query = (
         select(Account)
@@ -48,10 +177,36 @@ def get_accounts_by_user(user_id: int, session: Session) -> List[Account]:
         .where(AccountMembership.user_id == user_id)
         .order_by(Account.created_at.desc())
     )
-    return session.exec(query).all()
+    return (await session.exec(query)).all()
+
+
+async def list_accounts_by_user(
+    user_id: int,
+    session: AsyncSession,
+    limit: int = 50,
+    after: tuple[datetime, int] | None = None,
+) -> tuple[List[Account], bool]:
+    """Get a page of the accounts a user has access to, newest first.
+
+    `after` is the (created_at, id) of the last account of the previous page.
+    Memberships are found through the (user_id, account_id) index, so the cost
+    follows the user's own accounts, not the whole instance. Returns the
+    accounts and whether more pages follow.
+    """
+    query = (
+        select(Account)
+        .join(AccountMembership)
+        .where(AccountMembership.user_id == user_id, Account.deleting == False)  # noqa: E712
+    )
+    if after is not None:
+        query = query.where(tuple_(Account.created_at, Account.id) < tuple_(*after))
+    query = query.order_by(Account.created_at.desc(), Account.id.desc()).limit(limit + 1)
 
+    accounts = (await session.exec(query)).all()
+    return accounts[:limit], len(accounts) > limit
 
-def get_user_owned_accounts(user_id: int, session: Session) -> List[Account]:
+
+async def get_user_owned_accounts(user_id: int, session: AsyncSession) -> List[Account]:
     """Get all accounts owned by a user"""
     query = (
         select(Account)
@@ -62,14 +217,14 @@ def get_user_owned_accounts(user_id: int, session: Session) -> List[Account]:
         )
         .order_by(Account.created_at.desc())
     )
-    return session.exec(query).all()
+    return (await session.exec(query)).all()
 
 
-def update_account(account_id: int, name: Optional[str] = None,
+async def update_account(account_id: int, name: Optional[str] = None,
                   currency_code: Optional[str] = None,
-                  description: Optional[str] = None, session: Session = None) -> Optional[Account]:
+                  description: Optional[str] = None, session: AsyncSession = None) -> Optional[Account]:
     """Update account details"""
-    account = session.get(Account, account_id)
+    account = await session.get(Account, account_id)
     if not account:
         return None
 
@@ -81,44 +236,118 @@ def update_account(account_id: int, name: Optional[str] = None,
         account.description = description
 
     account.updated_at = datetime.now()
+    account.version += 1
     session.add(account)
-    session.commit()
-    session.refresh(account)
+    await change_crud.log_changes([(account_id, "account", account_id, "upsert")], session)
+    await session.commit()
+    await session.refresh(account)
     return account
 
 
-def delete_account(account_id: int, session: Session) -> bool:
-    """Delete an account and all its memberships"""
-    account = session.get(Account, account_id)
-    if not account:
-        return False
+async def _delete_entry_batch(account_id: int, batch_size: int, session: AsyncSession) -> int:
+    """Delete up to batch_size of an account's entries without loading them"""
+    batch = select(Entry.id).where(Entry.account_id == account_id).limit(batch_size)
+    result = await session.exec(delete(Entry).where(Entry.id.in_(batch)))
+    return result.rowcount
 
-    # Delete all memberships first
-    membership_query = select(AccountMembership).where(AccountMembership.account_id == account_id)
-    memberships = session.exec(membership_query).all()
-    for membership in memberships:
-        session.delete(membership)
 
-    # Delete the account
-    session.delete(account)
-    session.commit()
-    return True
+async def _delete_change_batch(account_id: int, before_id: int, batch_size: int, session: AsyncSession) -> int:
+    """Delete up to batch_size of an account's change log rows with ids below before_id"""
+    batch = select(ChangeLog.id).where(ChangeLog.account_id == account_id, ChangeLog.id < before_id).limit(batch_size)
+    result = await session.exec(delete(ChangeLog).where(ChangeLog.id.in_(batch)))
+    return result.rowcount
+
+
+async def delete_account(account_id: int, session: AsyncSession, batch_size: int = DELETE_BATCH_SIZE,
+                         on_progress: Optional[Callable[[int], None]] = None) -> Optional[int]:
+    """Delete an account with its recurring rules, entries, aggregates, budgets, categories and memberships.
 
+    The account is first flagged as deleting, and its aggregates, budgets
+    and recurring rules are removed, in one transaction. Entries then go in
+    committed batches of batch_size so no single transaction holds the
+    write lock for long, followed the same way by the account's change log;
+    the last batch and every other row are deleted in one final transaction.
+    A deletion that stopped partway can be run again. on_progress gets the
+    running count of deleted entries. Returns that count, or None if the
+    account does not exist.
 
-def add_user_to_account(account_id: int, user_id: int, role: str = "member", session: Session = None) -> Optional[AccountMembership]:
-    """Add a user to an account with specified role"""
+    Only the account and its memberships get tombstones in the change log;
+    clients drop an account's entries and categories along with the account.
+    Its earlier changes are purged, since account and row ids can be reused
+    and a later account's members must not sync them.
+    """
+    if not await session.get(Account, account_id):
+        return None
+
+    deleted = 0
+    try:
+        # The first transaction flags the account, so it stays unusable if the
+        # deletion stops partway, and removes everything derived from entries.
+        # Rules go too, so the scheduler stops adding entries meanwhile.
+        await session.exec(update(Account).where(Account.id == account_id).values(deleting=True))
+        await session.exec(delete(RecurringRule).where(RecurringRule.account_id == account_id))
+        await session.exec(delete(EntryAggregate).where(EntryAggregate.account_id == account_id))
+        await session.exec(delete(Budget).where(Budget.account_id == account_id))
+        await session.commit()
+
+        while True:
+            count = await _delete_entry_batch(account_id, batch_size, session)
+            deleted += count
+            if count < batch_size:
+                break
+            await session.commit()
+            if on_progress is not None:
+                on_progress(deleted)
+        # Change log ids are sync cursors, and SQLite hands out the highest id
+        # again once it is deleted, so the newest row stays until the
+        # tombstones are logged after it
+        last_change_id = (await session.exec(select(func.max(ChangeLog.id)))).one() or 0
+        while await _delete_change_batch(account_id, last_change_id, batch_size, session) == batch_size:
+            await session.commit()
+
+        category_ids = (await session.exec(select(Category.id).where(Category.account_id == account_id))).all()
+        if category_ids:
+            # Entries of other accounts may still point at this account's categories
+            await session.exec(update(Entry).where(Entry.category_id.in_(category_ids)).values(category_id=None))
+            await session.exec(update(RecurringRule).where(RecurringRule.category_id.in_(category_ids)).values(category_id=None))
+        member_ids = (await session.exec(select(AccountMembership.user_id).where(AccountMembership.account_id == account_id))).all()
+        await change_crud.log_member_removals(account_id, session)
+        await change_crud.log_changes([(account_id, "account", account_id, "delete")], session)
+        await session.exec(delete(ChangeLog).where(ChangeLog.account_id == account_id, ChangeLog.id <= last_change_id))
+        await session.exec(delete(Category).where(Category.account_id == account_id))
+        await session.exec(delete(AccountMembership).where(AccountMembership.account_id == account_id))
+        await session.exec(delete(Account).where(Account.id == account_id))
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+
+    # Account ids can be reused, so stale memberships must not outlive the account
+    for user_id in member_ids:
+        membership_cache.invalidate(user_id)
+    if on_progress is not None:
+        on_progress(deleted)
+    return deleted
+
+
+async def add_user_to_account(account_id: int, user_id: int, role: str = "member", session: AsyncSession = None) -> Optional[AccountMembership]:
+    """Add a user to an account with specified role.
+
+    The account, its categories and its entries are logged again, since
+    their earlier changes are behind the new member's sync cursor.
+    """
     # Check if membership already exists
     existing_query = select(AccountMembership).where(
         AccountMembership.account_id == account_id,
         AccountMembership.user_id == user_id
     )
-    existing = session.exec(existing_query).first()
+    existing = (await session.exec(existing_query)).first()
     if existing:
         return existing
 
     # Verify account and user exist
-    account = session.get(Account, account_id)
-    user = session.get(User, user_id)
+    account = await session.get(Account, account_id)
+    user = await session.get(User, user_id)
     if not account or not user:
         return None
 
@@ -129,65 +358,81 @@ def add_user_to_account(account_id: int, user_id: int, role: str = "member", ses
         is_owner=False
     )
     session.add(membership)
-    session.commit()
-    session.refresh(membership)
+    await touch_account(account_id, session)
+    await change_crud.log_changes([(account_id, "account", account_id, "upsert"), (account_id, "membership", user_id, "upsert")], session)
+    await change_crud.log_new_categories([account_id], session)
+    await change_crud.log_new_entries(account_id, 0, session)
+    await session.commit()
+    membership_cache.invalidate(user_id)
+    await session.refresh(membership)
     return membership
 
 
-def remove_user_from_account(account_id: int, user_id: int, session: Session) -> bool:
+async def remove_user_from_account(account_id: int, user_id: int, session: AsyncSession) -> bool:
     """Remove a user from an account"""
     query = select(AccountMembership).where(
         AccountMembership.account_id == account_id,
         AccountMembership.user_id == user_id,
         AccountMembership.is_owner == False  # Cannot remove owner
     )
-    membership = session.exec(query).first()
+    membership = (await session.exec(query)).first()
     if not membership:
         return False
 
-    session.delete(membership)
-    session.commit()
+    await session.delete(membership)
+    await touch_account(account_id, session)
+    await change_crud.log_changes([(account_id, "membership", user_id, "delete")], session)
+    await session.commit()
+    membership_cache.invalidate(user_id)
     return True
 
 
-def get_account_members(account_id: int, session: Session) -> List[dict]:
-    """Get all members of an account with their details"""
+async def get_account_members(
+    account_id: int,
+    session: AsyncSession,
+    limit: int = 50,
+    after: tuple[bool, datetime, int] | None = None,
+) -> tuple[List[dict], bool]:
+    """Get a page of an account's members, owners first, then by joining date.
+
+    Only the columns of the AccountMember schema are selected, so no User
+    entities (or password hashes) are loaded. `after` is the (is_owner,
+    joined_at, user_id) of the last member of the previous page. Returns the
+    members and whether more pages follow.
+    """
     query = (
-        select(User, AccountMembership)
-        .join(AccountMembership, User.id == AccountMembership.user_id)
+        select(
+            AccountMembership.user_id,
+            User.email,
+            User.name,
+            AccountMembership.role,
+            AccountMembership.is_owner,
+            AccountMembership.joined_at,
+        )
+        .join(User, User.id == AccountMembership.user_id)
         .where(AccountMembership.account_id == account_id)
-        .order_by(AccountMembership.is_owner.desc(), AccountMembership.joined_at)
-    )
-    results = session.exec(query).all()
-
-    members = []
-    for user, membership in results:
-        members.append({
-            "user_id": user.id,
-            "email": user.email,
-            "name": user.name,
-            "role": membership.role,
-            "is_owner": membership.is_owner,
-            "joined_at": membership.joined_at
-        })
-
-    return members
-
-
-def user_has_account_access(user_id: int, account_id: int, session: Session) -> bool:
-    """Check if a user has access to an account"""
-    query = select(AccountMembership).where(
-        AccountMembership.user_id == user_id,
-        AccountMembership.account_id == account_id
-    )
-    return session.exec(query).first() is not None
-
-
-def user_is_account_owner(user_id: int, account_id: int, session: Session) -> bool:
-    """Check if a user is the owner of an account"""
-    query = select(AccountMembership).where(
-        AccountMembership.user_id == user_id,
-        AccountMembership.account_id == account_id,
-        AccountMembership.is_owner == True
     )
-    return session.exec(query).first() is not None
+    if after is not None:
+        is_owner, joined_at, user_id = after
+        # Owners sort first, so the seek runs downwards on is_owner and upwards on the rest
+        query = query.where(or_(
+            AccountMembership.is_owner < literal(is_owner),
+            (AccountMembership.is_owner == literal(is_owner))
+            & (tuple_(AccountMembership.joined_at, AccountMembership.user_id) > tuple_(joined_at, user_id)),
+        ))
+    query = query.order_by(
+        AccountMembership.is_owner.desc(), AccountMembership.joined_at, AccountMembership.user_id
+    ).limit(limit + 1)
+
+    members = [row._asdict() for row in (await session.exec(query)).all()]
+    return members[:limit], len(members) > limit
+
+
+async def user_has_account_access(user_id: int, account_id: int, session: AsyncSession) -> bool:
+    """Check if a user has access to an account, using their cached memberships"""
+    return (await get_account_permissions(user_id, session)).can_access(account_id)
+
+
+async def user_is_account_owner(user_id: int, account_id: int, session: AsyncSession) -> bool:
+    """Check if a user is the owner of an account, using their cached memberships"""
+    return (await get_account_permissions(user_id, session)).is_owner(account_id)
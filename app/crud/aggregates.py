@@ -0,0 +1,188 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Iterable, List, Mapping, Optional
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import case, delete, extract, func, insert, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models import Entry, EntryAggregate
+from app.utils.money import from_minor_units
+
+# Aggregate rows for entries without a category use this key
+UNCATEGORIZED = 0
+
+
+def month_start(value: date | datetime) -> date:
+    """Get the first day of the month a date falls in"""
+    return date(value.year, value.month, 1)
+
+
+async def _upsert_aggregates(rows: list[dict], session: AsyncSession) -> None:
+    """Add row totals onto existing aggregate rows, creating missing ones"""
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        statement = dialect_insert(EntryAggregate)
+        statement = statement.on_conflict_do_update(
+            index_elements=["account_id", "period", "category_id"],
+            set_={
+                "income_total": EntryAggregate.income_total + statement.excluded.income_total,
+                "expense_total": EntryAggregate.expense_total + statement.excluded.expense_total,
+                "entry_count": EntryAggregate.entry_count + statement.excluded.entry_count,
+            },
+        )
+        await session.exec(statement, params=rows)
+        return
+
+    for row in rows:
+        result = await session.exec(
+            update(EntryAggregate)
+            .where(
+                EntryAggregate.account_id == row["account_id"],
+                EntryAggregate.period == row["period"],
+                EntryAggregate.category_id == row["category_id"],
+            )
+            .values(
+                income_total=EntryAggregate.income_total + row["income_total"],
+                expense_total=EntryAggregate.expense_total + row["expense_total"],
+                entry_count=EntryAggregate.entry_count + row["entry_count"],
+            )
+        )
+        if result.rowcount == 0:
+            await session.exec(insert(EntryAggregate), params=[row])
+
+
+async def apply_entries(account_id: int, entries: Iterable[Mapping], session: AsyncSession, sign: int = 1) -> None:
+    """Fold entry rows into their account's aggregates, without committing.
+
+    Use sign=-1 to take entries back out, e.g. before deleting or changing them.
+    Rows need type, amount (in minor units), entry_date and category_id keys.
+    """
+    await apply_account_entries(({**entry, "account_id": account_id} for entry in entries), session, sign)
+
+
+async def apply_account_entries(entries: Iterable[Mapping], session: AsyncSession, sign: int = 1) -> None:
+    """Fold entry rows of any number of accounts into their aggregates with one upsert, without committing.
+
+    Rows need the keys apply_entries uses plus account_id.
+    """
+    deltas = defaultdict(lambda: {"income_total": 0, "expense_total": 0, "entry_count": 0})
+    for entry in entries:
+        delta = deltas[(entry["account_id"], month_start(entry["entry_date"]), entry["category_id"] or UNCATEGORIZED)]
+        delta[f"{entry['type']}_total"] += sign * entry["amount"]
+        delta["entry_count"] += sign
+
+    if not deltas:
+        return
+    rows = [
+        {"account_id": account_id, "period": period, "category_id": category_id, **delta}
+        for (account_id, period, category_id), delta in deltas.items()
+    ]
+    await _upsert_aggregates(rows, session)
+
+
+def _totals(income: int, expense: int, count: int, minor_units: int) -> dict:
+    return {
+        "income": from_minor_units(income, minor_units),
+        "expense": from_minor_units(expense, minor_units),
+        "net": from_minor_units(income - expense, minor_units),
+        "entry_count": count,
+    }
+
+
+async def get_balance(account_id: int, minor_units: int, session: AsyncSession) -> dict:
+    """Get an account's lifetime totals by summing its integer aggregate rows"""
+    query = select(
+        func.coalesce(func.sum(EntryAggregate.income_total), 0),
+        func.coalesce(func.sum(EntryAggregate.expense_total), 0),
+        func.coalesce(func.sum(EntryAggregate.entry_count), 0),
+    ).where(EntryAggregate.account_id == account_id)
+    income, expense, count = (await session.exec(query)).one()
+    totals = _totals(income, expense, count, minor_units)
+    return {"account_id": account_id, "balance": totals.pop("net"), **totals}
+
+
+async def _summarize(group_by, account_id: int, minor_units: int, date_from: Optional[date], date_to: Optional[date], session: AsyncSession) -> List[tuple]:
+    """Get (key, totals) pairs of an account's aggregates grouped by one column"""
+    query = (
+        select(
+            group_by,
+            func.sum(EntryAggregate.income_total),
+            func.sum(EntryAggregate.expense_total),
+            func.sum(EntryAggregate.entry_count),
+        )
+        .where(EntryAggregate.account_id == account_id)
+        .group_by(group_by)
+        .order_by(group_by)
+    )
+    if date_from is not None:
+        query = query.where(EntryAggregate.period >= month_start(date_from))
+    if date_to is not None:
+        query = query.where(EntryAggregate.period <= month_start(date_to))
+    return [
+        (key, _totals(income, expense, count, minor_units))
+        for key, income, expense, count in (await session.exec(query)).all()
+    ]
+
+
+async def get_summary(account_id: int, minor_units: int, session: AsyncSession, date_from: Optional[date] = None, date_to: Optional[date] = None) -> dict:
+    """Get per-month and per-category totals for the months between date_from and date_to, inclusive"""
+    periods = await _summarize(EntryAggregate.period, account_id, minor_units, date_from, date_to, session)
+    categories = await _summarize(EntryAggregate.category_id, account_id, minor_units, date_from, date_to, session)
+    return {
+        "account_id": account_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "periods": [{"period": period, **totals} for period, totals in periods],
+        "categories": [
+            {"category_id": None if category_id == UNCATEGORIZED else category_id, **totals}
+            for category_id, totals in categories
+        ],
+    }
+
+
+async def rebuild_aggregates(session: AsyncSession, account_id: Optional[int] = None) -> int:
+    """Recompute aggregates from the entry table, for one account or all of them.
+
+    Grouping happens in the database, so memory use is proportional to the
+    number of aggregate rows rather than the number of entries.
+    """
+    year = extract("year", Entry.entry_date)
+    month = extract("month", Entry.entry_date)
+    category_id = func.coalesce(Entry.category_id, UNCATEGORIZED)
+    query = (
+        select(
+            Entry.account_id,
+            year,
+            month,
+            category_id,
+            func.sum(case((Entry.type == "income", Entry.amount), else_=0)),
+            func.sum(case((Entry.type == "expense", Entry.amount), else_=0)),
+            func.count(),
+        )
+        .group_by(Entry.account_id, year, month, category_id)
+    )
+    clear = delete(EntryAggregate)
+    if account_id is not None:
+        query = query.where(Entry.account_id == account_id)
+        clear = clear.where(EntryAggregate.account_id == account_id)
+
+    rows = [
+        {
+            "account_id": row_account_id,
+            "period": date(int(row_year), int(row_month), 1),
+            "category_id": row_category_id,
+            "income_total": income,
+            "expense_total": expense,
+            "entry_count": count,
+        }
+        for row_account_id, row_year, row_month, row_category_id, income, expense, count in (await session.exec(query)).all()
+    ]
+    try:
+        await session.exec(clear)
+        if rows:
+            await session.exec(insert(EntryAggregate), params=rows)
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    return len(rows)
@@ -0,0 +1,73 @@
+from datetime import date, datetime
+from typing import List, Optional
+from sqlmodel import and_, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models import Budget, EntryAggregate
+from app.crud.aggregates import month_start
+from app.utils.money import from_minor_units
+
+
+async def set_budget(account_id: int, category_id: int, period: date, amount: int, session: AsyncSession) -> Budget:
+    """Create or replace a category's budget for the month period falls in; amount is in minor units"""
+    budget = await session.get(Budget, (account_id, month_start(period), category_id))
+    if budget is None:
+        budget = Budget(account_id=account_id, period=month_start(period), category_id=category_id, amount=amount)
+        session.add(budget)
+    else:
+        budget.amount = amount
+        budget.updated_at = datetime.now()
+    await session.commit()
+    await session.refresh(budget)
+    return budget
+
+
+async def delete_budget(account_id: int, category_id: int, period: date, session: AsyncSession) -> bool:
+    """Delete a category's budget for the month period falls in; returns whether it existed"""
+    budget = await session.get(Budget, (account_id, month_start(period), category_id))
+    if budget is None:
+        return False
+    await session.delete(budget)
+    await session.commit()
+    return True
+
+
+def _budget_status(category_id: int, amount: int, spent: int, minor_units: int) -> dict:
+    return {
+        "category_id": category_id,
+        "amount": from_minor_units(amount, minor_units),
+        "spent": from_minor_units(spent, minor_units),
+        "remaining": from_minor_units(amount - spent, minor_units),
+    }
+
+
+async def list_budgets(account_id: int, period: date, minor_units: int, session: AsyncSession) -> List[dict]:
+    """Get a month's budgets with what was spent against each, in one query.
+
+    Spending is the expense total of the category's aggregate row for the
+    month, which entry writes keep current, so the cost grows with the
+    number of budgets rather than the number of entries.
+    """
+    period = month_start(period)
+    query = (
+        select(Budget.category_id, Budget.amount, func.coalesce(EntryAggregate.expense_total, 0))
+        .outerjoin(EntryAggregate, and_(
+            EntryAggregate.account_id == Budget.account_id,
+            EntryAggregate.period == Budget.period,
+            EntryAggregate.category_id == Budget.category_id,
+        ))
+        .where(Budget.account_id == account_id, Budget.period == period)
+        .order_by(Budget.category_id)
+    )
+    return [
+        _budget_status(category_id, amount, spent, minor_units)
+        for category_id, amount, spent in (await session.exec(query)).all()
+    ]
+
+
+async def get_budget_status(account_id: int, category_id: int, period: date, minor_units: int, session: AsyncSession) -> Optional[dict]:
+    """Get one category's budget for a month with what was spent against it"""
+    budget = await session.get(Budget, (account_id, month_start(period), category_id))
+    if budget is None:
+        return None
+    aggregate = await session.get(EntryAggregate, (account_id, budget.period, category_id))
+    return _budget_status(category_id, budget.amount, aggregate.expense_total if aggregate else 0, minor_units)
@@ -0,0 +1,139 @@
+from datetime import datetime
+from typing import List
+from sqlmodel import func, insert, literal, or_, select, tuple_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models import Account, AccountMembership, Category, ChangeLog, Entry
+
+# Changes returned per sync page by default and at most
+SYNC_PAGE_SIZE = 500
+MAX_SYNC_PAGE_SIZE = 1000
+
+
+async def log_changes(changes: List[tuple[int, str, int, str]], session: AsyncSession) -> None:
+    """Append (account_id, entity, entity_id, operation) changes to the change log, without committing"""
+    if not changes:
+        return
+    now = datetime.now()
+    await session.exec(insert(ChangeLog), params=[
+        {"account_id": account_id, "entity": entity, "entity_id": entity_id, "operation": operation, "created_at": now}
+        for account_id, entity, entity_id, operation in changes
+    ])
+
+
+async def get_max_entry_id(session: AsyncSession) -> int:
+    """Get the highest entry id, so entries inserted afterwards can be logged by id"""
+    return (await session.exec(select(func.max(Entry.id)))).one() or 0
+
+
+async def log_new_entries(account_id: int, after_id: int, session: AsyncSession) -> None:
+    """Log an upsert for every entry of an account with an id above after_id, in one statement"""
+    new_entries = select(
+        Entry.account_id, literal("entry"), Entry.id, literal("upsert"), literal(datetime.now())
+    ).where(Entry.account_id == account_id, Entry.id > after_id)
+    await session.exec(insert(ChangeLog).from_select(
+        ["account_id", "entity", "entity_id", "operation", "created_at"], new_entries
+    ))
+
+
+async def log_rule_entries(rule_ids: List[int], after_id: int, session: AsyncSession) -> None:
+    """Log an upsert for every entry above after_id created by the given recurring rules, in one statement"""
+    new_entries = select(
+        Entry.account_id, literal("entry"), Entry.id, literal("upsert"), literal(datetime.now())
+    ).where(Entry.id > after_id, Entry.recurring_rule_id.in_(rule_ids))
+    await session.exec(insert(ChangeLog).from_select(
+        ["account_id", "entity", "entity_id", "operation", "created_at"], new_entries
+    ))
+
+
+async def log_new_categories(account_ids: List[int], session: AsyncSession) -> None:
+    """Log an upsert for every category of the given accounts, in one statement"""
+    categories = select(
+        Category.account_id, literal("category"), Category.id, literal("upsert"), literal(datetime.now())
+    ).where(Category.account_id.in_(account_ids))
+    await session.exec(insert(ChangeLog).from_select(
+        ["account_id", "entity", "entity_id", "operation", "created_at"], categories
+    ))
+
+
+async def log_member_removals(account_id: int, session: AsyncSession) -> None:
+    """Log a delete for every current member of an account, before the memberships go"""
+    members = select(
+        AccountMembership.account_id, literal("membership"), AccountMembership.user_id, literal("delete"), literal(datetime.now())
+    ).where(AccountMembership.account_id == account_id)
+    await session.exec(insert(ChangeLog).from_select(
+        ["account_id", "entity", "entity_id", "operation", "created_at"], members
+    ))
+
+
+async def list_changes(user_id: int, since: int, session: AsyncSession, limit: int = SYNC_PAGE_SIZE) -> tuple[List[ChangeLog], bool]:
+    """Get a page of changes after the since cursor visible to a user, oldest first.
+
+    A user sees every change to the accounts they are a member of, and the
+    removal of their own memberships, so they learn about accounts they lost
+    access to. Returns the changes and whether more pages follow.
+    """
+    member_of = select(AccountMembership.account_id).where(AccountMembership.user_id == user_id)
+    query = (
+        select(ChangeLog)
+        .where(
+            ChangeLog.id > since,
+            or_(
+                ChangeLog.account_id.in_(member_of),
+                (ChangeLog.entity == "membership") & (ChangeLog.entity_id == user_id),
+            ),
+        )
+        .order_by(ChangeLog.id)
+        .limit(limit + 1)
+    )
+    changes = (await session.exec(query)).all()
+    return changes[:limit], len(changes) > limit
+
+
+async def load_changed_rows(changes: List[ChangeLog], session: AsyncSession) -> dict:
+    """Collapse changes to the last operation per row and load the current state of upserted rows.
+
+    Returns the upserted accounts, memberships, categories and entries, and the
+    deleted (entity, id, account_id) keys. An upserted row that no longer exists
+    is reported as deleted. At most one query is run per entity type.
+    """
+    latest: dict[tuple[str, int, int], str] = {}
+    for change in changes:
+        latest[(change.entity, change.account_id, change.entity_id)] = change.operation
+
+    upserts: dict[str, list[tuple[int, int]]] = {"account": [], "membership": [], "category": [], "entry": []}
+    deleted = []
+    for (entity, account_id, entity_id), operation in latest.items():
+        if operation == "delete":
+            deleted.append((entity, entity_id, account_id))
+        else:
+            upserts[entity].append((account_id, entity_id))
+
+    rows = {"accounts": [], "memberships": [], "categories": [], "entries": []}
+    if upserts["account"]:
+        ids = [entity_id for _, entity_id in upserts["account"]]
+        rows["accounts"] = (await session.exec(select(Account).where(Account.id.in_(ids)).order_by(Account.id))).all()
+    if upserts["membership"]:
+        query = (
+            select(AccountMembership)
+            .where(tuple_(AccountMembership.account_id, AccountMembership.user_id).in_(upserts["membership"]))
+            .order_by(AccountMembership.account_id, AccountMembership.user_id)
+        )
+        rows["memberships"] = (await session.exec(query)).all()
+    if upserts["category"]:
+        ids = [entity_id for _, entity_id in upserts["category"]]
+        rows["categories"] = (await session.exec(select(Category).where(Category.id.in_(ids)).order_by(Category.id))).all()
+    if upserts["entry"]:
+        ids = [entity_id for _, entity_id in upserts["entry"]]
+        rows["entries"] = (await session.exec(select(Entry).where(Entry.id.in_(ids)).order_by(Entry.id))).all()
+
+    found = {
+        "account": {(row.id, row.id) for row in rows["accounts"]},
+        "membership": {(row.account_id, row.user_id) for row in rows["memberships"]},
+        "category": {(row.account_id, row.id) for row in rows["categories"]},
+        "entry": {(row.account_id, row.id) for row in rows["entries"]},
+    }
+    for entity, keys in upserts.items():
+        deleted.extend((entity, entity_id, account_id) for account_id, entity_id in keys if (account_id, entity_id) not in found[entity])
+
+    rows["deleted"] = deleted
+    return rows
@@ -0,0 +1,161 @@
+from datetime import datetime
+from time import perf_counter
+from typing import AsyncIterable, AsyncIterator, List, Sequence
+from sqlmodel import insert, select, tuple_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models import Entry
+import app.crud.account as account_crud
+import app.crud.aggregates as aggregate_crud
+import app.crud.changes as change_crud
+from app.schemas.entries import EntryCreate
+from app.utils.money import to_minor_units
+
+# Rows sent to the database per executemany round-trip
+BULK_BATCH_SIZE = 1000
+
+# Rows fetched from the server-side cursor at a time when exporting
+EXPORT_BATCH_SIZE = 5000
+
+
+async def list_entries(
+    account_id: int,
+    session: AsyncSession,
+    limit: int = 50,
+    after: tuple[datetime, int] | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    category_id: int | None = None,
+    entry_type: str | None = None,
+) -> tuple[List[Entry], bool]:
+    """Get a page of an account's entries, newest first.
+
+    `after` is the (entry_date, id) of the last entry of the previous page; seeking
+    past it on the (account_id, entry_date, id) index keeps every page equally cheap.
+    Returns the entries and whether more pages follow.
+    """
+    query = select(Entry).where(Entry.account_id == account_id)
+    if after is not None:
+        query = query.where(tuple_(Entry.entry_date, Entry.id) < tuple_(*after))
+    if date_from is not None:
+        query = query.where(Entry.entry_date >= date_from)
+    if date_to is not None:
+        query = query.where(Entry.entry_date < date_to)
+    if category_id is not None:
+        query = query.where(Entry.category_id == category_id)
+    if entry_type is not None:
+        query = query.where(Entry.type == entry_type)
+    query = query.order_by(Entry.entry_date.desc(), Entry.id.desc()).limit(limit + 1)
+
+    entries = (await session.exec(query)).all()
+    return entries[:limit], len(entries) > limit
+
+
+async def stream_entries(account_id: int, session: AsyncSession, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[Sequence[tuple]]:
+    """Yield an account's entries oldest first, in batches of at most batch_size rows.
+
+    Rows are plain tuples of EXPORT_COLUMNS read through a server-side cursor,
+    so memory use does not grow with the size of the ledger.
+    """
+    query = (
+        select(
+            Entry.id,
+            Entry.entry_date,
+            Entry.type,
+            Entry.amount,
+            Entry.category_id,
+            Entry.description,
+            Entry.user_id,
+            Entry.created_at,
+        )
+        .where(Entry.account_id == account_id)
+        .order_by(Entry.entry_date, Entry.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await session.stream(query)
+    async for partition in result.partitions():
+        yield [tuple(row) for row in partition]
+
+
+async def insert_entries(account_id: int, user_id: int | None, entries: list[EntryCreate], minor_units: int, session: AsyncSession) -> int:
+    """Insert a batch of entries with a single executemany statement, fold them
+    into the account aggregates, log them for sync and bump the account version,
+    without committing.
+
+    Amounts are stored as integer minor units of the account currency.
+    """
+    if not entries:
+        return 0
+    now = datetime.now()
+    rows = [
+        {
+            "account_id": account_id,
+            "user_id": user_id,
+            "category_id": entry.category_id,
+            "type": entry.type,
+            "amount": to_minor_units(entry.amount, minor_units),
+            "description": entry.description,
+            "entry_date": entry.entry_date,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for entry in entries
+    ]
+    # executemany returns no ids, so the new entries are logged as those above the current maximum
+    max_entry_id = await change_crud.get_max_entry_id(session)
+    await session.exec(insert(Entry), params=rows)
+    await change_crud.log_new_entries(account_id, max_entry_id, session)
+    await aggregate_crud.apply_entries(account_id, rows, session)
+    await account_crud.touch_account(account_id, session)
+    return len(rows)
+
+
+async def bulk_create_entries(
+    account_id: int,
+    user_id: int | None,
+    entries: AsyncIterable[EntryCreate],
+    minor_units: int,
+    session: AsyncSession,
+    batch_size: int = BULK_BATCH_SIZE,
+) -> dict:
+    """Insert a stream of entries in batches inside a single transaction.
+
+    Returns the number of inserted rows along with per-batch throughput.
+    Nothing is committed if any row fails to parse or insert.
+    """
+    batches = []
+    pending: list[EntryCreate] = []
+    started = perf_counter()
+
+    async def flush() -> None:
+        batch_started = perf_counter()
+        rows = await insert_entries(account_id, user_id, pending, minor_units, session)
+        seconds = perf_counter() - batch_started
+        batches.append({
+            "batch": len(batches) + 1,
+            "rows": rows,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds else 0.0,
+        })
+        pending.clear()
+
+    try:
+        async for entry in entries:
+            pending.append(entry)
+            if len(pending) >= batch_size:
+                await flush()
+        if pending:
+            await flush()
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+
+    inserted = sum(batch["rows"] for batch in batches)
+    seconds = perf_counter() - started
+    return {
+        "account_id": account_id,
+        "inserted": inserted,
+        "seconds": seconds,
+        "rows_per_second": inserted / seconds if seconds else 0.0,
+        "batches": batches,
+    }
@@ -0,0 +1,214 @@
+import calendar
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import insert, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models import Account, Entry, RecurringRule
+import app.crud.account as account_crud
+import app.crud.aggregates as aggregate_crud
+import app.crud.changes as change_crud
+from app.schemas.recurring import RecurringRuleCreate
+from app.utils.money import to_minor_units
+
+# Due rules materialized per transaction
+MATERIALIZE_BATCH_SIZE = 5000
+
+# Occurrences one rule may add per run; a rule far behind catches up over
+# several runs instead of building all its entries at once
+MAX_OCCURRENCES_PER_RUN = 1000
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    """Move a datetime by whole months, clamping the day to the end of shorter months"""
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    return value.replace(year=year, month=month, day=min(value.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrence_at(frequency: str, interval: int, starts_at: datetime, index: int) -> datetime:
+    """Get the index-th occurrence (0 for the first) of a schedule.
+
+    Each occurrence is computed from starts_at, so a bill due on the 31st
+    falls on the 30th in April and on the 31st again in May.
+    """
+    step = index * interval
+    if frequency == "daily":
+        return starts_at + timedelta(days=step)
+    if frequency == "weekly":
+        return starts_at + timedelta(weeks=step)
+    if frequency == "monthly":
+        return _add_months(starts_at, step)
+    return _add_months(starts_at, 12 * step)
+
+
+def next_run(rule: RecurringRule, occurrences: int) -> Optional[datetime]:
+    """Get the occurrence after the first `occurrences` ones, or None if the rule has ended by then"""
+    if rule.count is not None and occurrences >= rule.count:
+        return None
+    when = occurrence_at(rule.frequency, rule.interval, rule.starts_at, occurrences)
+    if rule.until is not None and when > rule.until:
+        return None
+    return when
+
+
+async def create_rule(account_id: int, user_id: int | None, rule: RecurringRuleCreate, minor_units: int, session: AsyncSession) -> RecurringRule:
+    """Create a recurring rule whose first occurrence is due at starts_at.
+
+    Raises ValueError if the amount does not fit the account currency.
+    """
+    new_rule = RecurringRule(
+        account_id=account_id,
+        user_id=user_id,
+        category_id=rule.category_id,
+        type=rule.type,
+        amount=to_minor_units(rule.amount, minor_units),
+        description=rule.description,
+        frequency=rule.frequency,
+        interval=rule.interval,
+        starts_at=rule.starts_at,
+        until=rule.until,
+        count=rule.count,
+    )
+    new_rule.next_run_at = next_run(new_rule, 0)
+    session.add(new_rule)
+    await session.commit()
+    await session.refresh(new_rule)
+    return new_rule
+
+
+async def list_rules(account_id: int, session: AsyncSession) -> List[RecurringRule]:
+    """Get an account's recurring rules, oldest first"""
+    query = select(RecurringRule).where(RecurringRule.account_id == account_id).order_by(RecurringRule.id)
+    return (await session.exec(query)).all()
+
+
+async def get_rule(account_id: int, rule_id: int, session: AsyncSession) -> Optional[RecurringRule]:
+    """Get one of an account's recurring rules"""
+    rule = await session.get(RecurringRule, rule_id)
+    return rule if rule is not None and rule.account_id == account_id else None
+
+
+async def delete_rule(rule: RecurringRule, session: AsyncSession) -> None:
+    """Delete a recurring rule; entries it already created are kept.
+
+    Those entries lose their recurring_rule_id, so they are logged as
+    upserts and the account version is bumped in the same transaction.
+    """
+    # Logged first, while the entries can still be found by their rule
+    await change_crud.log_rule_entries([rule.id], 0, session)
+    await session.exec(
+        update(Entry).where(Entry.recurring_rule_id == rule.id).values(recurring_rule_id=None, updated_at=datetime.now())
+    )
+    await account_crud.touch_account(rule.account_id, session)
+    await session.delete(rule)
+    await session.commit()
+
+
+def _insert_ignoring_duplicates(session: AsyncSession):
+    """Core INSERT for entries that skips occurrences which already exist"""
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(Entry.__table__).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql.insert(Entry.__table__).on_conflict_do_nothing()
+    return insert(Entry.__table__).prefix_with("IGNORE")
+
+
+async def _materialize_batch(rules: List[RecurringRule], now: datetime, capped: set[int], session: AsyncSession) -> int:
+    """Insert the occurrences of rules due up to now and advance the rules, without committing.
+
+    Rules that reach MAX_OCCURRENCES_PER_RUN stop there and are added to capped.
+    """
+    rows = []
+    advanced = []
+    for rule in rules:
+        occurrences, when = rule.occurrences, rule.next_run_at
+        while when is not None and when <= now:
+            if occurrences - rule.occurrences >= MAX_OCCURRENCES_PER_RUN:
+                capped.add(rule.id)
+                break
+            rows.append({
+                "account_id": rule.account_id,
+                "user_id": rule.user_id,
+                "category_id": rule.category_id,
+                "recurring_rule_id": rule.id,
+                "type": rule.type,
+                "amount": rule.amount,
+                "description": rule.description,
+                "entry_date": when,
+                "created_at": now,
+                "updated_at": now,
+            })
+            occurrences += 1
+            when = next_run(rule, occurrences)
+        advanced.append({"rule_id": rule.id, "occurrences": occurrences, "next_run_at": when, "updated_at": now})
+
+    # Advancing the rules first takes the write lock, so a concurrent run
+    # waits and then finds every occurrence already inserted
+    await session.exec(
+        update(RecurringRule.__table__).where(RecurringRule.__table__.c.id == bindparam("rule_id")),
+        params=advanced,
+    )
+    if not rows:
+        return 0
+    max_entry_id = await change_crud.get_max_entry_id(session)
+    result = await session.exec(_insert_ignoring_duplicates(session), params=rows)
+
+    # Only rows that were actually inserted count towards aggregates and the
+    # change log; they are read back only if some already existed
+    rule_ids = [rule.id for rule in rules]
+    inserted = rows
+    if result.rowcount != len(rows):
+        inserted = [row._asdict() for row in (await session.exec(
+            select(Entry.account_id, Entry.type, Entry.amount, Entry.entry_date, Entry.category_id)
+            .where(Entry.id > max_entry_id, Entry.recurring_rule_id.in_(rule_ids))
+        )).all()]
+    if inserted:
+        await aggregate_crud.apply_account_entries(inserted, session)
+        await change_crud.log_rule_entries(rule_ids, max_entry_id, session)
+        accounts = Account.__table__
+        await session.exec(
+            update(accounts)
+            .where(accounts.c.id == bindparam("touched_id"))
+            .values(version=accounts.c.version + 1, updated_at=now),
+            params=[{"touched_id": account_id} for account_id in {row["account_id"] for row in inserted}],
+        )
+    return len(inserted)
+
+
+async def materialize_due_rules(session: AsyncSession, now: Optional[datetime] = None, batch_size: int = MATERIALIZE_BATCH_SIZE) -> int:
+    """Create the entries of every rule occurrence due up to now, in committed batches of batch_size rules.
+
+    Due rules are found through the next_run_at index, so idle rules cost
+    nothing. Rules that missed runs, e.g. while the server was down, catch
+    up on their occurrences, at most MAX_OCCURRENCES_PER_RUN per rule; the
+    rest follow on later runs. Each batch is one transaction and the
+    (recurring_rule_id, entry_date) unique index drops occurrences that
+    already exist, so overlapping or repeated runs never duplicate entries.
+    Returns the number of entries created.
+    """
+    now = now or datetime.now()
+    created = 0
+    capped: set[int] = set()
+    while True:
+        # Plain rows rather than ORM objects, as the rules are only read
+        rules_table = RecurringRule.__table__
+        query = (
+            select(*rules_table.c)
+            .where(rules_table.c.next_run_at <= now)
+            .order_by(rules_table.c.next_run_at, rules_table.c.id)
+            .limit(batch_size)
+        )
+        if capped:
+            query = query.where(rules_table.c.id.notin_(capped))
+        rules = (await session.exec(query)).all()
+        if not rules:
+            return created
+        try:
+            created += await _materialize_batch(rules, now, capped, session)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
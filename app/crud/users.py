@@ -1,45 +1,74 @@
-from sqlmodel import Session, select
+from sqlmodel import or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.config import settings
 from app.database import get_session
-from app.models import User
+from app.models import AccountMembership, User
 from app.schemas.users import UserCreate
-from app.utils.security import hash_password
+from app.utils.cache import TTLCache
+from app.utils.security import hash_password_async
 from fastapi import Depends, HTTPException
 
+# Column snapshots of authenticated users keyed by email (the token subject)
+user_cache = TTLCache(max_size=settings.user_cache_max_size, ttl=settings.user_cache_ttl_seconds)
 
-def find_user_by_email(email: str, session: Session):
+
+async def find_user_by_email(email: str, session: AsyncSession):
     database_query = select(User).where(User.email == email and User.is_active)
-    user = session.exec(database_query).first()
+    user = (await session.exec(database_query)).first()
     return user
 
 
-def find_user_by_id(user_id: int, session: Session):
-    return session.get(User, user_id)
+async def find_user_by_id(user_id: int, session: AsyncSession):
+    return await session.get(User, user_id)
 
 
-def create_user(user: UserCreate, session: Session):
+async def create_user(user: UserCreate, session: AsyncSession):
     new_user = User(
-        email=user.email, name=user.name, password_hash=hash_password(user.password)
+        email=user.email, name=user.name, password_hash=await hash_password_async(user.password)
     )
     session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    await session.commit()
+    await session.refresh(new_user)
     return new_user
 
 
-def find_all_users(session: Session):
-    database_query = select(User)
-    users = session.exec(database_query).all()
-    return users
+async def list_visible_users(user_id: int, session: AsyncSession, limit: int = 50, after: int | None = None) -> tuple[list[User], bool]:
+    """Get a page of the users sharing an account with a user, the user included, by id.
+
+    `after` is the id of the last user of the previous page. Returns the users
+    and whether more pages follow.
+    """
+    own_accounts = select(AccountMembership.account_id).where(AccountMembership.user_id == user_id)
+    co_members = select(AccountMembership.user_id).where(AccountMembership.account_id.in_(own_accounts))
+    database_query = select(User).where(or_(User.id == user_id, User.id.in_(co_members)))
+    if after is not None:
+        database_query = database_query.where(User.id > after)
+    database_query = database_query.order_by(User.id).limit(limit + 1)
+    users = (await session.exec(database_query)).all()
+    return users[:limit], len(users) > limit
 
 
-def update_user(user_id: int, user_data: UserCreate, session: Session):
-    user = find_user_by_id(user_id, session)
+async def update_user(user_id: int, user_data: UserCreate, session: AsyncSession):
+    user = await find_user_by_id(user_id, session)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     user.name = user_data.name
     if user_data.password:
-        user.password_hash = hash_password(user_data.password)
+        user.password_hash = await hash_password_async(user_data.password)
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    user_cache.invalidate(user.email)
+    return user
+
+
+async def deactivate_user(user_id: int, session: AsyncSession):
+    user = await find_user_by_id(user_id, session)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    user.is_active = False
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
+    user_cache.invalidate(user.email)
     return user
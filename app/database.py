@@ -1,7 +1,27 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import create_engine, Session, SQLModel
-from typing import Annotated
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Annotated, Callable
 from fastapi import Depends
 from app.config import settings
+from app.utils.metrics import instrument_engine
+
+# asyncio drivers used in place of the default driver of each backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap the driver of a database URL for its asyncio counterpart"""
+    backend, separator, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(backend, backend)}{separator}{rest}"
+
 
 connect_args = (
     {"check_same_thread": False}
@@ -9,8 +29,66 @@ connect_args = (
     else {}
 )
 DATABASE_URL = settings.database_url
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+
+def is_memory_sqlite(url: str) -> bool:
+    """Check whether a URL points at an in-memory SQLite database"""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def pool_options(url: str) -> dict:
+    """Get the pool arguments for an engine on the given URL.
+
+    In-memory SQLite uses a single shared connection, which takes no pool sizing.
+    """
+    if is_memory_sqlite(url):
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def sqlite_pragmas() -> dict:
+    """Get the pragmas set on each new SQLite connection"""
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "mmap_size": settings.sqlite_mmap_size,
+        # Negative values are read by SQLite as KiB rather than pages
+        "cache_size": -settings.sqlite_cache_size_kib,
+    }
 
-engine = create_engine(url=DATABASE_URL, connect_args=connect_args)
+
+def configure_sqlite(engine: Engine) -> None:
+    """Apply sqlite_pragmas() to every connection the engine opens"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in sqlite_pragmas().items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+# The sync engine serves migrations, table creation and scripts;
+# request handlers use the async engine so queries never block the event loop
+engine = create_engine(url=DATABASE_URL, connect_args=connect_args, **pool_options(DATABASE_URL))
+async_engine = create_async_engine(url=ASYNC_DATABASE_URL, connect_args=connect_args, **pool_options(ASYNC_DATABASE_URL))
+configure_sqlite(engine)
+configure_sqlite(async_engine.sync_engine)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
 
 
 def create_db_and_tables():
@@ -22,4 +100,20 @@ def get_session():
         yield session
 
 
+def new_async_session() -> AsyncSession:
+    """Open an async session that is not tied to a request"""
+    return AsyncSession(async_engine, expire_on_commit=False)
+
+
+async def get_async_session():
+    async with new_async_session() as session:
+        yield session
+
+
+def get_async_session_factory() -> Callable[[], AsyncSession]:
+    """Get the factory background tasks use to open their own sessions"""
+    return new_async_session
+
+
 SessionDependency = Annotated[Session, Depends(get_session)]
+AsyncSessionDependency = Annotated[AsyncSession, Depends(get_async_session)]
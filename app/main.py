@@ -1,19 +1,45 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import create_db_and_tables
+from fastapi.responses import PlainTextResponse
+from app.config import settings
+from app.crud.account import membership_cache
+from app.crud.users import user_cache
+from app.database import async_engine, create_db_and_tables
 from app.routes.main import api_router
-from contextlib import asynccontextmanager
+from app.tasks import run_recurring_scheduler, run_refresh_token_sweeper, sweep_refresh_tokens
+from app.utils.metrics import MetricsMiddleware, metrics_registry
+from app.utils.responses import FastJSONResponse
+from app.utils.security import access_token_cache, password_hash_pool
+from contextlib import asynccontextmanager, suppress
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
+    # Start with a clean table and a filter of every unexpired revoked token
+    await sweep_refresh_tokens(settings.refresh_token_sweep_batch_size)
+    sweeper = asyncio.create_task(run_refresh_token_sweeper(
+        settings.refresh_token_sweep_interval_seconds,
+        settings.refresh_token_sweep_batch_size,
+    ))
+    scheduler = asyncio.create_task(run_recurring_scheduler(
+        settings.recurring_rule_interval_seconds,
+        settings.recurring_rule_batch_size,
+    ))
     yield
+    for task in (sweeper, scheduler):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    password_hash_pool.shutdown()
+    await async_engine.dispose()
 
 app = FastAPI(
     title="Pexa - Personal Expense API",
     description="A self hostable API for personal expense tracking built with FastAPI",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # CORS middleware for mobile app support
@@ -27,6 +53,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency and SQL counters, served on /api/metrics
+app.add_middleware(MetricsMiddleware)
+
 
 # Health check endpoint
 @app.get("/api/health")
@@ -34,5 +63,21 @@ async def health_check():
     return {"status": "ok"}
 
 
+# Cache counters, e.g. to check hit rates under load
+@app.get("/api/health/caches")
+async def cache_stats():
+    return {
+        "user_cache": user_cache.stats(),
+        "membership_cache": membership_cache.stats(),
+        "access_token_cache": access_token_cache.stats(),
+    }
+
+
+# Prometheus scrape endpoint
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
 # Include routers
 app.include_router(api_router, prefix="/api")
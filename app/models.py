@@ -1,5 +1,6 @@
-from datetime import datetime, timezone
-from sqlmodel import SQLModel, Field, Relationship
+from datetime import date, datetime, timezone
+from sqlalchemy import BigInteger
+from sqlmodel import SQLModel, Field, Relationship, Index
 
 
 class User(SQLModel, table=True):
@@ -21,18 +22,73 @@ class User(SQLModel, table=True):
 
 
 class Entry(SQLModel, table=True):
+    __table_args__ = (
+        # Keyset pagination over an account's ledger, newest first
+        Index("ix_entry_account_id_entry_date_id", "account_id", "entry_date", "id"),
+        Index("ix_entry_account_id_category_id_entry_date", "account_id", "category_id", "entry_date"),
+        # One entry per occurrence, so materializing a rule twice is harmless
+        Index("ix_entry_recurring_rule_id_entry_date", "recurring_rule_id", "entry_date", unique=True),
+    )
+
     id: int = Field(primary_key=True)
     account_id: int = Field(foreign_key="account.id", nullable=False)
     category_id: int | None = Field(foreign_key="category.id")
     user_id: int | None = Field(foreign_key="user.id")
+    recurring_rule_id: int | None = Field(default=None, foreign_key="recurringrule.id")  # Set on materialized occurrences
     type: str = Field(regex="^(income|expense)$")
-    amount: float
+    amount: int = Field(sa_type=BigInteger)  # Minor units of the account currency
     description: str | None = None
     entry_date: datetime
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
 
+class RecurringRule(SQLModel, table=True):
+    # Schedule of an entry that repeats, after RRULE's FREQ, INTERVAL, COUNT and UNTIL
+    __table_args__ = (
+        # The scheduler only ever reads rules that are due
+        Index("ix_recurringrule_next_run_at", "next_run_at"),
+    )
+
+    id: int = Field(primary_key=True)
+    account_id: int = Field(foreign_key="account.id", nullable=False, index=True)
+    user_id: int | None = Field(default=None, foreign_key="user.id")
+    category_id: int | None = Field(default=None, foreign_key="category.id")
+    type: str = Field(regex="^(income|expense)$")
+    amount: int = Field(sa_type=BigInteger)  # Minor units of the account currency
+    description: str | None = None
+    frequency: str = Field(regex="^(daily|weekly|monthly|yearly)$")
+    interval: int = Field(default=1)  # Every interval days, weeks, months or years
+    starts_at: datetime  # First occurrence
+    until: datetime | None = None  # No occurrences after this
+    count: int | None = None  # Total number of occurrences
+    occurrences: int = Field(default=0)  # Occurrences materialized so far
+    next_run_at: datetime | None = None  # Next occurrence, None once the rule has ended
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class EntryAggregate(SQLModel, table=True):
+    # Running totals per account, month and category, kept in step with Entry writes
+    account_id: int = Field(foreign_key="account.id", primary_key=True)
+    period: date = Field(primary_key=True)  # First day of the month
+    category_id: int = Field(default=0, primary_key=True)  # 0 for uncategorized entries
+    income_total: int = Field(default=0, sa_type=BigInteger)  # Minor units
+    expense_total: int = Field(default=0, sa_type=BigInteger)  # Minor units
+    entry_count: int = Field(default=0)
+
+
+class Budget(SQLModel, table=True):
+    # Spending limit of a category for one month; what was spent comes from
+    # the matching EntryAggregate row, so no entries are read
+    account_id: int = Field(foreign_key="account.id", primary_key=True)
+    period: date = Field(primary_key=True)  # First day of the month
+    category_id: int = Field(foreign_key="category.id", primary_key=True)
+    amount: int = Field(sa_type=BigInteger)  # Minor units
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
 class Category(SQLModel, table=True):
     id: int = Field(primary_key=True)
     account_id: int | None = Field(default=None, foreign_key="account.id")
@@ -48,9 +104,16 @@ class Account(SQLModel, table=True):
     description: str | None = None
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})  # Bumped by every change to the account or its data
+    deleting: bool = Field(default=False, sa_column_kwargs={"server_default": "0"})  # Set once a deletion starts, until the row goes
 
 
 class AccountMembership(SQLModel, table=True):
+    __table_args__ = (
+        # The primary key leads with account_id; this serves lookups by user
+        Index("ix_accountmembership_user_id_account_id", "user_id", "account_id"),
+    )
+
     account_id: int = Field(foreign_key="account.id", primary_key=True)
     user_id: int = Field(foreign_key="user.id", primary_key=True)
     role: str = Field(default="member")
@@ -58,11 +121,28 @@ class AccountMembership(SQLModel, table=True):
     joined_at: datetime = Field(default_factory=datetime.now)
 
 
+class ChangeLog(SQLModel, table=True):
+    # Append-only feed of changes for incremental sync; id is the sync cursor.
+    # No foreign key to account, so tombstones outlive the rows they describe.
+    __table_args__ = (
+        Index("ix_changelog_account_id_id", "account_id", "id"),
+        # Membership changes are also looked up by user, who may have lost access
+        Index("ix_changelog_entity_entity_id", "entity", "entity_id"),
+    )
+
+    id: int = Field(primary_key=True)
+    account_id: int = Field(nullable=False)
+    entity: str  # account, membership, category or entry
+    entity_id: int  # Row id; the member's user id for memberships
+    operation: str  # upsert or delete
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
 class RefreshToken(SQLModel, table=True):
     id: int = Field(primary_key=True)
     user_id: int = Field(foreign_key="user.id", nullable=False, index=True)
-    token: str = Field(nullable=False, index=True)  # Hashed token
-    expires_at: datetime = Field(nullable=False)
+    token_hash: str = Field(nullable=False, unique=True, index=True)  # SHA-256 of the token, hex encoded
+    expires_at: datetime = Field(nullable=False, index=True)
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
@@ -79,4 +159,5 @@ class Currency(SQLModel, table=True):
     code: str = Field(primary_key=True)
     name: str
     symbol: str
+    minor_units: int = Field(default=2, sa_column_kwargs={"server_default": "2"})  # ISO 4217 exponent
     is_active: bool = Field(default=True)
@@ -1,29 +1,139 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session
-from app.database import get_session
-from app.schemas.accounts import AccountCreate, Account as AccountResponse
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.config import settings
+from app.database import get_async_session, get_async_session_factory
+from app.models import User
+from app.schemas.accounts import AccountBatchCreate, AccountCreate, AccountDeletion, AccountMemberPage, AccountPage, Account as AccountResponse
 import app.crud.account as account_crud
-from app.utils.dependencies import get_current_user
+from app.crud.account import AccountPermissions
+from app.routes.entries import ensure_account_access
+from app.tasks import AccountDeletionJob, account_deletions, prune_account_deletions, run_account_deletion
+from app.utils.conditional import account_etag, accounts_etag, conditional_response
+from app.utils.dependencies import get_current_permissions, get_current_user
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.responses import schema_response
 
-from typing import Annotated
+from typing import Annotated, Callable
 
 router = APIRouter()
 
-@router.get("", response_model=list[AccountResponse])
-async def get_all_accounts(token: Annotated[str, Depends(get_current_user)], session: Session = Depends(get_session)):
-    accounts = account_crud.get_all_accounts(session)
-    return accounts
+@router.get("", response_model=AccountPage)
+async def get_all_accounts(
+    current_user: Annotated[User, Depends(get_current_user)],
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """List the accounts the current user has access to, newest first, using cursor pagination"""
+    after = decode_cursor(cursor, datetime, int) if cursor else None
+    accounts, has_more = await account_crud.list_accounts_by_user(current_user.id, session, limit=limit, after=after)
+    last_modified = max((account.updated_at for account in accounts), default=None)
+    not_modified = conditional_response(request, response, accounts_etag(accounts), last_modified)
+    if not_modified:
+        return not_modified
+    next_cursor = encode_cursor(accounts[-1].created_at, accounts[-1].id) if has_more else None
+    return schema_response(AccountPage, {"items": accounts, "next_cursor": next_cursor}, response)
 
 @router.get("/{account_id}", response_model=AccountResponse)
-async def get_account_by_id(token: Annotated[str, Depends(get_current_user)], account_id: int, session: Session = Depends(get_session)):
-    account = account_crud.get_account_by_id(account_id, session)
+async def get_account_by_id(
+    account_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Get one of the current user's accounts"""
+    account = await ensure_account_access(account_id, permissions, session)
+    not_modified = conditional_response(request, response, account_etag(account), account.updated_at)
+    if not_modified:
+        return not_modified
     return account
 
-@router.post("")
+@router.get("/{account_id}/members", response_model=AccountMemberPage)
+async def get_account_members(
+    account_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """List an account's members, owners first, using cursor pagination"""
+    account = await ensure_account_access(account_id, permissions, session)
+    not_modified = conditional_response(request, response, account_etag(account), account.updated_at)
+    if not_modified:
+        return not_modified
+    after = decode_cursor(cursor, bool, datetime, int) if cursor else None
+    members, has_more = await account_crud.get_account_members(account_id, session, limit=limit, after=after)
+    last = members[-1] if members else None
+    next_cursor = encode_cursor(last["is_owner"], last["joined_at"], last["user_id"]) if has_more else None
+    return schema_response(AccountMemberPage, {"items": members, "next_cursor": next_cursor}, response)
+
+def ensure_own_accounts(accounts: list[AccountCreate], current_user: User) -> None:
+    """Raise unless every new account is owned by the current user"""
+    if any(account.owner_id != current_user.id for account in accounts):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Accounts can only be created for yourself")
+
+@router.post("", response_model=AccountResponse)
 async def create_account_endpoint(
     account_data: AccountCreate,
-    token: Annotated[str, Depends(get_current_user)],
-    session: Session = Depends(get_session)
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: AsyncSession = Depends(get_async_session)
 ):
-    new_account = account_crud.create_account(account_data, session)
+    ensure_own_accounts([account_data], current_user)
+    new_account = await account_crud.create_account(account_data, session)
     return new_account
+
+@router.post(":batch", response_model=list[AccountResponse], status_code=status.HTTP_201_CREATED)
+async def create_accounts_endpoint(
+    batch: AccountBatchCreate,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Create up to 1000 accounts owned by the current user, each with default categories, in one transaction"""
+    ensure_own_accounts(batch.accounts, current_user)
+    return await account_crud.create_accounts(batch.accounts, session)
+
+@router.delete("/{account_id}", response_model=AccountDeletion, status_code=status.HTTP_202_ACCEPTED)
+async def delete_account_endpoint(
+    account_id: int,
+    background_tasks: BackgroundTasks,
+    current_user: Annotated[User, Depends(get_current_user)],
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    session: AsyncSession = Depends(get_async_session),
+    session_factory: Callable[[], AsyncSession] = Depends(get_async_session_factory),
+):
+    """Delete an account with all its entries in the background.
+
+    Only the owner may delete an account. Poll GET /accounts/{account_id}/deletion for progress.
+    """
+    if not await account_crud.get_account_by_id(account_id, session):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+    if not permissions.is_owner(account_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the owner can delete an account")
+
+    prune_account_deletions(settings.account_deletion_retention_seconds)
+    job = account_deletions.get(account_id)
+    if job is not None and job.active:
+        return job
+
+    job = account_deletions[account_id] = AccountDeletionJob(account_id=account_id, requested_by=current_user.id)
+    background_tasks.add_task(run_account_deletion, job, session_factory)
+    return job
+
+
+@router.get("/{account_id}/deletion", response_model=AccountDeletion)
+async def get_account_deletion(account_id: int, current_user: Annotated[User, Depends(get_current_user)]):
+    """Get the progress of an account deletion requested by the current user.
+
+    Finished deletions are kept for account_deletion_retention_seconds.
+    """
+    prune_account_deletions(settings.account_deletion_retention_seconds)
+    job = account_deletions.get(account_id)
+    if job is None or job.requested_by != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No deletion found for this account")
+    return job
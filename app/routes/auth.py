@@ -1,20 +1,22 @@
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from typing import Annotated
 
-from app.database import get_session
+from app.database import get_async_session
 import app.crud.users as user_crud
 from app.schemas.users import UserCreate, User as UserResponse
 from app.schemas.token import Token, TokenRefresh
 from app.utils.security import (
-    verify_password,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     verify_refresh_token,
     revoke_refresh_token,
+    revoke_access_token,
+    oauth2_scheme,
 )
 
 from app.utils.dependencies import get_current_user
@@ -22,11 +24,13 @@ from app.utils.dependencies import get_current_user
 router = APIRouter(tags=["authentication"])
 
 
-def authenticate_user(email: str, password: str, session: Session):
-    user = user_crud.find_user_by_email(email, session)
+async def authenticate_user(email: str, password: str, session: AsyncSession):
+    user = await user_crud.find_user_by_email(email, session)
     if not user:
         return False
-    if not verify_password(password, user.password_hash):
+    # Give the connection back to the pool while Argon2 runs
+    await session.close()
+    if not await verify_password_async(password, user.password_hash):
         return False
     return user
 
@@ -35,20 +39,23 @@ def authenticate_user(email: str, password: str, session: Session):
     "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
 async def register_user(
-    user_data: UserCreate, session: Session = Depends(get_session)
+    user_data: UserCreate, session: AsyncSession = Depends(get_async_session)
 ) -> UserResponse:
     """Register a new user."""
     # Check if user with this email already exists
-    existing_user = user_crud.find_user_by_email(user_data.email, session)
+    existing_user = await user_crud.find_user_by_email(user_data.email, session)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email already exists",
         )
 
+    # Give the connection back to the pool while Argon2 runs
+    await session.close()
+
     # Create new user
     # TODO: return 400 if password is not ok
-    new_user = user_crud.create_user(user_data, session)
+    new_user = await user_crud.create_user(user_data, session)
 
     # TODO: Send verification email
 
@@ -58,14 +65,14 @@ async def register_user(
 @router.post("/login", response_model=Token)
 async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> Token:
     """OAuth2 compatible token login, get an access token for future requests.
 
     - **username**: The user's email
     - **password**: The user's password
     """
-    user = authenticate_user(form_data.username, form_data.password, session)
+    user = await authenticate_user(form_data.username, form_data.password, session)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -76,11 +83,11 @@ async def login(
     # Update last login timestamp
     user.last_login = datetime.now()
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
 
     access_token = create_access_token(data={"sub": user.email})
-    refresh_token = create_refresh_token(data={"sub": user.email}, user_id=user.id, db=session)
+    refresh_token = await create_refresh_token(data={"sub": user.email}, user_id=user.id, db=session)
 
     return Token(
         access_token=access_token,
@@ -92,19 +99,23 @@ async def login(
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
     token_data: TokenRefresh,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> Token:
     """Refresh an access token using a refresh token.
 
     - **refresh_token**: A valid refresh token
     """
     try:
-        payload = verify_refresh_token(token_data.refresh_token, db=session)
+        payload = await verify_refresh_token(token_data.refresh_token, db=session)
         user_email = payload.get("sub")
-        user = user_crud.find_user_by_email(email=user_email, session=session)
-        revoke_refresh_token(token=token_data.refresh_token, db=session)
+        user = await user_crud.find_user_by_email(email=user_email, session=session)
+        if user is None or not user.is_active:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        # Rotation: a token that was already used loses the race here
+        if not await revoke_refresh_token(token=token_data.refresh_token, db=session):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
         access_token: str = create_access_token(data={"sub": user_email})
-        refresh_token: str = create_refresh_token(data={"sub": user_email}, user_id=user.id, db=session)
+        refresh_token: str = await create_refresh_token(data={"sub": user_email}, user_id=user.id, db=session)
         return Token(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -119,15 +130,23 @@ async def refresh_token(
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-async def logout(refresh_token: str, user: Annotated[str, Depends(get_current_user)], session: Session = Depends(get_session)):
+async def logout(
+    refresh_token: str,
+    user: Annotated[str, Depends(get_current_user)],
+    access_token: Annotated[str, Depends(oauth2_scheme)],
+    session: AsyncSession = Depends(get_async_session),
+):
     """
     Logout a user when a session is provided
     - **refresh_token**: A valid refresh token
+
+    The access token used for this call stops working too.
     """
+    revoke_access_token(access_token)
     try:
         # User will eventually logged out
         # client should remove JWT token after this call
-        revoke_refresh_token(token=refresh_token, db=session)
+        await revoke_refresh_token(token=refresh_token, db=session)
 
     except HTTPException as exc:
         raise HTTPException(
@@ -0,0 +1,51 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database import get_async_session
+from app.schemas.balances import AccountSummary, Balance
+import app.crud.account as account_crud
+from app.crud.account import AccountPermissions
+import app.crud.aggregates as aggregate_crud
+from app.routes.entries import ensure_account_access
+from app.utils.conditional import account_etag, conditional_response
+from app.utils.dependencies import get_current_permissions
+
+from typing import Annotated
+
+router = APIRouter()
+
+
+@router.get("/{account_id}/balance", response_model=Balance)
+async def get_balance(
+    account_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Get an account's balance from its monthly aggregates"""
+    account = await ensure_account_access(account_id, permissions, session)
+    not_modified = conditional_response(request, response, account_etag(account), account.updated_at)
+    if not_modified:
+        return not_modified
+    minor_units = await account_crud.get_account_minor_units(account_id, session)
+    return await aggregate_crud.get_balance(account_id, minor_units, session)
+
+
+@router.get("/{account_id}/summary", response_model=AccountSummary)
+async def get_summary(
+    account_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    request: Request,
+    response: Response,
+    date_from: date | None = Query(None, alias="from", description="First month to include"),
+    date_to: date | None = Query(None, alias="to", description="Last month to include"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Get monthly and per-category totals; dates are truncated to their month"""
+    account = await ensure_account_access(account_id, permissions, session)
+    not_modified = conditional_response(request, response, account_etag(account), account.updated_at)
+    if not_modified:
+        return not_modified
+    minor_units = await account_crud.get_account_minor_units(account_id, session)
+    return await aggregate_crud.get_summary(account_id, minor_units, session, date_from=date_from, date_to=date_to)
@@ -0,0 +1,66 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database import get_async_session
+from app.schemas.budgets import BudgetPeriod, BudgetSet, BudgetStatus
+import app.crud.account as account_crud
+from app.crud.account import AccountPermissions
+from app.crud.aggregates import month_start
+import app.crud.budgets as budget_crud
+from app.routes.entries import ensure_account_access
+from app.utils.dependencies import get_current_permissions
+from app.utils.money import to_minor_units
+
+from typing import Annotated
+
+router = APIRouter()
+
+
+@router.get("/{account_id}/budgets", response_model=BudgetPeriod)
+async def list_budgets(
+    account_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    period: date | None = Query(None, description="Any day of the month; defaults to the current month"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Get a month's budgets with the amount spent and remaining in each category"""
+    await ensure_account_access(account_id, permissions, session)
+    period = month_start(period or date.today())
+    minor_units = await account_crud.get_account_minor_units(account_id, session)
+    budgets = await budget_crud.list_budgets(account_id, period, minor_units, session)
+    return {"account_id": account_id, "period": period, "budgets": budgets}
+
+
+@router.put("/{account_id}/budgets/{category_id}", response_model=BudgetStatus)
+async def set_budget(
+    account_id: int,
+    category_id: int,
+    budget: BudgetSet,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Set a category's budget for one month, replacing any earlier amount"""
+    await ensure_account_access(account_id, permissions, session)
+    if not await account_crud.category_in_account(account_id, category_id, session):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+    minor_units = await account_crud.get_account_minor_units(account_id, session)
+    try:
+        amount = to_minor_units(budget.amount, minor_units)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc))
+    await budget_crud.set_budget(account_id, category_id, budget.period, amount, session)
+    return await budget_crud.get_budget_status(account_id, category_id, budget.period, minor_units, session)
+
+
+@router.delete("/{account_id}/budgets/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_budget(
+    account_id: int,
+    category_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    period: date = Query(..., description="Any day of the budgeted month"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Remove a category's budget for one month"""
+    await ensure_account_access(account_id, permissions, session)
+    if not await budget_crud.delete_budget(account_id, category_id, period, session):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Budget not found")
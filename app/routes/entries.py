@@ -0,0 +1,126 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database import get_async_session, get_async_session_factory
+from app.models import Account, Entry
+from app.schemas.entries import EntryBulkResult, EntryPage
+import app.crud.account as account_crud
+from app.crud.account import AccountPermissions
+import app.crud.entries as entry_crud
+from app.tasks import account_deletions
+from app.utils.dependencies import get_current_permissions
+from app.utils.conditional import account_etag, conditional_response
+from app.utils.export import EXPORT_MEDIA_TYPES, ensure_export_format, export_chunks
+from app.utils.ingest import entry_format, parse_entries
+from app.utils.money import from_minor_units
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.responses import schema_response
+
+from typing import Annotated, Callable
+
+router = APIRouter()
+
+
+async def ensure_account_access(account_id: int, permissions: AccountPermissions, session: AsyncSession) -> Account:
+    """Get the account, raising unless it exists, is not being deleted and the user is one of its members"""
+    job = account_deletions.get(account_id)
+    if job is not None and job.active:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Account is being deleted")
+    account = await account_crud.get_account_by_id(account_id, session)
+    if not account:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+    if not permissions.can_access(account_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this account")
+    if account.deleting:
+        # A deletion that stopped partway, e.g. on a restart, leaves the account flagged
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Account is being deleted")
+    return account
+
+
+def entry_response(entry: Entry, minor_units: int) -> dict:
+    """Render a stored entry with its amount converted back from minor units"""
+    return {**entry.model_dump(), "amount": from_minor_units(entry.amount, minor_units)}
+
+
+@router.post("/{account_id}/entries:bulk", response_model=EntryBulkResult, status_code=status.HTTP_201_CREATED)
+async def bulk_create_entries(
+    account_id: int,
+    request: Request,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Import entries streamed as NDJSON (application/x-ndjson) or CSV (text/csv) with a header row.
+
+    The whole import runs in one transaction; the response reports per-batch throughput.
+    """
+    fmt = entry_format(request.headers.get("content-type"))
+    await ensure_account_access(account_id, permissions, session)
+    minor_units = await account_crud.get_account_minor_units(account_id, session)
+    category_ids = await account_crud.get_category_ids(account_id, session)
+    entries = parse_entries(request.stream(), fmt, minor_units, category_ids)
+    return await entry_crud.bulk_create_entries(account_id, permissions.user_id, entries, minor_units, session)
+
+
+@router.get("/{account_id}/entries", response_model=EntryPage)
+async def list_entries(
+    account_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    date_from: datetime | None = Query(None, description="Inclusive lower bound on entry_date"),
+    date_to: datetime | None = Query(None, description="Exclusive upper bound on entry_date"),
+    category_id: int | None = None,
+    type: str | None = Query(None, pattern="^(income|expense)$"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """List an account's entries newest first using cursor pagination"""
+    account = await ensure_account_access(account_id, permissions, session)
+    not_modified = conditional_response(request, response, account_etag(account), account.updated_at)
+    if not_modified:
+        return not_modified
+    after = decode_cursor(cursor, datetime, int) if cursor else None
+    minor_units = await account_crud.get_account_minor_units(account_id, session)
+    entries, has_more = await entry_crud.list_entries(
+        account_id,
+        session,
+        limit=limit,
+        after=after,
+        date_from=date_from,
+        date_to=date_to,
+        category_id=category_id,
+        entry_type=type,
+    )
+    next_cursor = encode_cursor(entries[-1].entry_date, entries[-1].id) if has_more else None
+    return schema_response(EntryPage, {"items": [entry_response(entry, minor_units) for entry in entries], "next_cursor": next_cursor}, response)
+
+
+@router.get("/{account_id}/entries/export", response_class=StreamingResponse)
+async def export_entries(
+    account_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    session: AsyncSession = Depends(get_async_session),
+    session_factory: Callable[[], AsyncSession] = Depends(get_async_session_factory),
+):
+    """Download an account's full ledger, oldest first, as CSV, NDJSON or Parquet.
+
+    Rows are streamed from a server-side cursor, so memory use stays flat however large the ledger is.
+    """
+    ensure_export_format(format)
+    await ensure_account_access(account_id, permissions, session)
+    minor_units = await account_crud.get_account_minor_units(account_id, session)
+
+    async def body():
+        # The stream outlives the request's session, so it reads through its own
+        async with session_factory() as export_session:
+            async for chunk in export_chunks(entry_crud.stream_entries(account_id, export_session), format, minor_units):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="account-{account_id}-entries.{format}"'},
+    )
@@ -3,8 +3,20 @@ from fastapi import APIRouter
 from app.routes import users
 from app.routes import accounts
 from app.routes import auth
+from app.routes import entries
+from app.routes import balances
+from app.routes import reports
+from app.routes import sync
+from app.routes import recurring
+from app.routes import budgets
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(accounts.router, prefix="/accounts", tags=["accounts"])
+api_router.include_router(entries.router, prefix="/accounts", tags=["entries"])
+api_router.include_router(balances.router, prefix="/accounts", tags=["balances"])
+api_router.include_router(reports.router, prefix="/accounts", tags=["reports"])
+api_router.include_router(recurring.router, prefix="/accounts", tags=["recurring"])
+api_router.include_router(budgets.router, prefix="/accounts", tags=["budgets"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database import get_async_session
+from app.models import RecurringRule
+from app.schemas.recurring import RecurringRuleCreate, RecurringRule as RecurringRuleResponse
+import app.crud.account as account_crud
+from app.crud.account import AccountPermissions
+import app.crud.recurring as recurring_crud
+from app.routes.entries import ensure_account_access
+from app.utils.dependencies import get_current_permissions
+from app.utils.money import from_minor_units
+
+from typing import Annotated, List
+
+router = APIRouter()
+
+
+def rule_response(rule: RecurringRule, minor_units: int) -> dict:
+    """Render a stored rule with its amount converted back from minor units"""
+    return {**rule.model_dump(), "amount": from_minor_units(rule.amount, minor_units)}
+
+
+@router.post("/{account_id}/recurring-rules", response_model=RecurringRuleResponse, status_code=status.HTTP_201_CREATED)
+async def create_recurring_rule(
+    account_id: int,
+    rule: RecurringRuleCreate,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Create a recurring rule; the scheduler adds its entries as they fall due, past ones included"""
+    await ensure_account_access(account_id, permissions, session)
+    if rule.category_id is not None and not await account_crud.category_in_account(account_id, rule.category_id, session):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category does not belong to this account")
+    minor_units = await account_crud.get_account_minor_units(account_id, session)
+    try:
+        new_rule = await recurring_crud.create_rule(account_id, permissions.user_id, rule, minor_units, session)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc))
+    return rule_response(new_rule, minor_units)
+
+
+@router.get("/{account_id}/recurring-rules", response_model=List[RecurringRuleResponse])
+async def list_recurring_rules(
+    account_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    session: AsyncSession = Depends(get_async_session),
+):
+    """List an account's recurring rules"""
+    await ensure_account_access(account_id, permissions, session)
+    minor_units = await account_crud.get_account_minor_units(account_id, session)
+    return [rule_response(rule, minor_units) for rule in await recurring_crud.list_rules(account_id, session)]
+
+
+@router.delete("/{account_id}/recurring-rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_recurring_rule(
+    account_id: int,
+    rule_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Stop a recurring rule; entries it already created are kept"""
+    await ensure_account_access(account_id, permissions, session)
+    rule = await recurring_crud.get_rule(account_id, rule_id, session)
+    if not rule:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recurring rule not found")
+    await recurring_crud.delete_rule(rule, session)
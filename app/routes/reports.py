@@ -0,0 +1,94 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.analytics.columns import load_entry_columns
+from app.analytics import reports
+from app.database import get_async_session
+from app.schemas.reports import CategoryReport, MonthlyReport, PercentileReport
+import app.crud.account as account_crud
+from app.crud.account import AccountPermissions
+from app.routes.entries import ensure_account_access
+from app.utils.conditional import account_etag, conditional_response
+from app.utils.dependencies import get_current_permissions
+
+from typing import Annotated
+
+router = APIRouter()
+
+
+@router.get("/{account_id}/reports/monthly", response_model=MonthlyReport)
+async def monthly_report(
+    account_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    request: Request,
+    response: Response,
+    date_from: date | None = Query(None, alias="from", description="First day to include"),
+    date_to: date | None = Query(None, alias="to", description="Last day to include"),
+    window: int = Query(3, ge=1, le=60, description="Months in each rolling mean"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Get monthly income, expense and net with rolling means"""
+    account = await ensure_account_access(account_id, permissions, session)
+    not_modified = conditional_response(request, response, account_etag(account), account.updated_at)
+    if not_modified:
+        return not_modified
+    minor_units = await account_crud.get_account_minor_units(account_id, session)
+    columns = await load_entry_columns(account_id, session, date_from, date_to)
+    return {
+        "account_id": account_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "window": window,
+        "months": reports.monthly_report(columns, minor_units, window, date_from, date_to),
+    }
+
+
+@router.get("/{account_id}/reports/categories", response_model=CategoryReport)
+async def category_report(
+    account_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    request: Request,
+    response: Response,
+    date_from: date | None = Query(None, alias="from", description="First day to include"),
+    date_to: date | None = Query(None, alias="to", description="Last day to include"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Get totals, share of spending and expense percentiles per category"""
+    account = await ensure_account_access(account_id, permissions, session)
+    not_modified = conditional_response(request, response, account_etag(account), account.updated_at)
+    if not_modified:
+        return not_modified
+    minor_units = await account_crud.get_account_minor_units(account_id, session)
+    columns = await load_entry_columns(account_id, session, date_from, date_to)
+    return {
+        "account_id": account_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "categories": reports.category_report(columns, minor_units),
+    }
+
+
+@router.get("/{account_id}/reports/percentiles", response_model=PercentileReport)
+async def percentile_report(
+    account_id: int,
+    permissions: Annotated[AccountPermissions, Depends(get_current_permissions)],
+    request: Request,
+    response: Response,
+    date_from: date | None = Query(None, alias="from", description="First day to include"),
+    date_to: date | None = Query(None, alias="to", description="Last day to include"),
+    type: str = Query("expense", pattern="^(income|expense)$"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Get percentiles of entry amounts and monthly totals of one entry type"""
+    account = await ensure_account_access(account_id, permissions, session)
+    not_modified = conditional_response(request, response, account_etag(account), account.updated_at)
+    if not_modified:
+        return not_modified
+    minor_units = await account_crud.get_account_minor_units(account_id, session)
+    columns = await load_entry_columns(account_id, session, date_from, date_to)
+    return {
+        "account_id": account_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        **reports.percentile_report(columns, minor_units, type),
+    }
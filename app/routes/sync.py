@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database import get_async_session
+from app.models import User
+from app.schemas.sync import SyncDelta
+import app.crud.account as account_crud
+import app.crud.changes as change_crud
+from app.routes.entries import entry_response
+from app.utils.dependencies import get_current_user
+from app.utils.pagination import decode_cursor, encode_cursor
+
+from typing import Annotated
+
+router = APIRouter()
+
+
+@router.get("", response_model=SyncDelta)
+async def sync(
+    current_user: Annotated[User, Depends(get_current_user)],
+    since: str | None = Query(None, description="Cursor of the previous sync; omit for a full sync"),
+    limit: int = Query(change_crud.SYNC_PAGE_SIZE, ge=1, le=change_crud.MAX_SYNC_PAGE_SIZE, description="Maximum number of changes to read"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Get everything that changed in the current user's accounts since a cursor"""
+    (after,) = decode_cursor(since, int) if since else (0,)
+    changes, has_more = await change_crud.list_changes(current_user.id, after, session, limit=limit)
+    rows = await change_crud.load_changed_rows(changes, session)
+
+    deleted = [{"entity": entity, "id": entity_id, "account_id": account_id} for entity, entity_id, account_id in rows["deleted"]]
+    # Losing a membership takes the whole account away from this user
+    deleted.extend(
+        {"entity": "account", "id": account_id, "account_id": account_id}
+        for entity, entity_id, account_id in rows["deleted"]
+        if entity == "membership" and entity_id == current_user.id
+        and ("account", account_id, account_id) not in rows["deleted"]
+    )
+
+    entries = []
+    if rows["entries"]:
+        minor_units = await account_crud.get_accounts_minor_units(list({entry.account_id for entry in rows["entries"]}), session)
+        entries = [entry_response(entry, minor_units[entry.account_id]) for entry in rows["entries"]]
+
+    return SyncDelta(
+        accounts=rows["accounts"],
+        memberships=rows["memberships"],
+        categories=rows["categories"],
+        entries=entries,
+        deleted=deleted,
+        cursor=encode_cursor(changes[-1].id if changes else after),
+        has_more=has_more,
+    )
@@ -1,18 +1,27 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session
-from app.database import get_session
-from app.schemas.users import User as UserResponse
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database import get_async_session
+from app.models import User
+from app.schemas.users import UserPage
 import app.crud.users as user_crud
 from typing import Annotated
 
 from app.utils.dependencies import get_current_user
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.responses import schema_response
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[UserResponse])
-async def get_all_users(token: Annotated[str,Depends(get_current_user)], session: Session = Depends(get_session)):
-    """Fetch all users"""
-
-    users = user_crud.find_all_users(session)
-    return users
+@router.get("", response_model=UserPage)
+async def get_all_users(
+    current_user: Annotated[User, Depends(get_current_user)],
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Fetch the current user and everyone sharing an account with them, using cursor pagination"""
+    (after,) = decode_cursor(cursor, int) if cursor else (None,)
+    users, has_more = await user_crud.list_visible_users(current_user.id, session, limit=limit, after=after)
+    next_cursor = encode_cursor(users[-1].id) if has_more else None
+    return schema_response(UserPage, {"items": users, "next_cursor": next_cursor})
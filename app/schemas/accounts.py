@@ -13,6 +13,11 @@ class AccountBase(BaseModel):
 class AccountCreate(AccountBase):
     owner_id: int
 
+
+class AccountBatchCreate(BaseModel):
+    """Schema for creating many accounts in one request"""
+    accounts: list[AccountCreate] = Field(..., min_length=1, max_length=1000)
+
 class AccountUpdate(BaseModel):
     """Schema for updating an account"""
     name: str | None = Field(None, min_length=1, max_length=100, description="Account name")
@@ -30,6 +35,12 @@ class Account(AccountBase):
         from_attributes = True
 
 
+class AccountPage(BaseModel):
+    """Schema for a page of accounts; pass next_cursor back to fetch the following page"""
+    items: list[Account]
+    next_cursor: str | None = None
+
+
 class AccountMember(BaseModel):
     """Schema for account member information"""
     user_id: int
@@ -40,6 +51,12 @@ class AccountMember(BaseModel):
     joined_at: datetime
 
 
+class AccountMemberPage(BaseModel):
+    """Schema for a page of account members; pass next_cursor back to fetch the following page"""
+    items: list[AccountMember]
+    next_cursor: str | None = None
+
+
 class AccountMembershipCreate(BaseModel):
     """Schema for adding a user to an account"""
     user_id: int
@@ -49,3 +66,16 @@ class AccountMembershipCreate(BaseModel):
 class AccountWithMembers(Account):
     """Schema for account with member information"""
     members: list[AccountMember] = []
+
+
+class AccountDeletion(BaseModel):
+    """Schema for the status of a background account deletion"""
+    account_id: int
+    status: str = Field(..., description="pending, running, completed or failed")
+    deleted_entries: int
+    error: str | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
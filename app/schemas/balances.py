@@ -0,0 +1,39 @@
+from datetime import date
+from pydantic import BaseModel
+from app.utils.money import Money
+
+
+class Balance(BaseModel):
+    """Schema for an account's lifetime totals"""
+    account_id: int
+    income: Money
+    expense: Money
+    balance: Money
+    entry_count: int
+
+
+class PeriodSummary(BaseModel):
+    """Schema for the totals of one month"""
+    period: date
+    income: Money
+    expense: Money
+    net: Money
+    entry_count: int
+
+
+class CategorySummary(BaseModel):
+    """Schema for the totals of one category over the summarized months"""
+    category_id: int | None
+    income: Money
+    expense: Money
+    net: Money
+    entry_count: int
+
+
+class AccountSummary(BaseModel):
+    """Schema for an account summary over a range of months"""
+    account_id: int
+    date_from: date | None
+    date_to: date | None
+    periods: list[PeriodSummary] = []
+    categories: list[CategorySummary] = []
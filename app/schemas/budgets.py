@@ -0,0 +1,24 @@
+from datetime import date
+from pydantic import BaseModel, Field
+from app.utils.money import Money
+
+
+class BudgetSet(BaseModel):
+    """Schema for setting a category's budget for one month"""
+    period: date = Field(..., description="Any day of the budgeted month")
+    amount: Money = Field(..., ge=0, description="Spending limit for the month, e.g. \"400.00\"")
+
+
+class BudgetStatus(BaseModel):
+    """Schema for a category's budget and what was spent against it"""
+    category_id: int
+    amount: Money
+    spent: Money
+    remaining: Money = Field(..., description="Negative once the budget is overspent")
+
+
+class BudgetPeriod(BaseModel):
+    """Schema for an account's budgets for one month"""
+    account_id: int
+    period: date
+    budgets: list[BudgetStatus] = []
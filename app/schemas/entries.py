@@ -0,0 +1,50 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from app.utils.money import Money
+
+
+class EntryCreate(BaseModel):
+    """Schema for a single imported entry"""
+    type: str = Field(..., pattern="^(income|expense)$", description="Either income or expense")
+    amount: Money = Field(..., ge=0, description="Absolute amount of the entry, e.g. \"12.30\"")
+    entry_date: datetime
+    category_id: int | None = None
+    description: str | None = Field(None, max_length=500, description="Optional entry description")
+
+
+class EntryBulkBatch(BaseModel):
+    """Schema for the throughput of a single insert batch"""
+    batch: int
+    rows: int
+    seconds: float
+    rows_per_second: float
+
+
+class EntryBulkResult(BaseModel):
+    """Schema for the result of a bulk entry import"""
+    account_id: int
+    inserted: int
+    seconds: float
+    rows_per_second: float
+    batches: list[EntryBulkBatch] = []
+
+
+class Entry(BaseModel):
+    """Schema for entry response"""
+    id: int
+    account_id: int
+    category_id: int | None
+    user_id: int | None
+    recurring_rule_id: int | None = None
+    type: str
+    amount: Money
+    description: str | None
+    entry_date: datetime
+    created_at: datetime
+    updated_at: datetime
+
+
+class EntryPage(BaseModel):
+    """Schema for a page of entries; pass next_cursor back to fetch the following page"""
+    items: list[Entry]
+    next_cursor: str | None = None
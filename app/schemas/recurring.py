@@ -0,0 +1,47 @@
+from datetime import datetime
+from pydantic import BaseModel, Field, field_validator, model_validator
+from app.utils.dates import to_local_naive
+from app.utils.money import Money
+
+
+class RecurringRuleCreate(BaseModel):
+    """Schema for creating a recurring entry; the schedule follows RRULE's FREQ, INTERVAL, COUNT and UNTIL"""
+    type: str = Field(..., pattern="^(income|expense)$", description="Either income or expense")
+    amount: Money = Field(..., ge=0, description="Absolute amount of each entry, e.g. \"12.30\"")
+    category_id: int | None = None
+    description: str | None = Field(None, max_length=500, description="Optional entry description")
+    frequency: str = Field(..., pattern="^(daily|weekly|monthly|yearly)$")
+    interval: int = Field(1, ge=1, le=1000, description="Repeat every interval days, weeks, months or years")
+    starts_at: datetime = Field(..., description="First occurrence; monthly and yearly rules keep its day, clamped to the month's end")
+    until: datetime | None = Field(None, description="No occurrences after this")
+    count: int | None = Field(None, ge=1, description="Total number of occurrences")
+
+    @field_validator("starts_at", "until")
+    @classmethod
+    def to_local(cls, value: datetime | None) -> datetime | None:
+        # Offsets are applied first, so aware and naive values compare
+        return to_local_naive(value)
+
+    @model_validator(mode="after")
+    def check_until(self):
+        if self.until is not None and self.until < self.starts_at:
+            raise ValueError("until must not be before starts_at")
+        return self
+
+
+class RecurringRule(BaseModel):
+    """Schema for recurring rule response"""
+    id: int
+    account_id: int
+    category_id: int | None
+    type: str
+    amount: Money
+    description: str | None
+    frequency: str
+    interval: int
+    starts_at: datetime
+    until: datetime | None
+    count: int | None
+    occurrences: int
+    next_run_at: datetime | None = Field(None, description="Next occurrence, null once the rule has ended")
+    created_at: datetime
@@ -0,0 +1,54 @@
+from datetime import date
+from pydantic import BaseModel, Field
+from app.utils.money import Money
+
+
+class MonthlyTrend(BaseModel):
+    """Schema for one month of a trend report"""
+    period: date
+    income: Money
+    expense: Money
+    net: Money
+    entry_count: int
+    expense_rolling_mean: Money | None = Field(None, description="Mean monthly expense over the window ending this month")
+    net_rolling_mean: Money | None = Field(None, description="Mean monthly net over the window ending this month")
+
+
+class MonthlyReport(BaseModel):
+    """Schema for monthly trends with rolling means; months without entries have zero totals"""
+    account_id: int
+    date_from: date | None
+    date_to: date | None
+    window: int
+    months: list[MonthlyTrend] = []
+
+
+class CategoryBreakdown(BaseModel):
+    """Schema for the totals and expense distribution of one category"""
+    category_id: int | None
+    income: Money
+    expense: Money
+    entry_count: int
+    expense_share: float = Field(..., description="Fraction of all expenses in the range")
+    expense_median: Money | None
+    expense_p90: Money | None
+
+
+class CategoryReport(BaseModel):
+    """Schema for a per-category breakdown over a date range"""
+    account_id: int
+    date_from: date | None
+    date_to: date | None
+    categories: list[CategoryBreakdown] = []
+
+
+class PercentileReport(BaseModel):
+    """Schema for the distribution of entry amounts and monthly totals of one entry type"""
+    account_id: int
+    date_from: date | None
+    date_to: date | None
+    type: str
+    entry_count: int
+    mean: Money | None
+    entries: dict[str, Money] = Field(default_factory=dict, description="Percentiles of single entry amounts, keyed p10 to p99")
+    monthly_totals: dict[str, Money] = Field(default_factory=dict, description="Percentiles of monthly totals, keyed p10 to p99")
@@ -0,0 +1,51 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from app.schemas.accounts import Account
+from app.schemas.entries import Entry
+
+
+class SyncMembership(BaseModel):
+    """Schema for a membership in a sync delta"""
+    account_id: int
+    user_id: int
+    role: str
+    is_owner: bool
+    joined_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SyncCategory(BaseModel):
+    """Schema for a category in a sync delta"""
+    id: int
+    account_id: int | None
+    name: str
+    type: str
+    is_default: bool
+
+    class Config:
+        from_attributes = True
+
+
+class SyncTombstone(BaseModel):
+    """Schema for a deleted row; memberships are identified by their user_id"""
+    entity: str = Field(..., description="account, membership, category or entry")
+    id: int
+    account_id: int
+
+
+class SyncDelta(BaseModel):
+    """Schema for the rows changed since a sync cursor.
+
+    Rows are in their current state. Pass cursor back as since to fetch the
+    next delta, straight away while has_more is true. A deleted account, or a
+    deleted membership of the current user, means all of that account's data is gone.
+    """
+    accounts: list[Account] = []
+    memberships: list[SyncMembership] = []
+    categories: list[SyncCategory] = []
+    entries: list[Entry] = []
+    deleted: list[SyncTombstone] = []
+    cursor: str
+    has_more: bool
@@ -21,3 +21,9 @@ class User(UserBase):
 
 #    class Config:
 #
+
+
+class UserPage(BaseModel):
+    """Schema for a page of users; pass next_cursor back to fetch the following page"""
+    items: list[User]
+    next_cursor: str | None = None
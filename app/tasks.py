@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.crud.account as account_crud
+import app.crud.recurring as recurring_crud
+from app.database import new_async_session
+from app.utils.security import delete_expired_refresh_tokens, load_revoked_tokens
+
+logger = logging.getLogger(__name__)
+
+
+async def sweep_refresh_tokens(batch_size: int) -> tuple[int, int]:
+    """Delete expired refresh tokens, then reload the revocation filter.
+
+    Returns the number of deleted tokens and of revoked tokens loaded.
+    """
+    async with new_async_session() as session:
+        deleted = await delete_expired_refresh_tokens(session, batch_size)
+        revoked = await load_revoked_tokens(session)
+    return deleted, revoked
+
+
+async def run_refresh_token_sweeper(interval: float, batch_size: int) -> None:
+    """Sweep refresh tokens every interval seconds until cancelled"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            deleted, revoked = await sweep_refresh_tokens(batch_size)
+            logger.info("Deleted %d expired refresh tokens, %d revoked tokens loaded", deleted, revoked)
+        except Exception:
+            logger.exception("Refresh token sweep failed")
+
+
+async def materialize_recurring_entries(batch_size: int) -> int:
+    """Create the entries of every due recurring rule occurrence; returns how many were created"""
+    async with new_async_session() as session:
+        return await recurring_crud.materialize_due_rules(session, batch_size=batch_size)
+
+
+async def run_recurring_scheduler(interval: float, batch_size: int) -> None:
+    """Materialize due recurring rules now and then every interval seconds until cancelled.
+
+    The first run catches up on occurrences missed while the server was down,
+    in the background so startup does not wait for it.
+    """
+    while True:
+        try:
+            created = await materialize_recurring_entries(batch_size)
+            if created:
+                logger.info("Created %d recurring entries", created)
+        except Exception:
+            logger.exception("Materializing recurring entries failed")
+        await asyncio.sleep(interval)
+
+
+@dataclass
+class AccountDeletionJob:
+    """Progress of an account deletion running in the background"""
+    account_id: int
+    requested_by: int
+    status: str = "pending"  # pending, running, completed or failed
+    deleted_entries: int = 0
+    error: str | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("pending", "running")
+
+
+# Deletion jobs of this process by account id
+account_deletions: dict[int, AccountDeletionJob] = {}
+
+
+def prune_account_deletions(retention_seconds: float) -> None:
+    """Forget deletion jobs that finished more than retention_seconds ago"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=retention_seconds)
+    for account_id, job in list(account_deletions.items()):
+        if job.finished_at is not None and job.finished_at < cutoff:
+            del account_deletions[account_id]
+
+
+async def run_account_deletion(job: AccountDeletionJob, session_factory: Callable[[], AsyncSession]) -> None:
+    """Delete the job's account in batches, recording progress on the job"""
+    job.status = "running"
+    job.started_at = datetime.now(timezone.utc)
+
+    def record_progress(deleted: int) -> None:
+        job.deleted_entries = deleted
+
+    try:
+        async with session_factory() as session:
+            await account_crud.delete_account(job.account_id, session, on_progress=record_progress)
+        job.status = "completed"
+    except Exception as exc:
+        logger.exception("Deleting account %d failed", job.account_id)
+        job.status = "failed"
+        job.error = str(exc)
+    finally:
+        job.finished_at = datetime.now(timezone.utc)
@@ -0,0 +1,42 @@
+import hashlib
+import math
+import threading
+
+
+class BloomFilter:
+    """Fixed-size set of byte strings that can answer "definitely absent".
+
+    might_contain never returns False for an added key; it returns True for
+    keys that were not added at roughly error_rate once capacity keys are in.
+    Keys cannot be removed, so callers rebuild the filter to drop them.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, key: bytes) -> list[int]:
+        # Double hashing: k positions derived from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: bytes) -> None:
+        """Add a key to the filter"""
+        positions = self._positions(key)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def might_contain(self, key: bytes) -> bool:
+        """Check whether a key may have been added; False is always exact"""
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
@@ -0,0 +1,64 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a time to live.
+
+    A cache created with max_size or ttl of zero stores nothing, which lets
+    callers disable caching through settings without extra branches.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live value, counting the lookup as a hit or a miss"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] <= time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store a value, evicting the least recently used entries when full.
+
+        ttl overrides the cache-wide time to live, e.g. to stop at a token's expiry.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.max_size <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Get the current size and hit/miss counters"""
+        with self._lock:
+            return {"size": len(self._data), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
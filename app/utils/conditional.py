@@ -0,0 +1,71 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable
+
+from fastapi import Request, Response, status
+
+from app.models import Account
+
+
+def _account_key(account: Account) -> str:
+    # Ids are reused after a deletion, so the creation time tells a new account from an old one
+    return f"{account.id}-{account.created_at.timestamp():.6f}-{account.version}"
+
+
+def account_etag(account: Account) -> str:
+    """Weak ETag of anything derived from one account, valid per URL"""
+    return f'W/"{_account_key(account)}"'
+
+
+def accounts_etag(accounts: Iterable[Account]) -> str:
+    """Weak ETag of a list of accounts, changing when any account changes or the set does"""
+    digest = hashlib.sha1(",".join(_account_key(account) for account in accounts).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _http_date(value: datetime) -> str:
+    # Timestamps without a zone are local time, as written by datetime.now()
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header"""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return last_modified.astimezone(timezone.utc).replace(microsecond=0) <= since
+
+
+def conditional_response(request: Request, response: Response, etag: str, last_modified: datetime | None = None) -> Response | None:
+    """Set ETag and Last-Modified on a response, or build a 304 if the client's copy is current.
+
+    Routes return the 304 as is when one is built, so the body is never loaded or
+    serialized. If-Modified-Since is only consulted without If-None-Match.
+    """
+    # Responses are per user, and clients must revalidate before reusing them
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        fresh = if_modified_since is not None and last_modified is not None and _not_modified_since(if_modified_since, last_modified)
+    if fresh:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,13 @@
+from datetime import datetime
+from typing import Optional
+
+
+def to_local_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to naive local time; naive values are kept as they are.
+
+    Entry dates are stored as naive local time, as written by datetime.now(),
+    so an offset is applied here rather than dropped.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
@@ -1,12 +1,34 @@
-from fastapi import Depends
-from sqlmodel import Session
-from app.crud.users import find_user_by_email
-from app.database import get_session
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.crud.account import AccountPermissions, get_account_permissions
+from app.crud.users import find_user_by_email, user_cache
+from app.database import get_async_session
 from app.utils.security import oauth2_scheme, verify_token
 from app.models import User
 
-def get_current_user(token: str = Depends(dependency=oauth2_scheme), session: Session = Depends(get_session)) -> User | None:
+async def get_current_user(token: str = Depends(dependency=oauth2_scheme), session: AsyncSession = Depends(get_async_session)) -> User | None:
     token_data = verify_token(token)
     user_email: str = token_data['sub']
-    user: User | None = find_user_by_email(email=user_email, session=session)
+
+    snapshot = user_cache.get(user_email)
+    if snapshot is not None:
+        # Attach a copy to this session without a round-trip to the database
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return await session.merge(user, load=False)
+
+    user: User | None = await find_user_by_email(email=user_email, session=session)
+    if user is None or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user_cache.set(user_email, user.model_dump())
     return user
+
+
+async def get_current_permissions(current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_async_session)) -> AccountPermissions:
+    """Get the current user's account memberships, loaded at most once per request"""
+    return await get_account_permissions(current_user.id, session)
@@ -0,0 +1,123 @@
+import csv
+import io
+import json
+from typing import AsyncIterable, AsyncIterator, Sequence
+
+from fastapi import HTTPException, status
+
+from app.utils.money import from_minor_units
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    pa = pq = None
+
+# Columns of an exported entry, in file order
+EXPORT_COLUMNS = ("id", "entry_date", "type", "amount", "category_id", "description", "user_id", "created_at")
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def ensure_export_format(fmt: str) -> None:
+    """Raise unless the export format can be produced by this installation"""
+    if fmt == "parquet" and pa is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export requires pyarrow to be installed",
+        )
+
+
+async def _csv_chunks(batches: AsyncIterable[Sequence[tuple]], minor_units: int) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    async for rows in batches:
+        writer.writerows(
+            (row_id, entry_date.isoformat(), entry_type, from_minor_units(amount, minor_units),
+             category_id, description, user_id, created_at.isoformat())
+            for row_id, entry_date, entry_type, amount, category_id, description, user_id, created_at in rows
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+async def _ndjson_chunks(batches: AsyncIterable[Sequence[tuple]], minor_units: int) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield "".join(
+            json.dumps({
+                "id": row_id,
+                "entry_date": entry_date.isoformat(),
+                "type": entry_type,
+                "amount": str(from_minor_units(amount, minor_units)),
+                "category_id": category_id,
+                "description": description,
+                "user_id": user_id,
+                "created_at": created_at.isoformat(),
+            }) + "\n"
+            for row_id, entry_date, entry_type, amount, category_id, description, user_id, created_at in rows
+        ).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back in chunks.
+
+    Parquet footers record absolute offsets, so tell() keeps counting across
+    drained chunks.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _parquet_chunks(batches: AsyncIterable[Sequence[tuple]], minor_units: int) -> AsyncIterator[bytes]:
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("entry_date", pa.timestamp("us")),
+        ("type", pa.string()),
+        ("amount", pa.decimal128(38, minor_units)),
+        ("category_id", pa.int64()),
+        ("description", pa.string()),
+        ("user_id", pa.int64()),
+        ("created_at", pa.timestamp("us")),
+    ])
+    sink = _ChunkSink()
+    # Each batch becomes one row group, so memory stays bounded by the batch size
+    with pq.ParquetWriter(sink, schema) as writer:
+        async for rows in batches:
+            columns = [list(column) for column in zip(*rows)]
+            columns[3] = [from_minor_units(amount, minor_units) for amount in columns[3]]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def export_chunks(batches: AsyncIterable[Sequence[tuple]], fmt: str, minor_units: int) -> AsyncIterator[bytes]:
+    """Encode batches of EXPORT_COLUMNS rows as a stream of csv, ndjson or parquet bytes.
+
+    Amounts arrive in minor units and are written as exact decimals.
+    """
+    encoders = {"csv": _csv_chunks, "ndjson": _ndjson_chunks, "parquet": _parquet_chunks}
+    return encoders[fmt](batches, minor_units)
@@ -0,0 +1,102 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterable, AsyncIterator
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+
+from app.schemas.entries import EntryCreate
+from app.utils.dates import to_local_naive
+from app.utils.money import to_minor_units
+
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+CSV_MEDIA_TYPES = {"text/csv", "application/csv"}
+
+
+def entry_format(content_type: str | None) -> str:
+    """Map a request content type to a supported import format"""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        return "ndjson"
+    if media_type in CSV_MEDIA_TYPES:
+        return "csv"
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Entries must be sent as application/x-ndjson or text/csv",
+    )
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a stream of UTF-8 byte chunks into lines without buffering the whole body"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line.rstrip("\r")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be UTF-8 encoded")
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def _invalid_row(line_number: int, errors: list | str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+        detail={"line": line_number, "errors": errors},
+    )
+
+
+def _validate_row(row: dict, line_number: int, minor_units: int, category_ids: set[int]) -> EntryCreate:
+    try:
+        entry = EntryCreate.model_validate(row)
+    except ValidationError as exc:
+        raise _invalid_row(line_number, exc.errors(include_url=False, include_context=False, include_input=False))
+    try:
+        to_minor_units(entry.amount, minor_units)
+    except ValueError as exc:
+        raise _invalid_row(line_number, str(exc))
+    if entry.category_id is not None and entry.category_id not in category_ids:
+        raise _invalid_row(line_number, f"Category {entry.category_id} does not belong to this account")
+    # Stored dates are naive local time, like those recurring rules write
+    entry.entry_date = to_local_naive(entry.entry_date)
+    return entry
+
+
+async def parse_entries(chunks: AsyncIterable[bytes], fmt: str, minor_units: int, category_ids: set[int]) -> AsyncIterator[EntryCreate]:
+    """Parse an NDJSON or CSV byte stream into validated entries, one line at a time.
+
+    Amounts may have at most minor_units decimals and categories must be
+    among the account's category_ids. Dates with an offset are converted to
+    naive local time. CSV bodies must start with a
+    header row; quoted fields may not span lines.
+    """
+    fieldnames: list[str] | None = None
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+
+        if fmt == "ndjson":
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise _invalid_row(line_number, f"Invalid JSON: {exc.msg}")
+            if not isinstance(row, dict):
+                raise _invalid_row(line_number, "Each line must be a JSON object")
+        else:
+            values = next(csv.reader([line]))
+            if fieldnames is None:
+                fieldnames = [name.strip() for name in values]
+                continue
+            if len(values) != len(fieldnames):
+                raise _invalid_row(line_number, f"Expected {len(fieldnames)} columns, got {len(values)}")
+            # Empty CSV cells stand for missing optional values
+            row = {name: value for name, value in zip(fieldnames, values) if value != ""}
+
+        yield _validate_row(row, line_number, minor_units, category_ids)
@@ -0,0 +1,185 @@
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds, in seconds, of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label for requests that matched no route, so unknown paths share one series
+UNMATCHED_ROUTE = "unmatched"
+
+
+@dataclass
+class RequestStats:
+    """Database work done while serving one request"""
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> RequestStats | None:
+    """Get the stats of the request being served, if any"""
+    return _request_stats.get()
+
+
+@dataclass
+class _RouteMetrics:
+    bucket_counts: list[int]
+    count: int = 0
+    seconds: float = 0.0
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+class MetricsRegistry:
+    """Per-route request latency histograms and database counters"""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._routes: dict[tuple[str, str, str], _RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float, stats: RequestStats) -> None:
+        """Record one finished request"""
+        key = (method, route, str(status_code))
+        with self._lock:
+            metrics = self._routes.get(key)
+            if metrics is None:
+                metrics = self._routes[key] = _RouteMetrics(bucket_counts=[0] * len(self.buckets))
+            index = bisect_left(self.buckets, seconds)
+            if index < len(self.buckets):
+                metrics.bucket_counts[index] += 1
+            metrics.count += 1
+            metrics.seconds += seconds
+            metrics.statements += stats.statements
+            metrics.db_seconds += stats.db_seconds
+
+    def clear(self) -> None:
+        """Drop every recorded series"""
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        """Render all series in the Prometheus text exposition format"""
+        with self._lock:
+            routes = sorted(
+                (key, _RouteMetrics(list(m.bucket_counts), m.count, m.seconds, m.statements, m.db_seconds))
+                for key, m in self._routes.items()
+            )
+
+        lines = [
+            "# HELP http_request_duration_seconds Time spent serving requests.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status_code), metrics in routes:
+            labels = f'method="{method}",route="{_escape(route)}",status="{status_code}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, metrics.bucket_counts):
+                cumulative += bucket_count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {metrics.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {metrics.seconds}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {metrics.count}")
+
+        lines += [
+            "# HELP http_request_db_statements_total SQL statements executed while serving requests.",
+            "# TYPE http_request_db_statements_total counter",
+        ]
+        for (method, route, status_code), metrics in routes:
+            labels = f'method="{method}",route="{_escape(route)}",status="{status_code}"'
+            lines.append(f"http_request_db_statements_total{{{labels}}} {metrics.statements}")
+
+        lines += [
+            "# HELP http_request_db_duration_seconds_total Time spent executing SQL while serving requests.",
+            "# TYPE http_request_db_duration_seconds_total counter",
+        ]
+        for (method, route, status_code), metrics in routes:
+            labels = f'method="{method}",route="{_escape(route)}",status="{status_code}"'
+            lines.append(f"http_request_db_duration_seconds_total{{{labels}}} {metrics.db_seconds}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics_registry = MetricsRegistry()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements and SQL time against the request being served.
+
+    Pass async engines as async_engine.sync_engine; the request context
+    reaches the hooks through SQLAlchemy's greenlet bridge.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        started_at = conn.info["query_started_at"].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += perf_counter() - started_at
+
+    @event.listens_for(engine, "handle_error")
+    def drop_timer(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started_at"):
+            connection.info["query_started_at"].pop()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and database work per route.
+
+    Adds a Server-Timing header with the request's SQL time and statement
+    count and its total time up to the start of the response.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started_at = perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (perf_counter() - started_at) * 1000
+                server_timing = (
+                    f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.statements} statements", '
+                    f"app;dur={elapsed_ms:.2f}"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            self.registry.observe(scope["method"], route_path, status_code, perf_counter() - started_at, stats)
@@ -0,0 +1,33 @@
+from decimal import Decimal
+from typing import Annotated
+
+from pydantic import PlainSerializer
+
+# ISO 4217 exponent used when an account's currency is unknown
+DEFAULT_MINOR_UNITS = 2
+
+# Largest amount accepted, in minor units, leaving aggregate sums of many
+# such amounts room within a signed 64-bit integer
+MAX_MINOR_UNITS = 10**15
+
+# Decimal amount that is rendered as an exact string in JSON, e.g. "12.30"
+Money = Annotated[Decimal, PlainSerializer(lambda value: str(value), return_type=str, when_used="json")]
+
+
+def to_minor_units(amount: Decimal, minor_units: int) -> int:
+    """Convert an amount to an integer count of the currency's minor units.
+
+    Raises ValueError if the amount is more precise than the currency allows
+    or larger than MAX_MINOR_UNITS minor units.
+    """
+    scaled = amount.scaleb(minor_units)
+    if abs(scaled) > MAX_MINOR_UNITS:
+        raise ValueError(f"Amount must be at most {from_minor_units(MAX_MINOR_UNITS, minor_units)}")
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"Amount must have at most {minor_units} decimal places")
+    return int(scaled)
+
+
+def from_minor_units(value: int, minor_units: int) -> Decimal:
+    """Convert an integer count of minor units back to a decimal amount"""
+    return Decimal(value).scaleb(-minor_units)
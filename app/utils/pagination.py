@@ -0,0 +1,41 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last returned row into an opaque cursor"""
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_value(kind: type, value: Any) -> Any:
+    """Convert one cursor value, which must already have its JSON type"""
+    if kind in (date, datetime):
+        return kind.fromisoformat(value)
+    # bool is an int subclass and bool("false") is True, so match the exact type
+    if type(value) is not kind:
+        raise ValueError(f"Expected {kind.__name__}, got {type(value).__name__}")
+    return value
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """Decode a cursor produced by encode_cursor, checking each value has the given type"""
+    invalid_cursor = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid pagination cursor",
+    )
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise invalid_cursor
+        return tuple(_decode_value(kind, value) for kind, value in zip(types, values))
+    except (ValueError, TypeError):
+        raise invalid_cursor
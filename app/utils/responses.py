@@ -0,0 +1,47 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional dependency
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when it is installed.
+
+    Content arrives already converted to JSON types by the response_model, so
+    only the encoder changes, not the output.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def schema_response(schema: Any, content: Any, response: Response | None = None, status_code: int = 200) -> Response:
+    """Validate content against schema and encode it to JSON in one pass through pydantic-core.
+
+    A route returning this skips FastAPI's response_model handling, which
+    validates, converts the result to Python JSON types and encodes that
+    again. Keep response_model on the route for the OpenAPI schema. Content
+    may be ORM objects, rows or dicts. Headers already set on the route's
+    injected response, such as an ETag, are carried over.
+    """
+    adapter = _adapter(schema)
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    fast = Response(content=body, status_code=status_code, media_type="application/json")
+    if response is not None:
+        own = {name for name, _ in fast.raw_headers}
+        fast.raw_headers.extend((name, value) for name, value in response.raw_headers if name not in own)
+    return fast
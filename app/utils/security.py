@@ -1,12 +1,21 @@
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Callable, TypeVar
 
-from sqlmodel import Session, select
+from sqlmodel import delete, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 import jwt
 from fastapi import HTTPException, status
 from argon2 import PasswordHasher, exceptions
 from app.models import RefreshToken
+from app.utils.bloom import BloomFilter
+from app.utils.cache import TTLCache
 
 from fastapi.security import OAuth2PasswordBearer
 
@@ -28,6 +37,56 @@ REFRESH_TOKEN_EXPIRE_DAYS = 7
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='api/auth/login')
 
+T = TypeVar("T")
+
+
+class PasswordHashPool:
+    """Bounded thread pool that keeps Argon2 work off the event loop.
+
+    At most `workers` hashes run at once, capping memory at workers x 64 MB,
+    and at most `queue_depth` more may wait; further calls fail fast with 503.
+    With zero workers hashing runs inline on the calling thread.
+    """
+
+    def __init__(self, workers: int, queue_depth: int):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argon2")
+            if workers > 0
+            else None
+        )
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._executor is None:
+            return func(*args)
+
+        with self._lock:
+            if self._in_flight >= self.workers + self.queue_depth:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent password operations",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.password_hash_workers,
+    queue_depth=settings.password_hash_queue_depth,
+)
+
 def hash_password(password: str) -> str:
     """Hash a password using Argon2"""
     return ph.hash(password)
@@ -46,22 +105,62 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         )
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password hash pool"""
+    return await password_hash_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hash pool"""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict[str, Any]) -> str:
     """Create a new JWT access token"""
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "type": "access"})
+    # jti keeps tokens issued within one second distinct, so revoking one leaves the others
+    to_encode.update({"exp": expire, "type": "access", "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, settings.secret_key, algorithm=ALGORITHM)
 
 
+# Verified access token payloads keyed by token digest, each kept until the
+# token's exp, so a client reusing one token skips the decode on every request
+access_token_cache = TTLCache(
+    max_size=settings.access_token_cache_max_size,
+    ttl=settings.access_token_cache_ttl_seconds,
+)
+
+# Digests of access tokens revoked at logout, kept until the tokens expire
+revoked_access_tokens = TTLCache(
+    max_size=settings.revoked_access_token_max_size,
+    ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+
+def _access_token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
 def verify_token(token: str) -> dict[str, Any]:
-    """Verify JWT access token and return its payload"""
+    """Verify JWT access token and return its payload.
+
+    Payloads are served from access_token_cache after the first full decode.
+    Revoked tokens are never in that cache, so only a miss checks revocation.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    key = _access_token_key(token)
+    payload = access_token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+    if revoked_access_tokens.get(key) is not None:
+        raise credentials_exception
+
     try:
         payload = jwt.decode(
             token,
@@ -73,7 +172,8 @@ def verify_token(token: str) -> dict[str, Any]:
         if payload.get("type") != "access":
             raise credentials_exception
 
-        return payload
+        access_token_cache.set(key, payload, ttl=payload["exp"] - time.time())
+        return dict(payload)
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -84,18 +184,81 @@ def verify_token(token: str) -> dict[str, Any]:
         raise credentials_exception
 
 
-def create_refresh_token(data: dict[str, Any], user_id: int, db: Session) -> str:
-    """Create a new JWT refresh token"""
+def revoke_access_token(token: str) -> None:
+    """Reject an access token in this process until it expires, e.g. at logout"""
+    key = _access_token_key(token)
+    access_token_cache.invalidate(key)
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
+    except jwt.PyJWTError:
+        # Invalid or expired tokens are rejected anyway
+        return
+    revoked_access_tokens.set(key, True, ttl=payload["exp"] - time.time())
+
+
+def token_digest(token: str) -> str:
+    """Get the SHA-256 hex digest under which a refresh token is stored"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _new_revocation_filter(revoked: int = 0) -> BloomFilter:
+    return BloomFilter(
+        capacity=max(settings.revocation_filter_capacity, 2 * revoked),
+        error_rate=settings.revocation_filter_error_rate,
+    )
+
+
+# Digests of revoked, unexpired refresh tokens. A miss proves a token is not
+# revoked, so only possible hits need a database lookup.
+revoked_tokens = _new_revocation_filter()
+
+
+async def load_revoked_tokens(db: AsyncSession) -> int:
+    """Rebuild the revocation filter from the database and return its size.
+
+    Rebuilding also drops expired tokens and picks up revocations made by
+    other processes.
+    """
+    global revoked_tokens
+    statement = select(RefreshToken.token_hash).where(
+        RefreshToken.revoked == True,  # noqa: E712
+        RefreshToken.expires_at > datetime.now(timezone.utc),
+    )
+    digests = (await db.exec(statement)).all()
+    loaded = _new_revocation_filter(len(digests))
+    for digest in digests:
+        loaded.add(bytes.fromhex(digest))
+    revoked_tokens = loaded
+    return len(digests)
+
+
+async def delete_expired_refresh_tokens(db: AsyncSession, batch_size: int = 1000) -> int:
+    """Delete expired refresh tokens in batches of batch_size, committing after each"""
+    deleted = 0
+    while True:
+        expired_ids = select(RefreshToken.id).where(
+            RefreshToken.expires_at <= datetime.now(timezone.utc)
+        ).limit(batch_size)
+        result = await db.exec(delete(RefreshToken).where(RefreshToken.id.in_(expired_ids)))
+        await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+async def create_refresh_token(data: dict[str, Any], user_id: int, db: AsyncSession) -> str:
+    """Create a new JWT refresh token, storing only its digest"""
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    # jti keeps tokens issued to the same user within one second distinct
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     token = jwt.encode(to_encode, settings.refresh_token_secret_key, algorithm=ALGORITHM)
-    db.add(RefreshToken(token=token, user_id=user_id, expires_at=expire))
-    db.commit()
+    db.add(RefreshToken(token_hash=token_digest(token), user_id=user_id, expires_at=expire))
+    await db.commit()
     return token
 
 
-def verify_refresh_token(token: str, db: Session) -> dict[str, Any]:
+async def verify_refresh_token(token: str, db: AsyncSession) -> dict[str, Any]:
     """Verify refresh token and return its payload"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -110,13 +273,8 @@ def verify_refresh_token(token: str, db: Session) -> dict[str, Any]:
             algorithms=[ALGORITHM],
             options={"require": ["exp", "sub", "type"]},
         )
-
-        if payload.get("type") != "refresh":
-            raise credentials_exception
-
-        return payload
     except jwt.ExpiredSignatureError:
-        revoke_refresh_token(token=token, db=db)
+        # Expired tokens are removed by the sweeper
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh token has expired",
@@ -125,9 +283,24 @@ def verify_refresh_token(token: str, db: Session) -> dict[str, Any]:
     except jwt.PyJWTError:
         raise credentials_exception
 
+    if payload.get("type") != "refresh":
+        raise credentials_exception
+
+    digest = token_digest(token)
+    if revoked_tokens.might_contain(bytes.fromhex(digest)):
+        statement = select(RefreshToken.revoked).where(RefreshToken.token_hash == digest)
+        if (await db.exec(statement)).first() is not False:
+            raise credentials_exception
+
+    return payload
+
+
+async def revoke_refresh_token(token: str, db: AsyncSession) -> bool:
+    """Revoke a refresh token, returning False if it was unknown or already revoked.
 
-def revoke_refresh_token(token: str, db: Session) -> None:
-    """Revoke a refresh token by adding it to the database"""
+    The update only matches unrevoked rows, so of two concurrent refreshes
+    with the same token exactly one succeeds.
+    """
     try:
         jwt.decode(
             token,
@@ -135,23 +308,15 @@ def revoke_refresh_token(token: str, db: Session) -> None:
             algorithms=[ALGORITHM],
             options={"verify_exp": False},  # We want to revoke even if expired
         )
-        # Check if token is already revoked
-        statement = select(RefreshToken).where(
-            RefreshToken.token == token
-        )
-        existing_token = db.exec(statement).first()
-
-        if not existing_token:
-            print("ERROR: Refresh token not found")
-            return  # Token already revoked or doesn't exist
-
-        # Mark token as revoked
-        existing_token.revoked = True
-        db.add(existing_token)
-        db.commit()
-        print("Refresh token revoked successfully")
-
     except jwt.PyJWTError:
-        # TODO: LOG that an invalid token was provided
-        print("ERROR: Invalid refresh token")
-        pass
+        return False
+
+    digest = token_digest(token)
+    result = await db.exec(
+        update(RefreshToken)
+        .where(RefreshToken.token_hash == digest, RefreshToken.revoked == False)  # noqa: E712
+        .values(revoked=True)
+    )
+    await db.commit()
+    revoked_tokens.add(bytes.fromhex(digest))
+    return result.rowcount == 1
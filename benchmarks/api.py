@@ -0,0 +1,245 @@
+"""Run scripted load scenarios against the API and report latency percentiles.
+
+Scenarios: login storm, ledger paging, balance reads, bulk import and export.
+Each one fires --requests requests from --concurrency concurrent workers and
+reports throughput and p50/p95/p99 latency; a ledger paging request walks up
+to five pages. Results are printed as JSON, and written to --output if given,
+so runs can be compared across releases.
+
+By default the app runs in-process through an ASGI transport against a fresh
+database from benchmarks.dataset. To measure a real server, seed a database,
+start uvicorn on it and point the suite at both:
+
+    python -m benchmarks.dataset --database bench.sqlite3
+    DATABASE_URL=sqlite:///./bench.sqlite3 uvicorn app.main:app
+    python -m benchmarks.api --base-url http://127.0.0.1:8000 --database bench.sqlite3
+
+Scenarios write to the database (logins store refresh tokens, imports add
+entries), so reseed before comparing runs.
+
+Usage: python -m benchmarks.api [--scenarios ...] [--requests 200] [--concurrency 8] [--entries 200000]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Awaitable, Callable
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import configure_sqlite, get_async_session, get_async_session_factory
+from app.main import app
+from app.utils.metrics import instrument_engine
+from benchmarks import dataset as datasets
+from benchmarks.dataset import Dataset
+
+IMPORT_ROWS = 1000
+PAGE_SIZE = 100
+
+Scenario = Callable[[httpx.AsyncClient, Dataset, dict[str, dict], random.Random], Awaitable[httpx.Response]]
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _login(client: httpx.AsyncClient, data: Dataset, tokens: dict[str, dict], rng: random.Random) -> httpx.Response:
+    email = rng.choice(list(data.owners))
+    return await client.post("/api/auth/login", data={"username": email, "password": data.password})
+
+
+def _account(data: Dataset, tokens: dict[str, dict], rng: random.Random) -> tuple[int, dict]:
+    """Pick one of the logged-in owners' accounts with that owner's auth headers"""
+    email = rng.choice(list(tokens))
+    return rng.choice(data.owners[email]), tokens[email]
+
+
+async def _ledger_paging(client: httpx.AsyncClient, data: Dataset, tokens: dict[str, dict], rng: random.Random) -> httpx.Response:
+    # Follows the cursor a few pages deep, as a client scrolling back would
+    account_id, headers = _account(data, tokens, rng)
+    params = {"limit": PAGE_SIZE}
+    for _ in range(rng.randint(0, 4)):
+        response = await client.get(f"/api/accounts/{account_id}/entries", params=params, headers=headers)
+        cursor = response.json().get("next_cursor") if response.is_success else None
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+    return await client.get(f"/api/accounts/{account_id}/entries", params=params, headers=headers)
+
+
+async def _balance_reads(client: httpx.AsyncClient, data: Dataset, tokens: dict[str, dict], rng: random.Random) -> httpx.Response:
+    account_id, headers = _account(data, tokens, rng)
+    return await client.get(f"/api/accounts/{account_id}/balance", headers=headers)
+
+
+async def _bulk_import(client: httpx.AsyncClient, data: Dataset, tokens: dict[str, dict], rng: random.Random) -> httpx.Response:
+    account_id, headers = _account(data, tokens, rng)
+    body = "".join(
+        json.dumps({
+            "type": "expense" if rng.random() < 0.8 else "income",
+            "amount": f"{rng.randint(1, 250_000) / 100:.2f}",
+            "entry_date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00",
+            "description": "Imported",
+        }) + "\n"
+        for _ in range(IMPORT_ROWS)
+    )
+    return await client.post(
+        f"/api/accounts/{account_id}/entries:bulk",
+        content=body,
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+
+
+async def _export(client: httpx.AsyncClient, data: Dataset, tokens: dict[str, dict], rng: random.Random) -> httpx.Response:
+    account_id, headers = _account(data, tokens, rng)
+    async with client.stream("GET", f"/api/accounts/{account_id}/entries/export", params={"format": "csv"}, headers=headers) as response:
+        await response.aread()
+    return response
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "login_storm": _login,
+    "ledger_paging": _ledger_paging,
+    "balance_reads": _balance_reads,
+    "bulk_import": _bulk_import,
+    "export": _export,
+}
+
+
+async def _run_scenario(client: httpx.AsyncClient, scenario: Scenario, data: Dataset, tokens: dict[str, dict],
+                        requests: int, concurrency: int, seed: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = itertools.count()
+
+    async def worker(rng: random.Random):
+        nonlocal errors
+        while next(remaining) < requests:
+            started = perf_counter()
+            response = await scenario(client, data, tokens, rng)
+            latencies.append(perf_counter() - started)
+            errors += response.status_code >= 400
+
+    started = perf_counter()
+    await asyncio.gather(*(worker(random.Random(seed + index)) for index in range(concurrency)))
+    elapsed = perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+    }
+
+
+async def _authenticate(client: httpx.AsyncClient, data: Dataset, users: int) -> dict[str, dict]:
+    """Log in the first few owners once, so read scenarios do not measure password hashing"""
+    tokens = {}
+    for email in list(data.owners)[:users]:
+        response = await client.post("/api/auth/login", data={"username": email, "password": data.password})
+        response.raise_for_status()
+        tokens[email] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return tokens
+
+
+async def _run(client: httpx.AsyncClient, data: Dataset, args: argparse.Namespace) -> dict:
+    tokens = await _authenticate(client, data, args.users)
+    results = {}
+    for name in args.scenarios:
+        # Exports and imports are far heavier than single reads, so fewer are sent
+        requests = args.requests if name in ("login_storm", "ledger_paging", "balance_reads") else max(1, args.requests // 10)
+        results[name] = await _run_scenario(client, SCENARIOS[name], data, tokens, requests, args.concurrency, args.seed)
+    return results
+
+
+async def _run_in_process(data: Dataset, args: argparse.Namespace) -> dict:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{data.path}", poolclass=NullPool)
+    configure_sqlite(engine.sync_engine)
+    instrument_engine(engine.sync_engine)
+
+    def new_async_session():
+        return AsyncSession(engine, expire_on_commit=False)
+
+    async def get_async_session_override():
+        async with new_async_session() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    app.dependency_overrides[get_async_session_factory] = lambda: new_async_session
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            return await _run(client, data, args)
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+async def _run_remote(data: Dataset, args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=None, limits=limits) as client:
+        return await _run(client, data, args)
+
+
+def _revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="Requests per read scenario; imports and exports send a tenth")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--users", type=int, default=8, help="Owners logged in up front for the non-login scenarios")
+    parser.add_argument("--entries", type=int, default=200_000, help="Entries to seed when no --database is given")
+    parser.add_argument("--database", type=Path, help="Database seeded by benchmarks.dataset")
+    parser.add_argument("--base-url", help="Server to load instead of running the app in-process; needs --database")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if args.base_url and not args.database:
+        parser.error("--base-url needs the --database the server runs on")
+
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with tempfile.TemporaryDirectory() as directory:
+        if args.database:
+            data = datasets.load(args.database)
+        else:
+            data = datasets.seed(Path(directory) / "bench.sqlite3", entries=args.entries, random_seed=args.seed)
+        scenarios = asyncio.run(_run_remote(data, args) if args.base_url else _run_in_process(data, args))
+
+    report = {
+        "started_at": started_at,
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "target": args.base_url or "in-process",
+        "entries": data.entries,
+        "concurrency": args.concurrency,
+        "scenarios": scenarios,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        args.output.write_text(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Generate a synthetic SQLite database for the API benchmarks.
+
+Creates --users users sharing one password, --accounts-per-user accounts owned
+by each, --members-per-account extra members on every account, the default
+categories, and --entries entries spread evenly over all accounts with their
+aggregates. Rows are written with executemany in large batches, so millions
+of entries take seconds rather than minutes.
+
+Usage: python -m benchmarks.dataset --database bench.sqlite3 [--users 100] [--entries 1000000]
+"""
+import argparse
+import asyncio
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, create_engine, insert, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.account import DEFAULT_CATEGORIES
+import app.crud.aggregates as aggregate_crud
+from app.database import configure_sqlite
+from app.models import Account, AccountMembership, Category, Currency, Entry, User
+from app.utils.security import hash_password
+
+PASSWORD = "benchpassword123"
+EMAIL = "bench{index}@example.com"
+SEED_BATCH_SIZE = 50_000
+
+
+@dataclass
+class Dataset:
+    """What the benchmark scenarios need to know about a seeded database"""
+    path: Path
+    password: str
+    owners: dict[str, list[int]]  # Owner email -> ids of the accounts they own
+    entries: int
+
+
+def _seed_entries(session: Session, account_ids: list[int], categories: dict[int, list[tuple[int, str]]], entries: int, rng: random.Random) -> None:
+    start = datetime(2015, 1, 1)
+    now = datetime.now()
+    per_account, extra = divmod(entries, len(account_ids))
+    rows = []
+    for position, account_id in enumerate(account_ids):
+        for index in range(per_account + (position < extra)):
+            category_id, category_type = rng.choice(categories[account_id])
+            rows.append({
+                "account_id": account_id,
+                "category_id": category_id,
+                "type": category_type,
+                "amount": rng.randint(100, 250_000),
+                "description": f"Entry {index}",
+                "entry_date": start + timedelta(minutes=rng.randrange(10 * 365 * 24 * 60)),
+                "created_at": now,
+                "updated_at": now,
+            })
+            if len(rows) >= SEED_BATCH_SIZE:
+                session.exec(insert(Entry), params=rows)
+                session.commit()
+                rows.clear()
+    if rows:
+        session.exec(insert(Entry), params=rows)
+        session.commit()
+
+
+async def _rebuild_aggregates(path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    async with AsyncSession(engine) as session:
+        await aggregate_crud.rebuild_aggregates(session)
+    await engine.dispose()
+
+
+def seed(path: Path, users: int = 100, accounts_per_user: int = 1, members_per_account: int = 2,
+         entries: int = 1_000_000, random_seed: int = 0) -> Dataset:
+    """Create and fill a benchmark database at path, which must not exist yet"""
+    rng = random.Random(random_seed)
+    engine = create_engine(f"sqlite:///{path}")
+    configure_sqlite(engine)
+    SQLModel.metadata.create_all(engine)
+    now = datetime.now()
+    # Hashing is deliberately slow, so every user shares one hash
+    password_hash = hash_password(PASSWORD)
+
+    with Session(engine) as session:
+        session.add(Currency(code="EUR", name="Euro", symbol="€"))
+        session.exec(insert(User), params=[
+            {"email": EMAIL.format(index=index), "password_hash": password_hash, "name": f"Bench {index}",
+             "created_at": now, "updated_at": now, "is_active": True}
+            for index in range(users)
+        ])
+        user_ids = session.exec(select(User.id).order_by(User.id)).all()
+
+        owner_ids = [user_id for user_id in user_ids for _ in range(accounts_per_user)]
+        session.exec(insert(Account), params=[
+            {"name": f"Account {index}", "currency_code": "EUR", "created_at": now, "updated_at": now, "version": 0}
+            for index in range(len(owner_ids))
+        ])
+        account_ids = session.exec(select(Account.id).order_by(Account.id)).all()
+
+        memberships = []
+        for account_id, owner_id in zip(account_ids, owner_ids):
+            memberships.append({"account_id": account_id, "user_id": owner_id, "role": "owner", "is_owner": True, "joined_at": now})
+            others = [user_id for user_id in user_ids if user_id != owner_id]
+            for user_id in rng.sample(others, min(members_per_account, len(others))):
+                memberships.append({"account_id": account_id, "user_id": user_id, "role": "member", "is_owner": False, "joined_at": now})
+        session.exec(insert(AccountMembership), params=memberships)
+        session.exec(insert(Category), params=[
+            {"account_id": account_id, "name": name, "type": category_type, "is_default": True}
+            for account_id in account_ids
+            for name, category_type in DEFAULT_CATEGORIES
+        ])
+        session.commit()
+
+        categories: dict[int, list[tuple[int, str]]] = {}
+        for category_id, account_id, category_type in session.exec(select(Category.id, Category.account_id, Category.type)):
+            categories.setdefault(account_id, []).append((category_id, category_type))
+        _seed_entries(session, account_ids, categories, entries, rng)
+    engine.dispose()
+
+    asyncio.run(_rebuild_aggregates(path))
+    return load(path)
+
+
+def load(path: Path) -> Dataset:
+    """Describe a database created by seed, e.g. one a running server already uses"""
+    engine = create_engine(f"sqlite:///{path}")
+    with Session(engine) as session:
+        owned = session.exec(
+            select(User.email, AccountMembership.account_id)
+            .join(AccountMembership, AccountMembership.user_id == User.id)
+            .where(AccountMembership.is_owner == True, User.email.like(EMAIL.format(index="%")))
+            .order_by(User.id, AccountMembership.account_id)
+        ).all()
+        entries = session.exec(select(Entry.id).order_by(Entry.id.desc()).limit(1)).first() or 0
+    engine.dispose()
+    owners: dict[str, list[int]] = {}
+    for email, account_id in owned:
+        owners.setdefault(email, []).append(account_id)
+    return Dataset(path=path, password=PASSWORD, owners=owners, entries=entries)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database", type=Path, required=True)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--accounts-per-user", type=int, default=1)
+    parser.add_argument("--members-per-account", type=int, default=2)
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.database.exists():
+        parser.error(f"{args.database} already exists")
+
+    started = perf_counter()
+    dataset = seed(args.database, args.users, args.accounts_per_user, args.members_per_account, args.entries, args.seed)
+    print(json.dumps({
+        "database": str(dataset.path),
+        "users": args.users,
+        "accounts": sum(len(accounts) for accounts in dataset.owners.values()),
+        "entries": dataset.entries,
+        "seconds": round(perf_counter() - started, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Measure throughput and memory of streaming ledger exports.
+
+Seeds a throwaway SQLite database with one account of --entries entries, then
+streams it through the export encoders for each format and reports MB/s and
+the peak resident set size seen while streaming. Parquet is skipped when
+pyarrow is not installed.
+
+Usage: python -m benchmarks.export_ledger [--entries 1000000] [--formats csv ndjson parquet]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine, insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.entries import stream_entries
+from app.models import Account, Currency, Entry
+from app.utils.export import export_chunks, pa
+
+SEED_BATCH_SIZE = 50_000
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def _rss_bytes() -> int:
+    # Current, not peak, resident set size so each format is measured on its own
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE
+
+
+def _seed(path: Path, entries: int) -> int:
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Currency(code="EUR", name="Euro", symbol="€"))
+        account = Account(name="Benchmark", currency_code="EUR")
+        session.add(account)
+        session.commit()
+        account_id = account.id
+
+        start = datetime(2000, 1, 1)
+        now = datetime.now()
+        for offset in range(0, entries, SEED_BATCH_SIZE):
+            session.exec(insert(Entry), params=[
+                {
+                    "account_id": account_id,
+                    "type": "expense" if index % 4 else "income",
+                    "amount": 100 + index % 100_000,
+                    "entry_date": start + timedelta(minutes=index),
+                    "description": f"Entry {index}",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for index in range(offset, min(offset + SEED_BATCH_SIZE, entries))
+            ])
+            session.commit()
+    engine.dispose()
+    return account_id
+
+
+async def _export(path: Path, account_id: int, fmt: str) -> dict:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    baseline = peak = _rss_bytes()
+    written = 0
+    started = perf_counter()
+    async with AsyncSession(engine) as session:
+        async for chunk in export_chunks(stream_entries(account_id, session), fmt, 2):
+            written += len(chunk)
+            peak = max(peak, _rss_bytes())
+    elapsed = perf_counter() - started
+    await engine.dispose()
+    return {
+        "megabytes": round(written / 1e6, 1),
+        "seconds": round(elapsed, 2),
+        "mb_per_second": round(written / 1e6 / elapsed, 1),
+        "baseline_rss_mb": round(baseline / 1e6, 1),
+        "peak_rss_mb": round(peak / 1e6, 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--formats", nargs="+", default=["csv", "ndjson", "parquet"], choices=["csv", "ndjson", "parquet"])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.sqlite3"
+        account_id = _seed(path, args.entries)
+        results = {"entries": args.entries}
+        for fmt in args.formats:
+            if fmt == "parquet" and pa is None:
+                results[fmt] = "skipped: pyarrow is not installed"
+                continue
+            results[fmt] = asyncio.run(_export(path, account_id, fmt))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Measure /api/health latency while concurrent logins hash passwords.
+
+The app runs in-process against a throwaway SQLite database. Each mode fires
+--logins concurrent logins while a probe polls /api/health, then reports the
+probe latency percentiles: "inline" hashes on the event loop, "pool" uses the
+bounded Argon2 pool with --workers threads.
+
+Usage: python -m benchmarks.login_storm [--logins 32] [--workers 2]
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import get_async_session
+from app.main import app
+from app.models import User
+import app.utils.security as security
+
+EMAIL = "storm@example.com"
+PASSWORD = "stormpassword123"
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _storm(logins: int, probe_interval: float) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        latencies: list[float] = []
+        done = asyncio.Event()
+
+        async def probe():
+            # Latency is measured from when the probe was due, so time the
+            # event loop spends blocked before serving it is included
+            while not done.is_set():
+                due = perf_counter() + probe_interval
+                await asyncio.sleep(probe_interval)
+                await client.get("/api/health")
+                latencies.append(perf_counter() - due)
+
+        async def login():
+            response = await client.post("/api/auth/login", data={"username": EMAIL, "password": PASSWORD})
+            response.raise_for_status()
+
+        prober = asyncio.create_task(probe())
+        started = perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = perf_counter() - started
+        done.set()
+        await prober
+
+    return {
+        "logins": logins,
+        "login_seconds": round(elapsed, 3),
+        "health_probes": len(latencies),
+        "health_p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "health_p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "health_max_ms": round(max(latencies) * 1000, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--probe-interval", type=float, default=0.005)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.sqlite3"
+        engine = create_engine(f"sqlite:///{path}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(User(email=EMAIL, password_hash=security.hash_password(PASSWORD)))
+            session.commit()
+        engine.dispose()
+
+        # Each mode runs in its own event loop, so connections are not pooled across them
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+
+        async def get_async_session_override():
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                yield session
+
+        app.dependency_overrides[get_async_session] = get_async_session_override
+        results = {}
+        for mode, workers in (("inline", 0), ("pool", args.workers)):
+            security.password_hash_pool = security.PasswordHashPool(workers=workers, queue_depth=args.logins)
+            results[mode] = asyncio.run(_storm(args.logins, args.probe_interval))
+            security.password_hash_pool.shutdown()
+        app.dependency_overrides.clear()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compare the per-item cost of the ways a list response can be serialized.
+
+Builds a page of --items entries, the shape GET /api/accounts/{id}/entries
+returns, and times each path over --rounds rounds:
+
+  response_model   what FastAPI does for a returned object: validate against the
+                   response_model, convert to Python JSON types, encode with json
+  response_orjson  the same, encoded by FastJSONResponse (orjson when installed)
+  schema_response  validate and encode in one pass through pydantic-core
+
+Usage: python -m benchmarks.serialization [--items 500] [--rounds 200]
+"""
+import argparse
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+from time import perf_counter
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.schemas.entries import EntryPage
+from app.utils.responses import FastJSONResponse, orjson, schema_response
+
+
+def _page(items: int) -> dict:
+    start = datetime(2026, 1, 1)
+    return {
+        "items": [
+            {
+                "id": index,
+                "account_id": 1,
+                "category_id": index % 8 or None,
+                "user_id": 1,
+                "type": "expense" if index % 4 else "income",
+                "amount": Decimal(100 + index).scaleb(-2),
+                "description": f"Entry {index}",
+                "entry_date": start + timedelta(hours=index),
+                "created_at": start,
+                "updated_at": start,
+            }
+            for index in range(items)
+        ],
+        "next_cursor": "WyIyMDI2LTAxLTAxVDAwOjAwOjAwIiwxXQ",
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    page = _page(args.items)
+    adapter = TypeAdapter(EntryPage)
+
+    def response_model(response_class):
+        # FastAPI's serialize_response: validate, then dump to JSON-ready Python objects
+        def run():
+            content = adapter.dump_python(adapter.validate_python(page, from_attributes=True), mode="json")
+            return response_class(content).body
+        return run
+
+    paths = {
+        "response_model": response_model(JSONResponse),
+        "response_orjson": response_model(FastJSONResponse),
+        "schema_response": lambda: schema_response(EntryPage, page).body,
+    }
+    bodies = {name: json.loads(run()) for name, run in paths.items()}
+    assert all(body == bodies["response_model"] for body in bodies.values()), "serialization paths disagree"
+
+    results = {"items": args.items, "orjson": orjson is not None}
+    for name, run in paths.items():
+        started = perf_counter()
+        for _ in range(args.rounds):
+            run()
+        elapsed = perf_counter() - started
+        results[name] = {
+            "ms_per_response": round(elapsed / args.rounds * 1000, 3),
+            "us_per_item": round(elapsed / args.rounds / args.items * 1e6, 3),
+        }
+    baseline = results["response_model"]["us_per_item"]
+    for name in paths:
+        results[name]["speedup"] = round(baseline / results[name]["us_per_item"], 2)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Add entry listing indexes
+
+Revision ID: 20261017090000
+Revises: 20241024222400
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017090000"
+down_revision = "20241024222400"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_entry_account_id_entry_date_id": ["account_id", "entry_date", "id"],
+    "ix_entry_account_id_category_id_entry_date": ["account_id", "category_id", "entry_date"],
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "entry" not in inspector.get_table_names():
+        # If entry table doesn't exist, it will be created by SQLModel
+        return
+
+    existing = {index["name"] for index in inspector.get_indexes("entry")}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "entry", columns)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "entry" not in inspector.get_table_names():
+        return
+
+    existing = {index["name"] for index in inspector.get_indexes("entry")}
+    for name in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name="entry")
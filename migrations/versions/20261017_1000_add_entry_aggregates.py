@@ -0,0 +1,66 @@
+"""Add entry aggregates
+
+Revision ID: 20261017100000
+Revises: 20261017090000
+Create Date: 2026-10-17 10:00:00.000000
+
+Existing entries are folded in with a single grouped INSERT ... SELECT,
+so the totals are right as soon as the upgrade finishes.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017100000"
+down_revision = "20261017090000"
+branch_labels = None
+depends_on = None
+
+# Aggregate rows of entries without a category use this category id
+UNCATEGORIZED = 0
+
+
+def _backfill_aggregates(conn) -> None:
+    """Fill entryaggregate from the entry table in one statement, grouped in the database"""
+    if conn.dialect.name == "sqlite":
+        period = "date(entry_date, 'start of month')"
+    else:
+        period = "CAST(date_trunc('month', entry_date) AS DATE)"
+    conn.execute(sa.text(
+        "INSERT INTO entryaggregate (account_id, period, category_id, income_total, expense_total, entry_count) "
+        f"SELECT account_id, {period}, COALESCE(category_id, :uncategorized), "
+        "SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END), "
+        "SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END), COUNT(*) "
+        f"FROM entry GROUP BY account_id, {period}, COALESCE(category_id, :uncategorized)"
+    ), {"uncategorized": UNCATEGORIZED})
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "entryaggregate" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "entryaggregate",
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("account.id"), primary_key=True),
+        sa.Column("period", sa.Date(), primary_key=True),
+        sa.Column("category_id", sa.Integer(), primary_key=True),
+        sa.Column("income_total", sa.Float(), nullable=False),
+        sa.Column("expense_total", sa.Float(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+    )
+
+    if "entry" in inspector.get_table_names():
+        _backfill_aggregates(conn)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "entryaggregate" in inspector.get_table_names():
+        op.drop_table("entryaggregate")
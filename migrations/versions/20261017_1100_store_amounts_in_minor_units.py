@@ -0,0 +1,135 @@
+"""Store entry amounts as integer minor units
+
+Revision ID: 20261017110000
+Revises: 20261017100000
+Create Date: 2026-10-17 11:00:00.000000
+
+Float totals cannot be converted exactly, so aggregates are rebuilt from
+the converted entries with a single grouped INSERT ... SELECT.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017110000"
+down_revision = "20261017100000"
+branch_labels = None
+depends_on = None
+
+DEFAULT_MINOR_UNITS = 2
+
+# Aggregate rows of entries without a category use this category id
+UNCATEGORIZED = 0
+
+# ISO 4217 currencies that do not use two decimal places
+ISO_MINOR_UNITS = {
+    "BIF": 0, "CLP": 0, "DJF": 0, "GNF": 0, "ISK": 0, "JPY": 0, "KMF": 0, "KRW": 0,
+    "PYG": 0, "RWF": 0, "UGX": 0, "VND": 0, "VUV": 0, "XAF": 0, "XOF": 0, "XPF": 0,
+    "BHD": 3, "IQD": 3, "JOD": 3, "KWD": 3, "LYD": 3, "OMR": 3, "TND": 3,
+}
+
+
+def _account_minor_units(conn) -> dict[int, list[int]]:
+    """Group account ids by the exponent of their currency"""
+    rows = conn.execute(sa.text(
+        "SELECT account.id, currency.minor_units FROM account "
+        "LEFT JOIN currency ON currency.code = account.currency_code"
+    )).all()
+    groups: dict[int, list[int]] = {}
+    for account_id, minor_units in rows:
+        groups.setdefault(DEFAULT_MINOR_UNITS if minor_units is None else minor_units, []).append(account_id)
+    return groups
+
+
+def _backfill_aggregates(conn) -> None:
+    """Refill entryaggregate from the entry table in one statement, grouped in the database"""
+    if conn.dialect.name == "sqlite":
+        period = "date(entry_date, 'start of month')"
+    else:
+        period = "CAST(date_trunc('month', entry_date) AS DATE)"
+    conn.execute(sa.text(
+        "INSERT INTO entryaggregate (account_id, period, category_id, income_total, expense_total, entry_count) "
+        f"SELECT account_id, {period}, COALESCE(category_id, :uncategorized), "
+        "SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END), "
+        "SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END), COUNT(*) "
+        f"FROM entry GROUP BY account_id, {period}, COALESCE(category_id, :uncategorized)"
+    ), {"uncategorized": UNCATEGORIZED})
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    if "currency" in tables:
+        columns = [col["name"] for col in inspector.get_columns("currency")]
+        if "minor_units" not in columns:
+            with op.batch_alter_table("currency") as batch_op:
+                batch_op.add_column(
+                    sa.Column("minor_units", sa.Integer(), server_default=sa.text("2"), nullable=False)
+                )
+            for code, minor_units in ISO_MINOR_UNITS.items():
+                conn.execute(
+                    sa.text("UPDATE currency SET minor_units = :minor_units WHERE code = :code"),
+                    {"minor_units": minor_units, "code": code},
+                )
+
+    if "entry" not in tables:
+        # If entry table doesn't exist, it will be created by SQLModel
+        return
+
+    amount = next(col for col in inspector.get_columns("entry") if col["name"] == "amount")
+    if isinstance(amount["type"], sa.Integer):
+        return
+
+    for minor_units, account_ids in _account_minor_units(conn).items():
+        conn.execute(
+            sa.text(
+                "UPDATE entry SET amount = ROUND(amount * :factor) WHERE account_id IN :account_ids"
+            ).bindparams(sa.bindparam("account_ids", expanding=True)),
+            {"factor": 10 ** minor_units, "account_ids": account_ids},
+        )
+
+    with op.batch_alter_table("entry") as batch_op:
+        batch_op.alter_column("amount", type_=sa.BigInteger(), existing_type=sa.Float(), existing_nullable=False)
+
+    if "entryaggregate" in tables:
+        op.execute("DELETE FROM entryaggregate")
+        with op.batch_alter_table("entryaggregate") as batch_op:
+            batch_op.alter_column("income_total", type_=sa.BigInteger(), existing_type=sa.Float(), existing_nullable=False)
+            batch_op.alter_column("expense_total", type_=sa.BigInteger(), existing_type=sa.Float(), existing_nullable=False)
+        _backfill_aggregates(conn)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    if "entry" in tables:
+        with op.batch_alter_table("entry") as batch_op:
+            batch_op.alter_column("amount", type_=sa.Float(), existing_type=sa.BigInteger(), existing_nullable=False)
+
+        for minor_units, account_ids in _account_minor_units(conn).items():
+            conn.execute(
+                sa.text(
+                    "UPDATE entry SET amount = amount / :factor WHERE account_id IN :account_ids"
+                ).bindparams(sa.bindparam("account_ids", expanding=True)),
+                {"factor": float(10 ** minor_units), "account_ids": account_ids},
+            )
+
+    if "entryaggregate" in tables:
+        op.execute("DELETE FROM entryaggregate")
+        with op.batch_alter_table("entryaggregate") as batch_op:
+            batch_op.alter_column("income_total", type_=sa.Float(), existing_type=sa.BigInteger(), existing_nullable=False)
+            batch_op.alter_column("expense_total", type_=sa.Float(), existing_type=sa.BigInteger(), existing_nullable=False)
+        if "entry" in tables:
+            _backfill_aggregates(conn)
+
+    if "currency" in tables:
+        columns = [col["name"] for col in inspector.get_columns("currency")]
+        if "minor_units" in columns:
+            with op.batch_alter_table("currency") as batch_op:
+                batch_op.drop_column("minor_units")
@@ -0,0 +1,97 @@
+"""Store refresh tokens as SHA-256 digests
+
+Revision ID: 20261017120000
+Revises: 20261017110000
+Create Date: 2026-10-17 12:00:00.000000
+
+Rows with the same token are collapsed to one, preferring a revoked row,
+so the digests can be unique.
+
+Downgrading cannot recover token text from digests, so it deletes all
+refresh tokens and users have to log in again.
+
+"""
+
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017120000"
+down_revision = "20261017110000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "refreshtoken" not in inspector.get_table_names():
+        # If refreshtoken table doesn't exist, it will be created by SQLModel
+        return
+
+    columns = [col["name"] for col in inspector.get_columns("refreshtoken")]
+    if "token" not in columns:
+        return
+    indexes = [index["name"] for index in inspector.get_indexes("refreshtoken")]
+
+    # A failed earlier run may have added the column already
+    if "token_hash" not in columns:
+        with op.batch_alter_table("refreshtoken") as batch_op:
+            batch_op.add_column(sa.Column("token_hash", sa.String(), nullable=True))
+
+    # Two logins in the same second used to get the same token, so digests
+    # can repeat; keep one row per digest, a revoked one if there is any
+    kept: dict[str, tuple[bool, int]] = {}
+    duplicates = []
+    rows = conn.execute(sa.text("SELECT id, token, revoked FROM refreshtoken ORDER BY id")).all()
+    for row_id, token, revoked in rows:
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        conn.execute(
+            sa.text("UPDATE refreshtoken SET token_hash = :token_hash WHERE id = :id"),
+            {"token_hash": token_hash, "id": row_id},
+        )
+        current = kept.get(token_hash)
+        if current is None:
+            kept[token_hash] = (bool(revoked), row_id)
+        elif bool(revoked) and not current[0]:
+            duplicates.append(current[1])
+            kept[token_hash] = (True, row_id)
+        else:
+            duplicates.append(row_id)
+    for row_id in duplicates:
+        conn.execute(sa.text("DELETE FROM refreshtoken WHERE id = :id"), {"id": row_id})
+
+    with op.batch_alter_table("refreshtoken") as batch_op:
+        if "ix_refreshtoken_token" in indexes:
+            batch_op.drop_index("ix_refreshtoken_token")
+        batch_op.drop_column("token")
+        batch_op.alter_column("token_hash", existing_type=sa.String(), nullable=False)
+        batch_op.create_index("ix_refreshtoken_token_hash", ["token_hash"], unique=True)
+        if "ix_refreshtoken_expires_at" not in indexes:
+            batch_op.create_index("ix_refreshtoken_expires_at", ["expires_at"])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "refreshtoken" not in inspector.get_table_names():
+        return
+
+    columns = [col["name"] for col in inspector.get_columns("refreshtoken")]
+    if "token" in columns:
+        return
+    indexes = [index["name"] for index in inspector.get_indexes("refreshtoken")]
+
+    op.execute("DELETE FROM refreshtoken")
+    with op.batch_alter_table("refreshtoken") as batch_op:
+        if "ix_refreshtoken_expires_at" in indexes:
+            batch_op.drop_index("ix_refreshtoken_expires_at")
+        if "ix_refreshtoken_token_hash" in indexes:
+            batch_op.drop_index("ix_refreshtoken_token_hash")
+        batch_op.drop_column("token_hash")
+        batch_op.add_column(sa.Column("token", sa.String(), nullable=False))
+        batch_op.create_index("ix_refreshtoken_token", ["token"])
@@ -0,0 +1,61 @@
+"""Add change log for incremental sync
+
+Revision ID: 20261017140000
+Revises: 20261017130000
+Create Date: 2026-10-17 14:00:00.000000
+
+Existing accounts, memberships, categories and entries are logged as
+upserts, so a client's first sync returns everything it can see.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017140000"
+down_revision = "20261017130000"
+branch_labels = None
+depends_on = None
+
+BACKFILL = {
+    "account": "SELECT id, 'account', id, 'upsert', CURRENT_TIMESTAMP FROM account ORDER BY id",
+    "accountmembership": "SELECT account_id, 'membership', user_id, 'upsert', CURRENT_TIMESTAMP FROM accountmembership ORDER BY account_id, user_id",
+    "category": "SELECT account_id, 'category', id, 'upsert', CURRENT_TIMESTAMP FROM category WHERE account_id IS NOT NULL ORDER BY id",
+    "entry": "SELECT account_id, 'entry', id, 'upsert', CURRENT_TIMESTAMP FROM entry ORDER BY id",
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    if "changelog" in tables:
+        return
+
+    op.create_table(
+        "changelog",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("operation", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_changelog_account_id_id", "changelog", ["account_id", "id"])
+    op.create_index("ix_changelog_entity_entity_id", "changelog", ["entity", "entity_id"])
+
+    for table, rows in BACKFILL.items():
+        if table in tables:
+            op.execute(f"INSERT INTO changelog (account_id, entity, entity_id, operation, created_at) {rows}")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "changelog" in inspector.get_table_names():
+        op.drop_index("ix_changelog_entity_entity_id", table_name="changelog")
+        op.drop_index("ix_changelog_account_id_id", table_name="changelog")
+        op.drop_table("changelog")
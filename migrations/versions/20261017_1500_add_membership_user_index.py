@@ -0,0 +1,43 @@
+"""Add membership index by user
+
+Revision ID: 20261017150000
+Revises: 20261017140000
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017150000"
+down_revision = "20261017140000"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_accountmembership_user_id_account_id"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "accountmembership" not in inspector.get_table_names():
+        # If accountmembership table doesn't exist, it will be created by SQLModel
+        return
+
+    existing = {index["name"] for index in inspector.get_indexes("accountmembership")}
+    if INDEX_NAME not in existing:
+        op.create_index(INDEX_NAME, "accountmembership", ["user_id", "account_id"])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "accountmembership" not in inspector.get_table_names():
+        return
+
+    existing = {index["name"] for index in inspector.get_indexes("accountmembership")}
+    if INDEX_NAME in existing:
+        op.drop_index(INDEX_NAME, table_name="accountmembership")
@@ -0,0 +1,83 @@
+"""Add recurring rules
+
+Revision ID: 20261017160000
+Revises: 20261017150000
+Create Date: 2026-10-17 16:00:00.000000
+
+Entries created by a rule point back at it, and a unique index on
+(recurring_rule_id, entry_date) keeps each occurrence from being
+inserted twice.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017160000"
+down_revision = "20261017150000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    if "recurringrule" not in tables:
+        op.create_table(
+            "recurringrule",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("account_id", sa.Integer(), sa.ForeignKey("account.id"), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=True),
+            sa.Column("category_id", sa.Integer(), sa.ForeignKey("category.id"), nullable=True),
+            sa.Column("type", sa.String(), nullable=False),
+            sa.Column("amount", sa.BigInteger(), nullable=False),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column("frequency", sa.String(), nullable=False),
+            sa.Column("interval", sa.Integer(), nullable=False),
+            sa.Column("starts_at", sa.DateTime(), nullable=False),
+            sa.Column("until", sa.DateTime(), nullable=True),
+            sa.Column("count", sa.Integer(), nullable=True),
+            sa.Column("occurrences", sa.Integer(), nullable=False),
+            sa.Column("next_run_at", sa.DateTime(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_recurringrule_account_id", "recurringrule", ["account_id"])
+        op.create_index("ix_recurringrule_next_run_at", "recurringrule", ["next_run_at"])
+
+    if "entry" not in tables:
+        # If entry table doesn't exist, it will be created by SQLModel
+        return
+
+    columns = [col["name"] for col in inspector.get_columns("entry")]
+    if "recurring_rule_id" not in columns:
+        with op.batch_alter_table("entry") as batch_op:
+            batch_op.add_column(sa.Column("recurring_rule_id", sa.Integer(), nullable=True))
+            batch_op.create_foreign_key("fk_entry_recurring_rule_id", "recurringrule", ["recurring_rule_id"], ["id"])
+
+    indexes = [index["name"] for index in inspector.get_indexes("entry")]
+    if "ix_entry_recurring_rule_id_entry_date" not in indexes:
+        op.create_index("ix_entry_recurring_rule_id_entry_date", "entry", ["recurring_rule_id", "entry_date"], unique=True)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    if "entry" in tables:
+        indexes = [index["name"] for index in inspector.get_indexes("entry")]
+        if "ix_entry_recurring_rule_id_entry_date" in indexes:
+            op.drop_index("ix_entry_recurring_rule_id_entry_date", table_name="entry")
+        columns = [col["name"] for col in inspector.get_columns("entry")]
+        if "recurring_rule_id" in columns:
+            with op.batch_alter_table("entry") as batch_op:
+                batch_op.drop_column("recurring_rule_id")
+
+    if "recurringrule" in tables:
+        op.drop_index("ix_recurringrule_next_run_at", table_name="recurringrule")
+        op.drop_index("ix_recurringrule_account_id", table_name="recurringrule")
+        op.drop_table("recurringrule")
@@ -0,0 +1,42 @@
+"""Add monthly category budgets
+
+Revision ID: 20261017170000
+Revises: 20261017160000
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017170000"
+down_revision = "20261017160000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "budget" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "budget",
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("account.id"), primary_key=True),
+        sa.Column("period", sa.Date(), primary_key=True),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("category.id"), primary_key=True),
+        sa.Column("amount", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "budget" in inspector.get_table_names():
+        op.drop_table("budget")
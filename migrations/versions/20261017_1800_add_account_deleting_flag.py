@@ -0,0 +1,45 @@
+"""Add deleting flag to accounts
+
+Revision ID: 20261017180000
+Revises: 20261017170000
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017180000"
+down_revision = "20261017170000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "account" not in inspector.get_table_names():
+        # If account table doesn't exist, it will be created by SQLModel
+        return
+
+    columns = [col["name"] for col in inspector.get_columns("account")]
+    if "deleting" not in columns:
+        with op.batch_alter_table("account") as batch_op:
+            batch_op.add_column(
+                sa.Column("deleting", sa.Boolean(), server_default=sa.text("0"), nullable=False)
+            )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "account" not in inspector.get_table_names():
+        return
+
+    columns = [col["name"] for col in inspector.get_columns("account")]
+    if "deleting" in columns:
+        with op.batch_alter_table("account") as batch_op:
+            batch_op.drop_column("deleting")
@@ -1,32 +1,185 @@
+import asyncio
+import json
+import re
+from collections import Counter
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import Session, SQLModel, create_engine
-from sqlmodel.pool import StaticPool
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.main import app
-from app.database import get_session
+from app.crud.account import membership_cache
+from app.crud.users import user_cache
+from app.tasks import account_deletions
+from app.database import configure_sqlite, get_async_session, get_async_session_factory, get_session
+from app.utils.metrics import instrument_engine, metrics_registry
+from app.utils.security import access_token_cache, revoked_access_tokens
+
+
+@pytest.fixture(name="database_path")
+def database_path_fixture(tmp_path):
+    """Create a throwaway SQLite database shared by the sync and async engines"""
+    path = tmp_path / "test.sqlite3"
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    engine.dispose()
+    return path
 
 
 @pytest.fixture(name="session")
-def session_fixture():
-    """Create a test database session"""
+def session_fixture(database_path):
+    """Create a sync test database session for assertions"""
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{database_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
-    SQLModel.metadata.create_all(engine)
+    configure_sqlite(engine)
     with Session(engine) as session:
         yield session
+    engine.dispose()
+
+
+@pytest.fixture(name="async_engine")
+def async_engine_fixture(database_path):
+    """Create the async engine used by the app under test.
+
+    NullPool keeps connections from outliving the event loop of each request.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+    configure_sqlite(engine.sync_engine)
+    instrument_engine(engine.sync_engine)
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture(name="run_in_session")
+def run_in_session_fixture(async_engine):
+    """Run a coroutine function with a fresh async session and return its result"""
+    def run(func):
+        async def runner():
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                return await func(session)
+        return asyncio.run(runner())
+    return run
+
+
+def _query_budget_report(budget: int, statements: list[str]) -> str:
+    """Describe a blown query budget, listing repeated statements first"""
+    normalized = [re.sub(r"\s+", " ", statement).strip() for statement in statements]
+    lines = [f"Expected at most {budget} SQL statements, ran {len(statements)}"]
+    repeated = [(statement, count) for statement, count in Counter(normalized).most_common() if count > 1]
+    if repeated:
+        lines.append("Repeated statements:")
+        lines += [f"  {count}x {statement}" for statement, count in repeated]
+    lines.append("All statements:")
+    lines += [f"  {index}. {statement}" for index, statement in enumerate(normalized, start=1)]
+    return "\n".join(lines)
+
+
+@pytest.fixture(name="query_budget")
+def query_budget_fixture(async_engine):
+    """Fail the test when the wrapped API calls run more SQL statements than budgeted.
+
+    Usage: with query_budget(3): client.get(...). An executemany counts as one
+    statement, matching its single round-trip.
+    """
+    @contextmanager
+    def budget(limit: int):
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+        if len(statements) > limit:
+            pytest.fail(_query_budget_report(limit, statements), pytrace=False)
+
+    return budget
 
 
 @pytest.fixture(name="client")
-def client_fixture(session: Session):
-    """Create a test client with dependency override"""
+def client_fixture(session: Session, async_engine):
+    """Create a test client with dependency overrides"""
     def get_session_override():
         return session
 
+    def new_async_session():
+        return AsyncSession(async_engine, expire_on_commit=False)
+
+    async def get_async_session_override():
+        async with new_async_session() as async_session:
+            yield async_session
+
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    app.dependency_overrides[get_async_session_factory] = lambda: new_async_session
+    user_cache.clear()
+    membership_cache.clear()
+    access_token_cache.clear()
+    revoked_access_tokens.clear()
+    metrics_registry.clear()
+    account_deletions.clear()
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="user")
+def user_fixture(client: TestClient):
+    """Register a user and return its API representation"""
+    response = client.post("/api/auth/register", json={
+        "email": "owner@example.com",
+        "name": "Owner",
+        "password": "ownerpassword123"
+    })
+    return response.json()
+
+
+@pytest.fixture(name="auth_headers")
+def auth_headers_fixture(client: TestClient, user: dict):
+    """Log the registered user in and return bearer auth headers"""
+    response = client.post("/api/auth/login", data={
+        "username": user["email"],
+        "password": "ownerpassword123"
+    })
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(name="account")
+def account_fixture(client: TestClient, user: dict, auth_headers: dict):
+    """Create an account owned by the registered user"""
+    response = client.post("/api/accounts", json={
+        "name": "Household",
+        "currency_code": "EUR",
+        "owner_id": user["id"]
+    }, headers=auth_headers)
+    return response.json()
+
+
+@pytest.fixture(name="import_entries")
+def import_entries_fixture(client: TestClient, auth_headers: dict):
+    """Bulk import entries as the registered user and check they were created.
+
+    Usage: import_entries(account_id, rows) posts row dicts as NDJSON;
+    a string is posted as is, with the given content type.
+    """
+    def import_entries(account_id: int, rows: list[dict] | str, content_type: str = "application/x-ndjson"):
+        content = rows if isinstance(rows, str) else "\n".join(json.dumps(row) for row in rows)
+        response = client.post(
+            f"/api/accounts/{account_id}/entries:bulk",
+            content=content,
+            headers={**auth_headers, "Content-Type": content_type},
+        )
+        assert response.status_code == 201
+        return response
+
+    return import_entries
@@ -0,0 +1,241 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, select
+
+import app.crud.account as account_crud
+from app.models import Account, AccountMembership, Budget, Category, ChangeLog, Entry, EntryAggregate, RecurringRule
+from app.tasks import AccountDeletionJob, account_deletions
+from app.utils.pagination import encode_cursor
+
+
+def _expense_rows(count: int) -> list[dict]:
+    return [
+        {"type": "expense", "amount": "1.00", "entry_date": f"2024-01-{day % 28 + 1:02d}T09:00:00"}
+        for day in range(count)
+    ]
+
+
+def _count(session: Session, model, account_id: int) -> int:
+    return session.exec(select(func.count()).select_from(model).where(model.account_id == account_id)).one()
+
+
+def test_create_account_seeds_owner_and_categories(client: TestClient, session: Session, account: dict, user: dict):
+    """Test a new account starts with its owner membership and default categories"""
+    membership = session.exec(select(AccountMembership).where(AccountMembership.account_id == account["id"])).one()
+    categories = session.exec(select(Category).where(Category.account_id == account["id"])).all()
+
+    assert (membership.user_id, membership.role, membership.is_owner) == (user["id"], "owner", True)
+    assert len(categories) == len(account_crud.DEFAULT_CATEGORIES)
+    assert all(category.is_default for category in categories)
+
+
+def test_create_accounts_batch(client: TestClient, session: Session, user: dict, auth_headers: dict):
+    """Test the batch endpoint creates every account with its owner, in request order"""
+    names = [f"Tenant {index}" for index in range(25)]
+    response = client.post("/api/accounts:batch", json={
+        "accounts": [{"name": name, "currency_code": "EUR", "owner_id": user["id"]} for name in names]
+    }, headers=auth_headers)
+
+    assert response.status_code == 201
+    created = response.json()
+    assert [account["name"] for account in created] == names
+    for account in created:
+        assert session.get(Account, account["id"]).name == account["name"]
+        assert _count(session, AccountMembership, account["id"]) == 1
+        assert _count(session, Category, account["id"]) == len(account_crud.DEFAULT_CATEGORIES)
+
+
+def test_create_accounts_for_others_is_forbidden(client: TestClient, user: dict, auth_headers: dict):
+    """Test accounts can only be created with the current user as owner"""
+    response = client.post("/api/accounts:batch", json={"accounts": [
+        {"name": "Mine", "currency_code": "EUR", "owner_id": user["id"]},
+        {"name": "Theirs", "currency_code": "EUR", "owner_id": user["id"] + 1},
+    ]}, headers=auth_headers)
+
+    assert response.status_code == 403
+    assert client.get("/api/accounts", headers=auth_headers).json()["items"] == []
+    response = client.post("/api/accounts", json={"name": "Theirs", "currency_code": "EUR", "owner_id": user["id"] + 1}, headers=auth_headers)
+    assert response.status_code == 403
+
+
+def test_create_accounts_batch_rejects_empty(client: TestClient, auth_headers: dict):
+    """Test an empty batch is a validation error"""
+    response = client.post("/api/accounts:batch", json={"accounts": []}, headers=auth_headers)
+
+    assert response.status_code == 422
+
+
+def test_delete_account_runs_in_background(client: TestClient, session: Session, account: dict, auth_headers: dict, import_entries):
+    """Test deleting an account removes its entries, aggregates, budgets, recurring rules and memberships"""
+    import_entries(account["id"], _expense_rows(12))
+    client.put(f"/api/accounts/{account['id']}/budgets/2", json={"period": "2026-03-01", "amount": "100.00"}, headers=auth_headers)
+    client.post(f"/api/accounts/{account['id']}/recurring-rules", json={
+        "type": "expense", "amount": "9.99", "frequency": "monthly", "starts_at": "2030-01-01T00:00:00",
+    }, headers=auth_headers)
+
+    response = client.delete(f"/api/accounts/{account['id']}", headers=auth_headers)
+    assert response.status_code == 202
+    assert response.json()["status"] == "pending"
+
+    response = client.get(f"/api/accounts/{account['id']}/deletion", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert response.json()["deleted_entries"] == 12
+
+    assert session.get(Account, account["id"]) is None
+    for model in (Entry, EntryAggregate, Budget, RecurringRule, AccountMembership):
+        assert _count(session, model, account["id"]) == 0
+
+
+def test_delete_account_in_batches(session: Session, run_in_session, account: dict, import_entries):
+    """Test entries are deleted in committed batches with progress reported after each"""
+    import_entries(account["id"], _expense_rows(7))
+    progress = []
+
+    deleted = run_in_session(
+        lambda s: account_crud.delete_account(account["id"], s, batch_size=3, on_progress=progress.append)
+    )
+
+    assert deleted == 7
+    assert progress == [3, 6, 7]
+    assert session.get(Account, account["id"]) is None
+
+
+def test_delete_account_purges_change_log(session: Session, run_in_session, account: dict, user: dict, import_entries):
+    """Test only the deletion tombstones of an account stay in the change log"""
+    import_entries(account["id"], _expense_rows(7))
+
+    run_in_session(lambda s: account_crud.delete_account(account["id"], s, batch_size=3))
+
+    query = select(ChangeLog.entity, ChangeLog.entity_id, ChangeLog.operation).where(ChangeLog.account_id == account["id"])
+    assert sorted(session.exec(query).all()) == [("account", account["id"], "delete"), ("membership", user["id"], "delete")]
+
+
+def test_interrupted_delete_leaves_account_unusable(client: TestClient, session: Session, run_in_session, account: dict, auth_headers: dict, import_entries):
+    """Test an account whose deletion stopped partway is hidden and can be deleted again"""
+    import_entries(account["id"], _expense_rows(7))
+
+    def fail(deleted: int):
+        raise RuntimeError("worker restarted")
+
+    with pytest.raises(RuntimeError):
+        run_in_session(lambda s: account_crud.delete_account(account["id"], s, batch_size=3, on_progress=fail))
+
+    assert _count(session, Entry, account["id"]) == 4
+    assert _count(session, EntryAggregate, account["id"]) == 0
+    assert client.get(f"/api/accounts/{account['id']}/balance", headers=auth_headers).status_code == 409
+    assert client.get("/api/accounts", headers=auth_headers).json()["items"] == []
+
+    assert run_in_session(lambda s: account_crud.delete_account(account["id"], s, batch_size=3)) == 4
+    session.expire_all()
+    assert session.get(Account, account["id"]) is None
+
+
+def test_delete_account_status_requires_owner(client: TestClient, user: dict, account: dict):
+    """Test a non-owner cannot read an account's running deletion through DELETE"""
+    account_deletions[account["id"]] = AccountDeletionJob(account_id=account["id"], requested_by=user["id"], status="running")
+    client.post("/api/auth/register", json={"email": "other@example.com", "name": "Other", "password": "otherpassword123"})
+    token = client.post("/api/auth/login", data={"username": "other@example.com", "password": "otherpassword123"}).json()
+
+    response = client.delete(f"/api/accounts/{account['id']}", headers={"Authorization": f"Bearer {token['access_token']}"})
+
+    assert response.status_code == 403
+
+
+def test_finished_deletions_are_pruned(client: TestClient, user: dict, auth_headers: dict):
+    """Test deletions that finished longer ago than the retention are forgotten"""
+    finished_at = datetime.now(timezone.utc) - timedelta(days=1)
+    account_deletions[9999] = AccountDeletionJob(account_id=9999, requested_by=user["id"], status="completed", finished_at=finished_at)
+
+    response = client.get("/api/accounts/9999/deletion", headers=auth_headers)
+
+    assert response.status_code == 404
+    assert 9999 not in account_deletions
+
+
+def test_delete_missing_account(client: TestClient, auth_headers: dict):
+    """Test deleting an unknown account returns 404"""
+    response = client.delete("/api/accounts/9999", headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+def test_get_account_requires_membership(client: TestClient, account: dict, auth_headers: dict):
+    """Test only members can read an account"""
+    client.post("/api/auth/register", json={"email": "other@example.com", "name": "Other", "password": "otherpassword123"})
+    token = client.post("/api/auth/login", data={"username": "other@example.com", "password": "otherpassword123"}).json()
+    other_headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+    assert client.get(f"/api/accounts/{account['id']}", headers=auth_headers).status_code == 200
+    assert client.get(f"/api/accounts/{account['id']}", headers=other_headers).status_code == 403
+
+
+def test_list_accounts_is_scoped_and_paginated(client: TestClient, user: dict, auth_headers: dict):
+    """Test the account list only holds the caller's accounts and pages through them newest first"""
+    client.post("/api/auth/register", json={"email": "other@example.com", "name": "Other", "password": "otherpassword123"})
+    other = client.post("/api/auth/login", data={"username": "other@example.com", "password": "otherpassword123"}).json()
+    other_headers = {"Authorization": f"Bearer {other['access_token']}"}
+    other_id = client.get("/api/users", headers=other_headers).json()["items"][0]["id"]
+    client.post("/api/accounts:batch", json={"accounts": [
+        {"name": f"Mine {index}", "currency_code": "EUR", "owner_id": user["id"]} for index in range(5)
+    ]}, headers=auth_headers)
+    client.post("/api/accounts", json={"name": "Theirs", "currency_code": "EUR", "owner_id": other_id}, headers=other_headers)
+
+    names, cursor = [], None
+    while True:
+        page = client.get("/api/accounts", params={"limit": 2, **({"cursor": cursor} if cursor else {})}, headers=auth_headers).json()
+        names += [account["name"] for account in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(names) == [f"Mine {index}" for index in range(5)]
+    assert [account["name"] for account in client.get("/api/accounts", headers=other_headers).json()["items"]] == ["Theirs"]
+
+
+def test_membership_changes_invalidate_cached_permissions(client: TestClient, run_in_session, account: dict):
+    """Test adding and removing a member takes effect at once despite cached memberships"""
+    member = client.post("/api/auth/register", json={"email": "member@example.com", "password": "memberpassword123"}).json()
+    token = client.post("/api/auth/login", data={"username": "member@example.com", "password": "memberpassword123"}).json()
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+    balance_url = f"/api/accounts/{account['id']}/balance"
+    assert client.get(balance_url, headers=headers).status_code == 403
+
+    run_in_session(lambda session: account_crud.add_user_to_account(account["id"], member["id"], session=session))
+    assert client.get(balance_url, headers=headers).status_code == 200
+
+    run_in_session(lambda session: account_crud.remove_user_from_account(account["id"], member["id"], session))
+    assert client.get(balance_url, headers=headers).status_code == 403
+
+
+def test_list_account_members(client: TestClient, run_in_session, user: dict, account: dict, auth_headers: dict):
+    """Test members are listed owner first and paged by joining date without private fields"""
+    members = [
+        client.post("/api/auth/register", json={"email": f"member{index}@example.com", "password": "memberpassword123"}).json()
+        for index in range(3)
+    ]
+    for member in members:
+        run_in_session(lambda session: account_crud.add_user_to_account(account["id"], member["id"], session=session))
+
+    url = f"/api/accounts/{account['id']}/members"
+    first = client.get(url, params={"limit": 2}, headers=auth_headers).json()
+    second = client.get(url, params={"limit": 2, "cursor": first["next_cursor"]}, headers=auth_headers).json()
+
+    listed = first["items"] + second["items"]
+    assert [member["user_id"] for member in listed] == [user["id"]] + [member["id"] for member in members]
+    assert [member["role"] for member in listed] == ["owner", "member", "member", "member"]
+    assert set(listed[0]) == {"user_id", "email", "name", "role", "is_owner", "joined_at"}
+    assert second["next_cursor"] is None
+
+
+def test_list_account_members_rejects_invalid_cursor(client: TestClient, account: dict, auth_headers: dict):
+    """Test a members cursor whose owner flag is not a JSON boolean is a bad request"""
+    url = f"/api/accounts/{account['id']}/members"
+    for owner_flag in ("false", 0):
+        cursor = encode_cursor(owner_flag, datetime(2026, 1, 1), 1)
+
+        response = client.get(url, params={"cursor": cursor}, headers=auth_headers)
+
+        assert response.status_code == 400
@@ -1,7 +1,10 @@
+from datetime import datetime, timedelta, timezone
+
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
-from app.models import User
+from app.models import RefreshToken, User
+from app.utils.security import delete_expired_refresh_tokens, token_digest
 
 
 def test_create_user_success(client: TestClient):
@@ -125,3 +128,89 @@ def test_user_password_is_hashed(client: TestClient, session: Session):
     assert db_user.password_hash != user_data["password"]
     print(db_user.password_hash)
     assert db_user.password_hash.startswith("$argon2id$")
+
+
+def _login(client: TestClient, user: dict) -> dict:
+    response = client.post("/api/auth/login", data={
+        "username": user["email"],
+        "password": "ownerpassword123"
+    })
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_refresh_token_is_stored_as_digest(client: TestClient, session: Session, user: dict):
+    """Test only the SHA-256 digest of a refresh token reaches the database"""
+    refresh_token = _login(client, user)["refresh_token"]
+
+    stored = session.exec(select(RefreshToken)).one()
+
+    assert stored.token_hash == token_digest(refresh_token)
+    assert refresh_token not in stored.token_hash
+
+
+def test_refresh_rotates_token(client: TestClient, user: dict):
+    """Test a refresh token can be exchanged once and its successor works"""
+    refresh_token = _login(client, user)["refresh_token"]
+
+    response = client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200
+    rotated = response.json()["refresh_token"]
+    assert rotated != refresh_token
+
+    replay = client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+    assert replay.status_code == 400
+
+    response = client.post("/api/auth/refresh", json={"refresh_token": rotated})
+    assert response.status_code == 200
+
+
+def test_logout_revokes_refresh_token(client: TestClient, user: dict):
+    """Test a refresh token cannot be used after logging out with it"""
+    tokens = _login(client, user)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = client.post("/api/auth/logout", params={"refresh_token": tokens["refresh_token"]}, headers=headers)
+    assert response.status_code == 204
+
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 400
+
+
+def test_expired_refresh_tokens_are_swept(client: TestClient, session: Session, run_in_session, user: dict):
+    """Test the sweeper deletes expired tokens in batches and keeps live ones"""
+    _login(client, user)
+    expired_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    session.add_all([
+        RefreshToken(token_hash=f"{index:064x}", user_id=user["id"], expires_at=expired_at)
+        for index in range(5)
+    ])
+    session.commit()
+
+    deleted = run_in_session(lambda s: delete_expired_refresh_tokens(s, batch_size=2))
+
+    assert deleted == 5
+    assert len(session.exec(select(RefreshToken)).all()) == 1
+
+
+def test_access_tokens_are_verified_once(client: TestClient, user: dict):
+    """Test repeated requests with one access token reuse its decoded payload"""
+    headers = {"Authorization": f"Bearer {_login(client, user)['access_token']}"}
+
+    for _ in range(3):
+        assert client.get("/api/users", headers=headers).status_code == 200
+
+    stats = client.get("/api/health/caches").json()["access_token_cache"]
+    assert (stats["misses"], stats["hits"]) == (1, 2)
+
+
+def test_logout_revokes_access_token(client: TestClient, user: dict):
+    """Test the access token used to log out is rejected afterwards, even though it was cached"""
+    tokens = _login(client, user)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/api/users", headers=headers).status_code == 200
+
+    response = client.post("/api/auth/logout", params={"refresh_token": tokens["refresh_token"]}, headers=headers)
+    assert response.status_code == 204
+
+    assert client.get("/api/users", headers=headers).status_code == 401
@@ -0,0 +1,65 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, delete
+
+import app.crud.aggregates as aggregate_crud
+from app.models import EntryAggregate
+
+ROWS = [
+    {"type": "income", "amount": 2000, "entry_date": "2024-01-01T09:00:00", "category_id": 1},
+    {"type": "expense", "amount": 120.5, "entry_date": "2024-01-10T09:00:00", "category_id": 2},
+    {"type": "expense", "amount": 79.5, "entry_date": "2024-01-20T09:00:00", "category_id": 2},
+    {"type": "income", "amount": 2000, "entry_date": "2024-02-01T09:00:00", "category_id": 1},
+    {"type": "expense", "amount": 50, "entry_date": "2024-02-14T09:00:00"},
+    {"type": "expense", "amount": 300, "entry_date": "2024-03-05T09:00:00", "category_id": 2},
+]
+
+
+def test_balance_is_maintained_on_import(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test imported entries are folded into the account balance"""
+    import_entries(account["id"], ROWS)
+
+    response = client.get(f"/api/accounts/{account['id']}/balance", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "account_id": account["id"],
+        "income": "4000.00",
+        "expense": "550.00",
+        "balance": "3450.00",
+        "entry_count": 6,
+    }
+
+
+def test_summary_by_month_and_category(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test summaries are grouped per month and category within the requested range"""
+    import_entries(account["id"], ROWS)
+
+    response = client.get(
+        f"/api/accounts/{account['id']}/summary",
+        params={"from": "2024-01-15", "to": "2024-02-01"},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [(p["period"], p["income"], p["expense"], p["entry_count"]) for p in data["periods"]] == [
+        ("2024-01-01", "2000.00", "200.00", 3),
+        ("2024-02-01", "2000.00", "50.00", 2),
+    ]
+    categories = {c["category_id"]: c for c in data["categories"]}
+    assert categories[None]["expense"] == "50.00"
+    assert categories[1]["income"] == "4000.00"
+    assert categories[2]["expense"] == "200.00"
+
+
+def test_rebuild_aggregates_matches_incremental(session: Session, run_in_session, account: dict, import_entries):
+    """Test rebuilding from entries restores the incrementally maintained totals"""
+    import_entries(account["id"], ROWS)
+    expected = run_in_session(lambda s: aggregate_crud.get_summary(account["id"], 2, s))
+
+    session.exec(delete(EntryAggregate))
+    session.commit()
+    rebuilt = run_in_session(lambda s: aggregate_crud.rebuild_aggregates(s, account_id=account["id"]))
+
+    assert rebuilt == 5
+    assert run_in_session(lambda s: aggregate_crud.get_summary(account["id"], 2, s)) == expected
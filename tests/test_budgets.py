@@ -0,0 +1,86 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+import app.crud.recurring as recurring_crud
+
+ROWS = [
+    {"type": "expense", "amount": "120.50", "entry_date": "2026-03-02T09:00:00", "category_id": 2},
+    {"type": "expense", "amount": "79.50", "entry_date": "2026-03-20T09:00:00", "category_id": 2},
+    {"type": "expense", "amount": "30.00", "entry_date": "2026-04-01T09:00:00", "category_id": 2},
+    {"type": "expense", "amount": "15.00", "entry_date": "2026-03-05T09:00:00", "category_id": 3},
+]
+
+
+def _set_budget(client: TestClient, account_id: int, category_id: int, headers: dict, period: str, amount: str):
+    return client.put(f"/api/accounts/{account_id}/budgets/{category_id}", json={"period": period, "amount": amount}, headers=headers)
+
+
+def test_budgets_track_spending(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test a month's budgets report what was spent in their category that month"""
+    _set_budget(client, account["id"], 2, auth_headers, "2026-03-01", "250.00")
+    _set_budget(client, account["id"], 3, auth_headers, "2026-03-15", "10.00")
+    import_entries(account["id"], ROWS)
+
+    response = client.get(f"/api/accounts/{account['id']}/budgets", params={"period": "2026-03-31"}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "account_id": account["id"],
+        "period": "2026-03-01",
+        "budgets": [
+            {"category_id": 2, "amount": "250.00", "spent": "200.00", "remaining": "50.00"},
+            {"category_id": 3, "amount": "10.00", "spent": "15.00", "remaining": "-5.00"},
+        ],
+    }
+
+
+def test_budget_counts_entries_added_later(client: TestClient, run_in_session, account: dict, auth_headers: dict, import_entries):
+    """Test spending from imports and recurring rules made after the budget is counted"""
+    _set_budget(client, account["id"], 2, auth_headers, "2026-04-01", "100.00")
+    import_entries(account["id"], ROWS)
+    client.post(f"/api/accounts/{account['id']}/recurring-rules", json={
+        "type": "expense", "amount": "20.00", "category_id": 2, "frequency": "weekly", "starts_at": "2026-04-06T09:00:00",
+    }, headers=auth_headers)
+    run_in_session(lambda s: recurring_crud.materialize_due_rules(s, now=datetime(2026, 4, 21)))
+
+    budgets = client.get(f"/api/accounts/{account['id']}/budgets", params={"period": "2026-04-01"}, headers=auth_headers).json()["budgets"]
+
+    assert budgets == [{"category_id": 2, "amount": "100.00", "spent": "90.00", "remaining": "10.00"}]
+
+
+def test_set_budget_replaces_amount(client: TestClient, account: dict, auth_headers: dict):
+    """Test setting a budget again for the same month replaces it"""
+    _set_budget(client, account["id"], 2, auth_headers, "2026-03-01", "250.00")
+    response = _set_budget(client, account["id"], 2, auth_headers, "2026-03-10", "300.00")
+
+    assert response.status_code == 200
+    assert response.json() == {"category_id": 2, "amount": "300.00", "spent": "0.00", "remaining": "300.00"}
+    budgets = client.get(f"/api/accounts/{account['id']}/budgets", params={"period": "2026-03-01"}, headers=auth_headers).json()["budgets"]
+    assert len(budgets) == 1
+
+
+def test_budget_needs_a_category_of_the_account(client: TestClient, account: dict, auth_headers: dict):
+    """Test a budget cannot be set on an unknown category"""
+    response = _set_budget(client, account["id"], 9999, auth_headers, "2026-03-01", "250.00")
+
+    assert response.status_code == 404
+
+
+def test_budget_rejects_invalid_amounts(client: TestClient, account: dict, auth_headers: dict):
+    """Test over-precise or huge amounts are rejected with 422"""
+    for amount in ("1.005", "1e30"):
+        response = _set_budget(client, account["id"], 2, auth_headers, "2026-03-01", amount)
+
+        assert response.status_code == 422
+
+
+def test_delete_budget(client: TestClient, account: dict, auth_headers: dict):
+    """Test a deleted budget is no longer listed and deleting it again returns 404"""
+    _set_budget(client, account["id"], 2, auth_headers, "2026-03-01", "250.00")
+    url = f"/api/accounts/{account['id']}/budgets/2"
+
+    assert client.delete(url, params={"period": "2026-03-09"}, headers=auth_headers).status_code == 204
+    assert client.delete(url, params={"period": "2026-03-09"}, headers=auth_headers).status_code == 404
+    budgets = client.get(f"/api/accounts/{account['id']}/budgets", params={"period": "2026-03-01"}, headers=auth_headers).json()["budgets"]
+    assert budgets == []
@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.models import Account
+from app.utils.conditional import account_etag, accounts_etag
+
+
+ENTRY = {"type": "expense", "amount": "5.00", "entry_date": "2024-01-01T09:00:00"}
+
+
+def test_account_not_modified(client: TestClient, account: dict, auth_headers: dict):
+    """Test an unchanged account answers If-None-Match with an empty 304"""
+    response = client.get(f"/api/accounts/{account['id']}", headers=auth_headers)
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"].endswith("GMT")
+
+    response = client.get(f"/api/accounts/{account['id']}", headers={**auth_headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_entry_writes_change_etags(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test importing entries invalidates the account, balance and entry list ETags"""
+    urls = [
+        f"/api/accounts/{account['id']}",
+        f"/api/accounts/{account['id']}/balance",
+        f"/api/accounts/{account['id']}/entries",
+        "/api/accounts",
+    ]
+    etags = {url: client.get(url, headers=auth_headers).headers["etag"] for url in urls}
+
+    import_entries(account["id"], [ENTRY])
+
+    for url, etag in etags.items():
+        response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200, url
+        assert response.headers["etag"] != etag
+
+
+def test_if_modified_since(client: TestClient, account: dict, auth_headers: dict):
+    """Test Last-Modified can be sent back as If-Modified-Since"""
+    last_modified = client.get(f"/api/accounts/{account['id']}/balance", headers=auth_headers).headers["last-modified"]
+
+    response = client.get(
+        f"/api/accounts/{account['id']}/balance", headers={**auth_headers, "If-Modified-Since": last_modified}
+    )
+
+    assert response.status_code == 304
+
+
+def test_not_modified_skips_body_queries(client: TestClient, query_budget, account: dict, auth_headers: dict):
+    """Test a 304 stops after the access check, before the balance is read"""
+    etag = client.get(f"/api/accounts/{account['id']}/balance", headers=auth_headers).headers["etag"]
+
+    with query_budget(2):
+        response = client.get(f"/api/accounts/{account['id']}/balance", headers={**auth_headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+def test_reused_account_id_changes_etag():
+    """Test an account created under a reused id does not match the deleted account's ETag"""
+    deleted = Account(id=1, name="Old", owner_id=1, version=1, created_at=datetime(2026, 1, 1))
+    reused = Account(id=1, name="New", owner_id=1, version=1, created_at=datetime(2026, 2, 1))
+
+    assert account_etag(deleted) != account_etag(reused)
+    assert accounts_etag([deleted]) != accounts_etag([reused])
@@ -0,0 +1,38 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine
+
+from app.database import configure_sqlite, pool_options
+
+
+def test_sqlite_connections_use_wal(tmp_path):
+    """Test sync and async SQLite connections get the configured pragmas"""
+    url = f"sqlite:///{tmp_path / 'wal.sqlite3'}"
+    engine = create_engine(url, **pool_options(url))
+    configure_sqlite(engine)
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    engine.dispose()
+
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+    configure_sqlite(async_engine.sync_engine)
+
+    async def busy_timeout():
+        async with async_engine.connect() as connection:
+            value = (await connection.execute(text("PRAGMA busy_timeout"))).scalar()
+        await async_engine.dispose()
+        return value
+
+    assert asyncio.run(busy_timeout()) == 5000
+
+
+def test_pool_options_skip_in_memory_sqlite():
+    """Test in-memory SQLite gets no pool sizing while file databases do"""
+    assert pool_options("sqlite:///:memory:") == {}
+    assert pool_options("sqlite+aiosqlite://") == {}
+    assert pool_options("sqlite:///./db.sqlite3")["pool_pre_ping"] is True
+    assert pool_options("postgresql://user@localhost/app")["pool_size"] == 5
@@ -0,0 +1,257 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models import Entry
+
+
+def test_bulk_import_ndjson(client: TestClient, session: Session, account: dict, auth_headers: dict):
+    """Test NDJSON rows are inserted in batches and throughput is reported"""
+    rows = [
+        {"type": "expense", "amount": 10.5, "entry_date": f"2024-01-{day:02d}T12:00:00", "description": f"Row {day}"}
+        for day in range(1, 26)
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n"
+
+    response = client.post(
+        f"/api/accounts/{account['id']}/entries:bulk",
+        content=body,
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["inserted"] == 25
+    assert sum(batch["rows"] for batch in data["batches"]) == 25
+    assert all("rows_per_second" in batch for batch in data["batches"])
+
+    entries = session.exec(select(Entry).where(Entry.account_id == account["id"])).all()
+    assert len(entries) == 25
+    assert entries[0].amount == 1050  # Stored in cents
+    assert entries[0].created_at is not None
+
+
+def test_bulk_import_csv(client: TestClient, session: Session, account: dict, auth_headers: dict):
+    """Test CSV bodies with a header row and empty optional cells"""
+    body = (
+        "type,amount,entry_date,description,category_id\r\n"
+        "income,2500,2024-02-01T09:00:00,\"Salary, February\",\r\n"
+        "expense,42.10,2024-02-03T18:30:00,,\r\n"
+    )
+
+    response = client.post(
+        f"/api/accounts/{account['id']}/entries:bulk",
+        content=body,
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 201
+    assert response.json()["inserted"] == 2
+    descriptions = session.exec(select(Entry.description).order_by(Entry.entry_date)).all()
+    assert descriptions == ["Salary, February", None]
+
+
+def test_bulk_import_invalid_row_rolls_back(client: TestClient, session: Session, account: dict, auth_headers: dict):
+    """Test an invalid row rejects the whole import and reports its line"""
+    body = (
+        '{"type": "expense", "amount": 1, "entry_date": "2024-01-01T00:00:00"}\n'
+        '{"type": "transfer", "amount": 1, "entry_date": "2024-01-02T00:00:00"}\n'
+    )
+
+    response = client.post(
+        f"/api/accounts/{account['id']}/entries:bulk",
+        content=body,
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["line"] == 2
+    assert session.exec(select(Entry)).all() == []
+
+
+def test_bulk_import_rejects_sub_minor_unit_amounts(client: TestClient, account: dict, auth_headers: dict):
+    """Test amounts more precise than the account currency are rejected"""
+    response = client.post(
+        f"/api/accounts/{account['id']}/entries:bulk",
+        content='{"type": "expense", "amount": "1.005", "entry_date": "2024-01-01T00:00:00"}\n',
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["line"] == 1
+
+
+def test_bulk_import_rejects_huge_amounts(client: TestClient, account: dict, auth_headers: dict):
+    """Test amounts too large to store or sum are rejected rather than overflowing"""
+    response = client.post(
+        f"/api/accounts/{account['id']}/entries:bulk",
+        content='{"type": "expense", "amount": "1e30", "entry_date": "2024-01-01T00:00:00"}\n',
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 422
+    assert "at most" in response.json()["detail"]["errors"]
+
+
+def test_bulk_import_rejects_foreign_categories(client: TestClient, account: dict, auth_headers: dict):
+    """Test rows must use one of the account's own categories"""
+    response = client.post(
+        f"/api/accounts/{account['id']}/entries:bulk",
+        content=(
+            '{"type": "expense", "amount": 1, "entry_date": "2024-01-01T00:00:00", "category_id": 2}\n'
+            '{"type": "expense", "amount": 1, "entry_date": "2024-01-02T00:00:00", "category_id": 9999}\n'
+        ),
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["line"] == 2
+
+
+def test_bulk_import_rejects_invalid_utf8(client: TestClient, account: dict, auth_headers: dict):
+    """Test a body that is not UTF-8 is a client error"""
+    response = client.post(
+        f"/api/accounts/{account['id']}/entries:bulk",
+        content=b"type,amount,entry_date\nexpense,1,\xff\xfe\n",
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_bulk_import_converts_offsets_to_local_time(session: Session, account: dict, import_entries):
+    """Test an entry date with an offset is stored as the same instant in naive local time"""
+    import_entries(account["id"], [{"type": "expense", "amount": "1.00", "entry_date": "2026-01-01T00:00:00+02:00"}])
+
+    stored = session.exec(select(Entry.entry_date).where(Entry.account_id == account["id"])).one()
+
+    assert stored == datetime.fromisoformat("2026-01-01T00:00:00+02:00").astimezone().replace(tzinfo=None)
+
+
+def test_bulk_import_unsupported_media_type(client: TestClient, account: dict, auth_headers: dict):
+    """Test bodies that are neither NDJSON nor CSV are rejected"""
+    response = client.post(
+        f"/api/accounts/{account['id']}/entries:bulk",
+        content="<entries/>",
+        headers={**auth_headers, "Content-Type": "application/xml"},
+    )
+
+    assert response.status_code == 415
+
+
+def test_list_entries_keyset_pagination(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test cursor pages are disjoint, ordered newest first and cover every entry"""
+    # Two entries share each date so the id tiebreaker is exercised
+    rows = [
+        {"type": "expense", "amount": index, "entry_date": f"2024-03-{index // 2 + 1:02d}T00:00:00"}
+        for index in range(10)
+    ]
+    import_entries(account["id"], rows)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 4}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(f"/api/accounts/{account['id']}/entries", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len({entry["id"] for entry in seen}) == 10
+    keys = [(entry["entry_date"], entry["id"]) for entry in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_list_entries_filters(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test date range, category and type filters"""
+    import_entries(account["id"], [
+        {"type": "income", "amount": 100, "entry_date": "2024-01-15T00:00:00", "category_id": 1},
+        {"type": "expense", "amount": 20, "entry_date": "2024-02-15T00:00:00", "category_id": 2},
+        {"type": "expense", "amount": 30, "entry_date": "2024-03-15T00:00:00", "category_id": 2},
+    ])
+    url = f"/api/accounts/{account['id']}/entries"
+
+    response = client.get(url, params={"date_from": "2024-02-01T00:00:00", "date_to": "2024-03-01T00:00:00"}, headers=auth_headers)
+    assert [entry["amount"] for entry in response.json()["items"]] == ["20.00"]
+
+    response = client.get(url, params={"category_id": 2}, headers=auth_headers)
+    assert [entry["amount"] for entry in response.json()["items"]] == ["30.00", "20.00"]
+
+    response = client.get(url, params={"type": "income"}, headers=auth_headers)
+    assert [entry["amount"] for entry in response.json()["items"]] == ["100.00"]
+
+
+def test_list_entries_invalid_cursor(client: TestClient, account: dict, auth_headers: dict):
+    """Test malformed cursors are rejected"""
+    response = client.get(f"/api/accounts/{account['id']}/entries", params={"cursor": "not-a-cursor"}, headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+EXPORT_CSV = (
+    "type,amount,entry_date,description\n"
+    "expense,12.30,2024-03-02T08:00:00,\"Coffee, beans\"\n"
+    "income,2500,2024-03-01T09:00:00,Salary\n"
+)
+
+
+def test_export_csv(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test the CSV export streams every entry oldest first with exact amounts"""
+    import_entries(account["id"], EXPORT_CSV, "text/csv")
+
+    response = client.get(f"/api/accounts/{account['id']}/entries/export?format=csv", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert f'filename="account-{account["id"]}-entries.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["type"], row["amount"], row["description"]) for row in rows] == [
+        ("income", "2500.00", "Salary"),
+        ("expense", "12.30", "Coffee, beans"),
+    ]
+
+
+def test_export_ndjson(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test the NDJSON export writes one JSON object per entry"""
+    import_entries(account["id"], EXPORT_CSV, "text/csv")
+
+    response = client.get(f"/api/accounts/{account['id']}/entries/export?format=ndjson", headers=auth_headers)
+
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["amount"] for row in rows] == ["2500.00", "12.30"]
+    assert rows[0]["entry_date"] == "2024-03-01T09:00:00"
+
+
+def test_export_parquet(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test the Parquet export round-trips through pyarrow with decimal amounts"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    import_entries(account["id"], EXPORT_CSV, "text/csv")
+
+    response = client.get(f"/api/accounts/{account['id']}/entries/export?format=parquet", headers=auth_headers)
+
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column("amount").to_pylist() == [Decimal("2500.00"), Decimal("12.30")]
+    assert table.column("description").to_pylist() == ["Salary", "Coffee, beans"]
+
+
+def test_export_rejects_unknown_format(client: TestClient, account: dict, auth_headers: dict):
+    """Test unsupported export formats are a validation error"""
+    response = client.get(f"/api/accounts/{account['id']}/entries/export?format=xlsx", headers=auth_headers)
+
+    assert response.status_code == 422
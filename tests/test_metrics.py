@@ -0,0 +1,29 @@
+from fastapi.testclient import TestClient
+
+
+def test_server_timing_counts_statements(client: TestClient, account: dict, auth_headers: dict):
+    """Test responses carry the SQL statement count and time of the request"""
+    response = client.get(f"/api/accounts/{account['id']}/balance", headers=auth_headers)
+
+    assert response.status_code == 200
+    db_timing, app_timing = response.headers["server-timing"].split(", ")
+    assert db_timing.startswith("db;dur=")
+    assert not db_timing.endswith('desc="0 statements"')
+    assert app_timing.startswith("app;dur=")
+
+
+def test_metrics_are_labelled_by_route_template(client: TestClient, account: dict, auth_headers: dict):
+    """Test /api/metrics exposes per-route histograms without raw ids in labels"""
+    client.get(f"/api/accounts/{account['id']}/balance", headers=auth_headers)
+    client.get("/api/does-not-exist")
+
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    labels = 'method="GET",route="/api/accounts/{account_id}/balance",status="200"'
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in body
+    assert f"http_request_duration_seconds_count{{{labels}}} 1" in body
+    assert f"http_request_db_statements_total{{{labels}}}" in body
+    assert 'route="unmatched",status="404"' in body
@@ -0,0 +1,123 @@
+"""SQL statement budgets per endpoint.
+
+The account fixture makes an authenticated call, so the user cache is warm
+and get_current_user costs no queries here. Lower a budget when an endpoint
+gets cheaper; raising one needs a reason in the commit.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+NDJSON_ENTRIES = (
+    b'{"type": "income", "amount": "10.00", "entry_date": "2026-01-05T00:00:00"}\n'
+    b'{"type": "expense", "amount": "4.50", "entry_date": "2026-02-05T00:00:00"}\n'
+)
+
+RULE = {"type": "expense", "amount": "9.99", "frequency": "monthly", "starts_at": "2030-01-01T00:00:00"}
+
+
+def _login(client: TestClient, user: dict):
+    return client.post("/api/auth/login", data={"username": user["email"], "password": "ownerpassword123"})
+
+
+ENDPOINT_BUDGETS = {
+    "health": (0, lambda client, user, account, headers: client.get("/api/health")),
+    "list_users": (1, lambda client, user, account, headers: client.get("/api/users", headers=headers)),
+    "list_accounts": (1, lambda client, user, account, headers: client.get("/api/accounts", headers=headers)),
+    "get_account": (2, lambda client, user, account, headers: client.get(f"/api/accounts/{account['id']}", headers=headers)),
+    "create_account": (5, lambda client, user, account, headers: client.post(
+        "/api/accounts", json={"name": "Savings", "currency_code": "EUR", "owner_id": user["id"]}, headers=headers
+    )),
+    # SQLite cannot return multi-row INSERT ids in parameter order, so each of the 20 accounts is its own INSERT
+    "create_accounts_batch": (24, lambda client, user, account, headers: client.post(
+        "/api/accounts:batch",
+        json={"accounts": [{"name": f"Tenant {index}", "currency_code": "EUR", "owner_id": user["id"]} for index in range(20)]},
+        headers=headers,
+    )),
+    "import_entries": (9, lambda client, user, account, headers: client.post(
+        f"/api/accounts/{account['id']}/entries:bulk",
+        content=NDJSON_ENTRIES,
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )),
+    "list_members": (3, lambda client, user, account, headers: client.get(f"/api/accounts/{account['id']}/members", headers=headers)),
+    "list_entries": (4, lambda client, user, account, headers: client.get(f"/api/accounts/{account['id']}/entries", headers=headers)),
+    "balance": (4, lambda client, user, account, headers: client.get(f"/api/accounts/{account['id']}/balance", headers=headers)),
+    "summary": (5, lambda client, user, account, headers: client.get(f"/api/accounts/{account['id']}/summary", headers=headers)),
+    "budgets": (4, lambda client, user, account, headers: client.get(f"/api/accounts/{account['id']}/budgets", headers=headers)),
+    "export": (4, lambda client, user, account, headers: client.get(f"/api/accounts/{account['id']}/entries/export", headers=headers)),
+    "monthly_report": (4, lambda client, user, account, headers: client.get(f"/api/accounts/{account['id']}/reports/monthly", headers=headers)),
+    "category_report": (4, lambda client, user, account, headers: client.get(f"/api/accounts/{account['id']}/reports/categories", headers=headers)),
+    "percentile_report": (4, lambda client, user, account, headers: client.get(f"/api/accounts/{account['id']}/reports/percentiles", headers=headers)),
+    "create_recurring_rule": (5, lambda client, user, account, headers: client.post(
+        f"/api/accounts/{account['id']}/recurring-rules", json=RULE, headers=headers
+    )),
+    "list_recurring_rules": (4, lambda client, user, account, headers: client.get(f"/api/accounts/{account['id']}/recurring-rules", headers=headers)),
+    "set_budget": (9, lambda client, user, account, headers: client.put(
+        f"/api/accounts/{account['id']}/budgets/3", json={"period": "2026-02-01", "amount": "100.00"}, headers=headers
+    )),
+    "delete_account": (20, lambda client, user, account, headers: client.delete(f"/api/accounts/{account['id']}", headers=headers)),
+    "sync": (4, lambda client, user, account, headers: client.get("/api/sync", headers=headers)),
+    "login": (4, lambda client, user, account, headers: _login(client, user)),
+}
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINT_BUDGETS)
+def test_endpoint_query_budget(client: TestClient, query_budget, user: dict, account: dict, auth_headers: dict, endpoint: str):
+    """Test each endpoint stays within its SQL statement budget"""
+    budget, call = ENDPOINT_BUDGETS[endpoint]
+
+    with query_budget(budget):
+        response = call(client, user, account, auth_headers)
+
+    assert response.status_code < 400
+
+
+def test_refresh_query_budget(client: TestClient, query_budget, user: dict):
+    """Test rotating a refresh token stays within its SQL statement budget"""
+    refresh_token = _login(client, user).json()["refresh_token"]
+
+    with query_budget(3):
+        response = client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+
+    assert response.status_code == 200
+
+
+def test_delete_recurring_rule_query_budget(client: TestClient, query_budget, account: dict, auth_headers: dict):
+    """Test deleting a recurring rule stays within its SQL statement budget"""
+    rule = client.post(f"/api/accounts/{account['id']}/recurring-rules", json=RULE, headers=auth_headers).json()
+
+    with query_budget(6):
+        response = client.delete(f"/api/accounts/{account['id']}/recurring-rules/{rule['id']}", headers=auth_headers)
+
+    assert response.status_code == 204
+
+
+def test_delete_budget_query_budget(client: TestClient, query_budget, account: dict, auth_headers: dict):
+    """Test deleting a budget stays within its SQL statement budget"""
+    client.put(f"/api/accounts/{account['id']}/budgets/3", json={"period": "2026-02-01", "amount": "100.00"}, headers=auth_headers)
+
+    with query_budget(3):
+        response = client.delete(f"/api/accounts/{account['id']}/budgets/3", params={"period": "2026-02-01"}, headers=auth_headers)
+
+    assert response.status_code == 204
+
+
+def test_query_budget_reports_repeated_statements(client: TestClient, query_budget, account: dict, auth_headers: dict):
+    """Test a blown budget fails the test and names the repeated statements"""
+    with pytest.raises(pytest.fail.Exception) as exc_info:
+        with query_budget(1):
+            client.get(f"/api/accounts/{account['id']}/balance", headers=auth_headers)
+            client.get(f"/api/accounts/{account['id']}/balance", headers=auth_headers)
+
+    report = str(exc_info.value)
+    assert report.startswith("Expected at most 1 SQL statements, ran 7")
+    assert "Repeated statements:\n  2x SELECT" in report
+
+
+def test_cached_memberships_save_a_query(client: TestClient, query_budget, account: dict, auth_headers: dict):
+    """Test account-scoped calls after the first skip the membership lookup"""
+    client.get(f"/api/accounts/{account['id']}/balance", headers=auth_headers)
+
+    with query_budget(3):
+        response = client.get(f"/api/accounts/{account['id']}/balance", headers=auth_headers)
+
+    assert response.status_code == 200
@@ -0,0 +1,182 @@
+from datetime import datetime
+from time import perf_counter
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, insert, select
+
+import app.crud.recurring as recurring_crud
+from app.models import Entry, RecurringRule
+
+RENT = {
+    "type": "expense",
+    "amount": "950.00",
+    "description": "Rent",
+    "frequency": "monthly",
+    "starts_at": "2026-01-31T09:00:00",
+}
+
+
+def _create_rule(client: TestClient, account_id: int, headers: dict, **fields) -> dict:
+    response = client.post(f"/api/accounts/{account_id}/recurring-rules", json={**RENT, **fields}, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def _entry_dates(session: Session, rule_id: int) -> list[datetime]:
+    session.expire_all()
+    query = select(Entry.entry_date).where(Entry.recurring_rule_id == rule_id).order_by(Entry.entry_date)
+    return list(session.exec(query).all())
+
+
+def test_monthly_occurrences_clamp_to_month_end():
+    """Test monthly occurrences keep the start day, clamped in shorter months"""
+    starts_at = datetime(2024, 1, 31, 9)
+
+    dates = [recurring_crud.occurrence_at("monthly", 1, starts_at, index) for index in range(4)]
+
+    assert [value.date().isoformat() for value in dates] == ["2024-01-31", "2024-02-29", "2024-03-31", "2024-04-30"]
+    assert recurring_crud.occurrence_at("yearly", 1, datetime(2024, 2, 29), 1) == datetime(2025, 2, 28)
+    assert recurring_crud.occurrence_at("weekly", 2, starts_at, 1) == datetime(2024, 2, 14, 9)
+
+
+def test_create_and_list_rules(client: TestClient, account: dict, auth_headers: dict):
+    """Test a new rule is due at its start and listed with its amount"""
+    rule = _create_rule(client, account["id"], auth_headers)
+
+    assert rule["next_run_at"] == "2026-01-31T09:00:00"
+    assert rule["occurrences"] == 0
+    response = client.get(f"/api/accounts/{account['id']}/recurring-rules", headers=auth_headers)
+    assert [(item["id"], item["amount"]) for item in response.json()] == [(rule["id"], "950.00")]
+
+
+def test_rule_with_foreign_category_is_rejected(client: TestClient, account: dict, auth_headers: dict):
+    """Test a rule cannot use another account's category"""
+    response = client.post(
+        f"/api/accounts/{account['id']}/recurring-rules",
+        json={**RENT, "category_id": 9999},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 400
+
+
+def test_rule_with_invalid_amount_is_rejected(client: TestClient, account: dict, auth_headers: dict):
+    """Test over-precise or huge amounts are rejected with 422"""
+    for amount in ("1.005", "1e30"):
+        response = client.post(f"/api/accounts/{account['id']}/recurring-rules", json={**RENT, "amount": amount}, headers=auth_headers)
+
+        assert response.status_code == 422
+
+
+def test_rule_with_mixed_offsets(client: TestClient, account: dict, auth_headers: dict):
+    """Test an aware starts_at and a naive until are compared in local time instead of failing"""
+    url = f"/api/accounts/{account['id']}/recurring-rules"
+
+    response = client.post(url, json={**RENT, "starts_at": "2026-01-01T00:00:00Z", "until": "2026-02-01T00:00:00"}, headers=auth_headers)
+    assert response.status_code == 201
+    response = client.post(url, json={**RENT, "starts_at": "2026-03-01T00:00:00Z", "until": "2026-02-01T00:00:00"}, headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_materialize_catches_up_once(client: TestClient, session: Session, run_in_session, account: dict, auth_headers: dict):
+    """Test missed occurrences are all created, and a second run creates none"""
+    rule = _create_rule(client, account["id"], auth_headers)
+    now = datetime(2026, 4, 15)
+
+    created = run_in_session(lambda s: recurring_crud.materialize_due_rules(s, now=now))
+    again = run_in_session(lambda s: recurring_crud.materialize_due_rules(s, now=now))
+
+    assert (created, again) == (3, 0)
+    assert [value.date().isoformat() for value in _entry_dates(session, rule["id"])] == ["2026-01-31", "2026-02-28", "2026-03-31"]
+    stored = session.get(RecurringRule, rule["id"])
+    assert stored.occurrences == 3
+    assert stored.next_run_at == datetime(2026, 4, 30, 9)
+    balance = client.get(f"/api/accounts/{account['id']}/balance", headers=auth_headers).json()
+    assert (balance["expense"], balance["entry_count"]) == ("2850.00", 3)
+
+
+def test_materialize_skips_existing_occurrences(client: TestClient, session: Session, run_in_session, account: dict, auth_headers: dict):
+    """Test an occurrence already inserted, e.g. by an overlapping run, is not duplicated or counted twice"""
+    rule = _create_rule(client, account["id"], auth_headers)
+    stored = session.get(RecurringRule, rule["id"])
+    session.exec(insert(Entry), params=[{
+        "account_id": account["id"], "recurring_rule_id": rule["id"], "type": "expense", "amount": 95000,
+        "entry_date": stored.starts_at, "created_at": stored.created_at, "updated_at": stored.created_at,
+    }])
+    session.commit()
+
+    created = run_in_session(lambda s: recurring_crud.materialize_due_rules(s, now=datetime(2026, 2, 28, 12)))
+
+    assert created == 1
+    assert len(_entry_dates(session, rule["id"])) == 2
+
+
+def test_catch_up_is_capped_per_run(client: TestClient, session: Session, run_in_session, account: dict, auth_headers: dict, monkeypatch):
+    """Test a rule far behind adds a bounded number of entries per run and finishes on later runs"""
+    monkeypatch.setattr(recurring_crud, "MAX_OCCURRENCES_PER_RUN", 10)
+    rule = _create_rule(client, account["id"], auth_headers, frequency="daily", starts_at="2026-01-01T00:00:00")
+    now = datetime(2026, 1, 25, 12)
+
+    runs = [run_in_session(lambda s: recurring_crud.materialize_due_rules(s, now=now)) for _ in range(4)]
+
+    assert runs == [10, 10, 5, 0]
+    assert len(_entry_dates(session, rule["id"])) == 25
+
+
+def test_rules_end_after_count_or_until(client: TestClient, session: Session, run_in_session, account: dict, auth_headers: dict):
+    """Test rules stop at their count or until date and are no longer due"""
+    counted = _create_rule(client, account["id"], auth_headers, frequency="daily", count=3)
+    bounded = _create_rule(client, account["id"], auth_headers, frequency="weekly", until="2026-02-14T09:00:00")
+
+    run_in_session(lambda s: recurring_crud.materialize_due_rules(s, now=datetime(2027, 1, 1)))
+
+    assert len(_entry_dates(session, counted["id"])) == 3
+    assert [value.date().isoformat() for value in _entry_dates(session, bounded["id"])] == ["2026-01-31", "2026-02-07", "2026-02-14"]
+    session.expire_all()
+    assert session.get(RecurringRule, counted["id"]).next_run_at is None
+    assert session.get(RecurringRule, bounded["id"]).next_run_at is None
+
+
+def test_deleted_rule_keeps_its_entries(client: TestClient, session: Session, run_in_session, account: dict, auth_headers: dict):
+    """Test deleting a rule stops it but keeps the entries it created"""
+    rule = _create_rule(client, account["id"], auth_headers)
+    run_in_session(lambda s: recurring_crud.materialize_due_rules(s, now=datetime(2026, 2, 1)))
+
+    response = client.delete(f"/api/accounts/{account['id']}/recurring-rules/{rule['id']}", headers=auth_headers)
+
+    assert response.status_code == 204
+    session.expire_all()
+    assert session.get(RecurringRule, rule["id"]) is None
+    assert session.exec(select(func.count()).select_from(Entry).where(Entry.account_id == account["id"])).one() == 1
+
+
+def test_deleted_rule_updates_synced_entries(client: TestClient, run_in_session, account: dict, auth_headers: dict):
+    """Test deleting a rule resyncs its entries without the rule and changes the entries ETag"""
+    rule = _create_rule(client, account["id"], auth_headers)
+    run_in_session(lambda s: recurring_crud.materialize_due_rules(s, now=datetime(2026, 2, 1)))
+    cursor = client.get("/api/sync", headers=auth_headers).json()["cursor"]
+    etag = client.get(f"/api/accounts/{account['id']}/entries", headers=auth_headers).headers["etag"]
+
+    client.delete(f"/api/accounts/{account['id']}/recurring-rules/{rule['id']}", headers=auth_headers)
+
+    delta = client.get("/api/sync", params={"since": cursor}, headers=auth_headers).json()
+    assert [entry["recurring_rule_id"] for entry in delta["entries"]] == [None]
+    response = client.get(f"/api/accounts/{account['id']}/entries", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_materialize_many_rules(client: TestClient, session: Session, run_in_session, account: dict):
+    """Test thousands of due rules are materialized in batches well within a second each"""
+    now = datetime(2026, 1, 1)
+    session.exec(insert(RecurringRule), params=[{
+        "account_id": account["id"], "type": "expense", "amount": 100, "frequency": "daily", "interval": 1,
+        "starts_at": datetime(2025, 12, 31), "occurrences": 0, "next_run_at": datetime(2025, 12, 31),
+        "created_at": now, "updated_at": now,
+    } for _ in range(5000)])
+    session.commit()
+
+    started = perf_counter()
+    created = run_in_session(lambda s: recurring_crud.materialize_due_rules(s, now=now, batch_size=1000))
+
+    assert created == 10_000
+    assert perf_counter() - started < 10
@@ -0,0 +1,89 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.analytics.reports import _group_percentile
+
+ROWS = [
+    {"type": "income", "amount": "2000", "entry_date": "2024-01-01T09:00:00", "category_id": 1},
+    {"type": "expense", "amount": "120.50", "entry_date": "2024-01-10T09:00:00", "category_id": 2},
+    {"type": "expense", "amount": "79.50", "entry_date": "2024-01-20T09:00:00", "category_id": 2},
+    {"type": "expense", "amount": "300", "entry_date": "2024-03-05T09:00:00", "category_id": 2},
+    {"type": "expense", "amount": "50", "entry_date": "2024-03-14T09:00:00"},
+    {"type": "income", "amount": "1000", "entry_date": "2024-03-20T09:00:00", "category_id": 1},
+]
+
+
+def test_monthly_report_fills_gaps_and_rolls(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test months without entries count as zero in totals and rolling means"""
+    import_entries(account["id"], ROWS)
+
+    response = client.get(f"/api/accounts/{account['id']}/reports/monthly?window=2", headers=auth_headers)
+
+    assert response.status_code == 200
+    months = response.json()["months"]
+    assert [
+        (m["period"], m["expense"], m["net"], m["entry_count"], m["expense_rolling_mean"], m["net_rolling_mean"])
+        for m in months
+    ] == [
+        ("2024-01-01", "200.00", "1800.00", 3, None, None),
+        ("2024-02-01", "0.00", "0.00", 0, "100.00", "900.00"),
+        ("2024-03-01", "350.00", "650.00", 3, "175.00", "325.00"),
+    ]
+
+
+def test_monthly_report_respects_date_range(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test the date range limits both the entries and the month axis"""
+    import_entries(account["id"], ROWS)
+
+    response = client.get(
+        f"/api/accounts/{account['id']}/reports/monthly?from=2024-03-01&to=2024-04-30", headers=auth_headers
+    )
+
+    assert [(m["period"], m["income"]) for m in response.json()["months"]] == [
+        ("2024-03-01", "1000.00"),
+        ("2024-04-01", "0.00"),
+    ]
+
+
+def test_category_report(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test per-category totals, spending share and expense percentiles"""
+    import_entries(account["id"], ROWS)
+
+    response = client.get(f"/api/accounts/{account['id']}/reports/categories", headers=auth_headers)
+
+    assert response.status_code == 200
+    categories = {c["category_id"]: c for c in response.json()["categories"]}
+    assert categories[1]["income"] == "3000.00"
+    assert categories[1]["expense_median"] is None
+    assert categories[2]["expense"] == "500.00"
+    assert categories[2]["expense_share"] == 0.9091
+    assert categories[2]["expense_median"] == "120.50"
+    assert categories[2]["expense_p90"] == "264.10"
+    assert categories[None]["entry_count"] == 1
+
+
+def test_percentile_report(client: TestClient, account: dict, auth_headers: dict, import_entries):
+    """Test percentiles of expense entries and of monthly expense totals"""
+    import_entries(account["id"], ROWS)
+
+    response = client.get(f"/api/accounts/{account['id']}/reports/percentiles", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["entry_count"] == 4
+    assert data["mean"] == "137.50"
+    assert data["entries"]["p50"] == "100.00"
+    assert data["monthly_totals"]["p50"] == "275.00"
+
+
+def test_group_percentile_matches_numpy():
+    """Test the vectorized grouped percentile agrees with np.percentile per group"""
+    rng = np.random.default_rng(7)
+    groups = [np.sort(rng.integers(1, 10_000, size)) for size in (1, 2, 17, 0, 250)]
+    sizes = np.array([len(group) for group in groups])
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+    result = _group_percentile(np.concatenate(groups), starts, sizes, 90)
+
+    expected = [np.percentile(group, 90) if len(group) else np.nan for group in groups]
+    np.testing.assert_allclose(result, expected)
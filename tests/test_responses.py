@@ -0,0 +1,33 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+
+from app.models import Entry
+from app.schemas.entries import EntryPage
+from app.utils.responses import FastJSONResponse, schema_response
+
+
+def test_fast_json_response_matches_json_response():
+    """Test the default response class encodes the same document as JSONResponse"""
+    content = {"items": [{"id": 1, "name": "Café", "amount": "12.30", "tags": [], "note": None}], "ratio": 0.25}
+
+    assert FastJSONResponse(content).body == JSONResponse(content).body
+
+
+def test_schema_response_validates_and_keeps_headers():
+    """Test schema_response renders content through the schema and carries over route headers"""
+    entry = Entry(
+        id=7, account_id=1, category_id=None, user_id=None, type="expense", amount=1230, description=None,
+        entry_date=datetime(2026, 1, 5), created_at=datetime(2026, 1, 5), updated_at=datetime(2026, 1, 5),
+    )
+    route_response = JSONResponse(None)
+    route_response.headers["ETag"] = 'W/"1-3"'
+
+    response = schema_response(EntryPage, {"items": [{**entry.model_dump(), "amount": Decimal("12.30")}], "next_cursor": None}, route_response)
+
+    assert json.loads(response.body)["items"][0]["amount"] == "12.30"
+    assert response.headers["etag"] == 'W/"1-3"'
+    assert response.headers["content-type"] == "application/json"
+    assert int(response.headers["content-length"]) == len(response.body)
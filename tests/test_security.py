@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.bloom import BloomFilter
+from app.utils.security import PasswordHashPool, hash_password, verify_password
+
+
+def test_password_hash_pool_runs_off_the_event_loop():
+    """Test hashing on the pool produces verifiable hashes from worker threads"""
+    pool = PasswordHashPool(workers=2, queue_depth=2)
+
+    async def scenario():
+        thread_name = await pool.run(lambda: threading.current_thread().name)
+        hashed = await pool.run(hash_password, "poolpassword123")
+        return thread_name, hashed
+
+    thread_name, hashed = asyncio.run(scenario())
+    pool.shutdown()
+
+    assert thread_name.startswith("argon2")
+    assert verify_password("poolpassword123", hashed)
+
+
+def test_password_hash_pool_rejects_when_saturated():
+    """Test calls beyond workers plus queue depth fail fast with 503"""
+    pool = PasswordHashPool(workers=1, queue_depth=0)
+    release = threading.Event()
+
+    async def scenario():
+        busy = asyncio.create_task(pool.run(release.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as exc_info:
+            await pool.run(lambda: None)
+        release.set()
+        await busy
+        return exc_info.value.status_code
+
+    assert asyncio.run(scenario()) == 503
+    pool.shutdown()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test added keys are always found and the false positive rate stays near target"""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for index in range(1000):
+        bloom.add(f"revoked-{index}".encode())
+
+    assert all(bloom.might_contain(f"revoked-{index}".encode()) for index in range(1000))
+    false_positives = sum(bloom.might_contain(f"live-{index}".encode()) for index in range(10000))
+    assert false_positives < 300
@@ -0,0 +1,126 @@
+from fastapi.testclient import TestClient
+
+import app.crud.account as account_crud
+
+NDJSON_ENTRIES = (
+    b'{"type": "income", "amount": "10.00", "entry_date": "2026-01-05T00:00:00"}\n'
+    b'{"type": "expense", "amount": "4.50", "entry_date": "2026-02-05T00:00:00"}\n'
+)
+
+
+def _sync(client: TestClient, headers: dict, **params) -> dict:
+    response = client.get("/api/sync", params=params, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _member(client: TestClient) -> tuple[dict, dict]:
+    """Register and log in a second user"""
+    user = client.post("/api/auth/register", json={
+        "email": "member@example.com",
+        "name": "Member",
+        "password": "memberpassword123"
+    }).json()
+    response = client.post("/api/auth/login", data={"username": user["email"], "password": "memberpassword123"})
+    return user, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_full_sync(client: TestClient, user: dict, account: dict, auth_headers: dict):
+    """Test a sync without a cursor returns everything the user can see"""
+    delta = _sync(client, auth_headers)
+
+    assert [row["id"] for row in delta["accounts"]] == [account["id"]]
+    assert [(row["account_id"], row["user_id"]) for row in delta["memberships"]] == [(account["id"], user["id"])]
+    assert len(delta["categories"]) == len(account_crud.DEFAULT_CATEGORIES)
+    assert delta["entries"] == [] and delta["deleted"] == []
+    assert delta["has_more"] is False
+
+
+def test_incremental_sync(client: TestClient, account: dict, auth_headers: dict):
+    """Test a sync from a cursor only returns rows changed after it"""
+    cursor = _sync(client, auth_headers)["cursor"]
+    assert _sync(client, auth_headers, since=cursor)["entries"] == []
+
+    client.post(
+        f"/api/accounts/{account['id']}/entries:bulk",
+        content=NDJSON_ENTRIES,
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+    delta = _sync(client, auth_headers, since=cursor)
+
+    assert [(entry["type"], entry["amount"]) for entry in delta["entries"]] == [("income", "10.00"), ("expense", "4.50")]
+    assert delta["accounts"] == [] and delta["categories"] == []
+    assert _sync(client, auth_headers, since=delta["cursor"])["entries"] == []
+
+
+def test_sync_pages(client: TestClient, account: dict, auth_headers: dict):
+    """Test a limited sync reports has_more until every change is read"""
+    seen, cursor, pages = 0, None, 0
+    while True:
+        delta = _sync(client, auth_headers, limit=4, **({"since": cursor} if cursor else {}))
+        seen += len(delta["accounts"]) + len(delta["memberships"]) + len(delta["categories"])
+        cursor, pages = delta["cursor"], pages + 1
+        if not delta["has_more"]:
+            break
+
+    assert seen == 2 + len(account_crud.DEFAULT_CATEGORIES)
+    assert pages == 3
+
+
+def test_sync_after_membership_added(client: TestClient, run_in_session, account: dict, auth_headers: dict):
+    """Test a user added to an existing account gets its account, categories and entries from their next sync"""
+    client.post(
+        f"/api/accounts/{account['id']}/entries:bulk",
+        content=NDJSON_ENTRIES,
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+    member, member_headers = _member(client)
+    client.post("/api/accounts", json={"name": "Own", "currency_code": "EUR", "owner_id": member["id"]}, headers=member_headers)
+    cursor = _sync(client, member_headers)["cursor"]
+
+    run_in_session(lambda s: account_crud.add_user_to_account(account["id"], member["id"], session=s))
+    accounts, memberships, categories, entries = [], [], [], []
+    while True:
+        delta = _sync(client, member_headers, since=cursor, limit=4)
+        accounts += delta["accounts"]
+        memberships += delta["memberships"]
+        categories += delta["categories"]
+        entries += delta["entries"]
+        cursor = delta["cursor"]
+        if not delta["has_more"]:
+            break
+
+    assert [row["id"] for row in accounts] == [account["id"]]
+    assert [(row["account_id"], row["user_id"]) for row in memberships] == [(account["id"], member["id"])]
+    assert len(categories) == len(account_crud.DEFAULT_CATEGORIES)
+    assert [(entry["type"], entry["amount"]) for entry in entries] == [("income", "10.00"), ("expense", "4.50")]
+
+
+def test_sync_after_membership_removed(client: TestClient, run_in_session, account: dict):
+    """Test a removed member gets tombstones for their membership and the account"""
+    member, member_headers = _member(client)
+    run_in_session(lambda s: account_crud.add_user_to_account(account["id"], member["id"], session=s))
+    delta = _sync(client, member_headers)
+    assert [row["id"] for row in delta["accounts"]] == [account["id"]]
+
+    run_in_session(lambda s: account_crud.remove_user_from_account(account["id"], member["id"], s))
+    delta = _sync(client, member_headers, since=delta["cursor"])
+
+    assert {(row["entity"], row["id"]) for row in delta["deleted"]} == {("membership", member["id"]), ("account", account["id"])}
+
+
+def test_sync_after_account_deleted(client: TestClient, user: dict, account: dict, auth_headers: dict):
+    """Test deleting an account leaves tombstones for its members"""
+    cursor = _sync(client, auth_headers)["cursor"]
+    client.delete(f"/api/accounts/{account['id']}", headers=auth_headers)
+
+    delta = _sync(client, auth_headers, since=cursor)
+
+    assert {(row["entity"], row["id"]) for row in delta["deleted"]} == {("membership", user["id"]), ("account", account["id"])}
+
+
+def test_sync_rejects_invalid_cursor(client: TestClient, auth_headers: dict):
+    """Test a malformed cursor is a bad request"""
+    response = client.get("/api/sync", params={"since": "not-a-cursor"}, headers=auth_headers)
+
+    assert response.status_code == 400
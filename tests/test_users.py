@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+
+import app.crud.account as account_crud
+import app.crud.users as user_crud
+from app.schemas.users import UserCreate
+
+
+def test_current_user_lookup_is_cached(client: TestClient, auth_headers: dict):
+    """Test repeated authenticated calls are served from the user cache"""
+    for _ in range(3):
+        assert client.get("/api/users", headers=auth_headers).status_code == 200
+
+    stats = client.get("/api/health/caches").json()["user_cache"]
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+
+
+def test_updated_user_is_invalidated(client: TestClient, run_in_session, user: dict, auth_headers: dict):
+    """Test updating a user drops their cached snapshot"""
+    client.get("/api/users", headers=auth_headers)
+
+    update = UserCreate(email=user["email"], name="Renamed", password="newpassword123")
+    run_in_session(lambda session: user_crud.update_user(user["id"], update, session))
+
+    assert user_crud.user_cache.get(user["email"]) is None
+
+
+def test_deactivated_user_is_rejected(client: TestClient, run_in_session, user: dict, auth_headers: dict):
+    """Test a deactivated user cannot keep using a cached session"""
+    assert client.get("/api/users", headers=auth_headers).status_code == 200
+
+    run_in_session(lambda session: user_crud.deactivate_user(user["id"], session))
+
+    assert client.get("/api/users", headers=auth_headers).status_code == 401
+
+
+def test_list_users_is_scoped_to_shared_accounts(client: TestClient, run_in_session, user: dict, account: dict, auth_headers: dict):
+    """Test only the caller and users sharing one of their accounts are listed"""
+    users = [
+        client.post("/api/auth/register", json={"email": f"user{index}@example.com", "password": "userpassword123"}).json()
+        for index in range(3)
+    ]
+    for other in users[:2]:
+        run_in_session(lambda session: account_crud.add_user_to_account(account["id"], other["id"], session=session))
+
+    first = client.get("/api/users", params={"limit": 2}, headers=auth_headers).json()
+    second = client.get("/api/users", params={"limit": 2, "cursor": first["next_cursor"]}, headers=auth_headers).json()
+
+    assert [row["id"] for row in first["items"] + second["items"]] == [user["id"], users[0]["id"], users[1]["id"]]
+    assert second["next_cursor"] is None